@@ -0,0 +1,64 @@
+"""
+Cost of an advert storm: every advert heard several times through repeaters and replayed
+later. AdvertRegistry drops the copies on the timestamp check, compared with parsing and
+verifying every copy as Advert.from_bytes(...).is_verified() did before.
+
+    python -m benchmarks.bench_advert_registry
+"""
+import asyncio
+import random
+import struct
+import time
+
+from nacl.exceptions import BadSignatureError
+from nacl.signing import SigningKey, VerifyKey
+
+from meshcore.advert import Advert
+from meshcore.advert_registry import AdvertRegistry
+
+
+def legacy_ingest(payload: bytes, latest: dict):
+    advert = Advert.from_bytes(payload)
+    advert.parsed
+    try:
+        VerifyKey(advert.public_key).verify(advert.get_signed_data(), advert.signature)
+    except BadSignatureError:
+        return
+    if advert.timestamp > latest.get(advert.public_key, -1):
+        latest[advert.public_key] = advert.timestamp
+
+
+async def ingest_all(registry: AdvertRegistry, payloads: list):
+    await asyncio.gather(*(registry.ingest(payload) for payload in payloads))
+
+
+if __name__ == "__main__":
+    rng = random.Random(1)
+    payloads = []
+    for node in range(500):
+        signing_key = SigningKey(rng.randbytes(32))
+        public_key = bytes(signing_key.verify_key)
+        app_data = bytes([0xF1]) + struct.pack("<iiHh", node, -node, 4000, 2150) + f"node {node}".encode()
+        for timestamp in (1_700_000_000, 1_700_000_600):
+            signed = public_key + struct.pack("<I", timestamp) + app_data
+            payload = signed[:36] + signing_key.sign(signed).signature + app_data
+            # each advert relayed by 8 repeaters
+            payloads.extend([payload] * 8)
+    # replays of the first round arriving after the second
+    payloads.extend(payloads[:len(payloads) // 2])
+
+    start = time.perf_counter()
+    latest = {}
+    for payload in payloads:
+        legacy_ingest(payload, latest)
+    legacy = time.perf_counter() - start
+
+    registry = AdvertRegistry()
+    start = time.perf_counter()
+    asyncio.run(ingest_all(registry, payloads))
+    elapsed = time.perf_counter() - start
+
+    assert {advert.public_key: advert.timestamp for advert in registry} == latest
+    print(f"{len(payloads)} payloads, {registry.accepted_count} accepted, {registry.stale_count} dropped as stale")
+    print(f"  legacy: {len(payloads) / legacy:9.0f} payloads/s")
+    print(f"registry: {len(payloads) / elapsed:9.0f} payloads/s")
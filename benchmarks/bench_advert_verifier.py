@@ -0,0 +1,70 @@
+"""
+Advert signature verification throughput: the previous inline path (a fresh VerifyKey
+per advert, on the event loop) against AdvertVerifier on a thread pool and a process pool,
+for unique adverts and for an advert storm where each advert is heard several times.
+Process pool speedup scales with the number of cores.
+
+    python -m benchmarks.bench_advert_verifier
+"""
+import asyncio
+import os
+import random
+import time
+
+from nacl.exceptions import BadSignatureError
+from nacl.signing import SigningKey, VerifyKey
+
+from meshcore.advert import Advert
+from meshcore.advert_verifier import AdvertVerifier
+
+
+def legacy_verify(advert: Advert) -> bool:
+    try:
+        VerifyKey(advert.public_key).verify(advert.get_signed_data(), advert.signature)
+        return True
+    except BadSignatureError:
+        return False
+
+
+def make_adverts(nodes: int, per_node: int, rng: random.Random) -> list:
+    adverts = []
+    for _ in range(nodes):
+        signing_key = SigningKey(rng.randbytes(32))
+        public_key = bytes(signing_key.verify_key)
+        for i in range(per_node):
+            timestamp = 1_700_000_000 + i
+            app_data = bytes([0x81]) + f"node {public_key[:2].hex()}".encode()
+            signed = public_key + timestamp.to_bytes(4, "little") + app_data
+            adverts.append(Advert(public_key, timestamp, signing_key.sign(signed).signature, app_data))
+    rng.shuffle(adverts)
+    return adverts
+
+
+async def run(verifier: AdvertVerifier, adverts: list) -> list:
+    return await verifier.verify_many(adverts)
+
+
+if __name__ == "__main__":
+    rng = random.Random(1)
+    unique = make_adverts(200, 20, rng)
+    # every advert relayed by 5 repeaters
+    storm = [advert for advert in unique for _ in range(5)]
+    rng.shuffle(storm)
+    print(f"{os.cpu_count()} cpu(s)")
+
+    for label, adverts in (("unique", unique), ("storm x5", storm)):
+        start = time.perf_counter()
+        expected = [legacy_verify(advert) for advert in adverts]
+        legacy = time.perf_counter() - start
+        print(f"{label:>8} {len(adverts)} adverts, legacy inline: {len(adverts) / legacy:8.0f} adverts/s")
+
+        for name, kwargs in (("threads", {}), ("processes", {"use_processes": True})):
+            verifier = AdvertVerifier(**kwargs)
+            # start the workers outside the measurement
+            asyncio.run(run(verifier, make_adverts(1, 1, rng)))
+            start = time.perf_counter()
+            results = asyncio.run(run(verifier, adverts))
+            elapsed = time.perf_counter() - start
+            verifier.close()
+            assert results == expected
+            print(f"{label:>8} {name:>10}: {len(adverts) / elapsed:8.0f} adverts/s, {verifier.cache_hits} cache hits")
@@ -0,0 +1,105 @@
+"""
+EventEmitter fan-out at a steady 10k events/sec: latency from emit() to each
+listener call, for loop-thread and cross-thread producers, plus peak throughput.
+
+    python -m benchmarks.bench_event_emitter
+"""
+import asyncio
+import statistics
+import threading
+import time
+
+from meshcore.events import EventEmitter
+
+LISTENERS = 4
+RATE = 10_000
+DURATION = 1.0
+
+
+def percentiles(latencies):
+    latencies.sort()
+    return (statistics.median(latencies) * 1e6,
+            latencies[int(len(latencies) * 0.99)] * 1e6)
+
+
+async def steady_rate(inline: bool, from_thread: bool):
+    emitter = EventEmitter()
+    latencies = []
+    done = asyncio.get_running_loop().create_future()
+    total = int(RATE * DURATION)
+
+    def listener(sent_at):
+        latencies.append(time.perf_counter() - sent_at)
+        if len(latencies) == total * LISTENERS and not done.done():
+            done.set_result(None)
+
+    for _ in range(LISTENERS):
+        emitter.on("rx", listener, inline=inline)
+
+    def produce():
+        interval = 1 / RATE
+        start = time.perf_counter()
+        for i in range(total):
+            while time.perf_counter() - start < i * interval:
+                pass
+            emitter.emit("rx", time.perf_counter())
+
+    if from_thread:
+        thread = threading.Thread(target=produce)
+        thread.start()
+        await done
+        thread.join()
+    else:
+        # produce in slices so the loop can deliver between them
+        interval = 1 / RATE
+        start = time.perf_counter()
+        for i in range(total):
+            while time.perf_counter() - start < i * interval:
+                await asyncio.sleep(0)
+            emitter.emit("rx", time.perf_counter())
+        await done
+
+    median, p99 = percentiles(latencies)
+    mode = ("thread" if from_thread else "loop") + (" inline" if inline else "")
+    print(f"{mode:>14}: {RATE} ev/s x {LISTENERS} listeners   median {median:7.1f} us   p99 {p99:8.1f} us")
+
+
+async def peak_throughput():
+    emitter = EventEmitter()
+    calls = 0
+
+    def listener(_):
+        nonlocal calls
+        calls += 1
+
+    for _ in range(LISTENERS):
+        emitter.on("rx", listener)
+    emitter.on("unused", listener)
+
+    count = 200_000
+    start = time.perf_counter()
+    for i in range(count):
+        emitter.emit("rx", i)
+        if i % 1000 == 0:
+            await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    print(f"{'peak':>14}: {count / elapsed:,.0f} events/sec, {calls / elapsed:,.0f} listener calls/sec")
+
+    start = time.perf_counter()
+    for i in range(count):
+        if emitter.has_listeners("nobody"):
+            emitter.emit("nobody", i)
+    elapsed = time.perf_counter() - start
+    print(f"{'no listeners':>14}: {elapsed / count * 1e9:.0f} ns per skipped event")
+
+
+async def main():
+    await steady_rate(inline=False, from_thread=False)
+    await steady_rate(inline=True, from_thread=False)
+    await steady_rate(inline=False, from_thread=True)
+    await peak_throughput()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
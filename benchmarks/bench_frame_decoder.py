@@ -0,0 +1,75 @@
+"""
+Frames/sec of FrameDecoder for a clean stream and for a stream full of garbage,
+compared with the previous slice-off-the-front parser.
+
+    python -m benchmarks.bench_frame_decoder
+"""
+import os
+import struct
+import time
+
+from meshcore.constants import Constants
+from meshcore.frame_decoder import FrameDecoder
+
+
+def make_frame(payload: bytes) -> bytes:
+    return struct.pack("<BH", Constants.SerialFrameTypes.Incoming, len(payload)) + payload
+
+
+def make_stream(frame_count: int, garbage_len: int) -> bytes:
+    payload = bytes(range(100))
+    chunks = []
+    for _ in range(frame_count):
+        if garbage_len:
+            # garbage without start bytes, so every frame is still recoverable
+            garbage = os.urandom(garbage_len).replace(b">", b"x").replace(b"<", b"x")
+            chunks.append(garbage)
+        chunks.append(make_frame(payload))
+    return b"".join(chunks)
+
+
+def legacy_parse(read_buffer: bytearray, data: bytes, frames: list):
+    read_buffer.extend(data)
+    while len(read_buffer) >= 3:
+        frame_type = read_buffer[0]
+        if frame_type not in (Constants.SerialFrameTypes.Incoming, Constants.SerialFrameTypes.Outgoing):
+            read_buffer = read_buffer[1:]
+            continue
+        frame_length = read_buffer[1] | (read_buffer[2] << 8)
+        if not frame_length:
+            read_buffer = read_buffer[1:]
+            continue
+        if len(read_buffer) < 3 + frame_length:
+            break
+        frames.append(read_buffer[3:3 + frame_length])
+        read_buffer = read_buffer[3 + frame_length:]
+    return read_buffer
+
+
+def run(name: str, stream: bytes, frame_count: int, chunk_size: int = 4096):
+    chunks = [stream[i:i + chunk_size] for i in range(0, len(stream), chunk_size)]
+
+    decoder = FrameDecoder()
+    decoded = 0
+    start = time.perf_counter()
+    for chunk in chunks:
+        for _ in decoder.feed(chunk):
+            decoded += 1
+    elapsed = time.perf_counter() - start
+    assert decoded == frame_count, decoded
+    print(f"{name:>14} FrameDecoder: {frame_count / elapsed:12,.0f} frames/sec")
+
+    read_buffer = bytearray()
+    frames = []
+    start = time.perf_counter()
+    for chunk in chunks:
+        read_buffer = legacy_parse(read_buffer, chunk, frames)
+    elapsed = time.perf_counter() - start
+    assert len(frames) == frame_count, len(frames)
+    print(f"{name:>14}       legacy: {frame_count / elapsed:12,.0f} frames/sec")
+
+
+if __name__ == "__main__":
+    count = 50_000
+    run("clean", make_stream(count, 0), count)
+    run("garbage x4", make_stream(count, 400), count)
@@ -0,0 +1,47 @@
+"""
+Per-frame dispatch cost of Connection.on_frame_received, compared with the previous
+approach of building the response/push handler dicts for every frame.
+
+    python -m benchmarks.bench_frame_dispatch
+"""
+import struct
+import timeit
+
+from meshcore.buffer_reader import BufferReader
+from meshcore.connection.base_connection import Connection
+from meshcore.constants import Constants
+
+
+class NullConnection(Connection):
+    def emit(self, event, *args, **kwargs):
+        pass
+
+
+def legacy_on_frame_received(self, frame_bytes: bytes):
+    reader = BufferReader(frame_bytes)
+    code = reader.read_uint8()
+    response_handlers = {
+        code_: getattr(self, name)
+        for code_, name in Connection.FRAME_DECODERS.items() if code_ < 0x80
+    }
+    push_handlers = {
+        code_: getattr(self, name)
+        for code_, name in Connection.FRAME_DECODERS.items() if code_ >= 0x80
+    }
+    if code in response_handlers:
+        response_handlers[code](reader)
+    elif code in push_handlers:
+        push_handlers[code](reader)
+
+
+if __name__ == "__main__":
+    connection = NullConnection()
+    frame = bytes([Constants.PushCodes.MsgWaiting])
+    voltage_frame = bytes([Constants.ResponseCodes.BatteryVoltage]) + struct.pack("<H", 4100)
+    count = 200_000
+
+    for name, data in (("MsgWaiting", frame), ("BatteryVoltage", voltage_frame)):
+        table = timeit.timeit(lambda: connection.on_frame_received(data), number=count)
+        legacy = timeit.timeit(lambda: legacy_on_frame_received(connection, data), number=count)
+        print(f"{name:>15} table: {table / count * 1e9:8.0f} ns/frame"
+              f"   legacy: {legacy / count * 1e9:8.0f} ns/frame")
@@ -0,0 +1,76 @@
+"""
+GeoIndex with 100k nodes: bulk insert, radius and k-nearest queries, compared with a
+Python loop over contact dicts.
+
+    python -m benchmarks.bench_geo_index
+"""
+import math
+import random
+import timeit
+
+from meshcore.advert import Advert
+from meshcore.geo_index import GeoIndex
+
+
+EARTH_RADIUS_KM = GeoIndex.EARTH_RADIUS_KM
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def loop_within(nodes, lat, lon, radius_km, type_):
+    hits = []
+    for node in nodes:
+        if node["type"] != type_:
+            continue
+        distance = haversine(lat, lon, node["lat"], node["lon"])
+        if distance <= radius_km:
+            hits.append((node["publicKey"], distance))
+    hits.sort(key=lambda hit: hit[1])
+    return hits
+
+
+def loop_nearest(nodes, lat, lon, type_):
+    return min(
+        ((node["publicKey"], haversine(lat, lon, node["lat"], node["lon"])) for node in nodes if node["type"] == type_),
+        key=lambda hit: hit[1],
+    )
+
+
+if __name__ == "__main__":
+    count = 100_000
+    rng = random.Random(1)
+    nodes = [
+        {
+            "publicKey": rng.randbytes(32),
+            # roughly central Europe
+            "lat": rng.uniform(45.0, 55.0),
+            "lon": rng.uniform(5.0, 20.0),
+            "type": rng.choice((Advert.ADV_TYPE_CHAT, Advert.ADV_TYPE_REPEATER, Advert.ADV_TYPE_ROOM)),
+        }
+        for _ in range(count)
+    ]
+
+    index = GeoIndex()
+    insert = timeit.timeit(
+        lambda: [index.add(node["publicKey"], node["lat"], node["lon"], node["type"]) for node in nodes],
+        number=1,
+    )
+    print(f"insert {count} nodes: {insert * 1e3:8.1f} ms ({insert / count * 1e9:.0f} ns/node)")
+
+    lat, lon = 50.0, 12.0
+    runs = 20
+    radius = timeit.timeit(lambda: index.within(lat, lon, 20, Advert.ADV_TYPE_REPEATER), number=runs) / runs
+    radius_loop = timeit.timeit(lambda: loop_within(nodes, lat, lon, 20, Advert.ADV_TYPE_REPEATER), number=1)
+    nearest = timeit.timeit(lambda: index.nearest(lat, lon, 1, Advert.ADV_TYPE_ROOM), number=runs) / runs
+    nearest_loop = timeit.timeit(lambda: loop_nearest(nodes, lat, lon, Advert.ADV_TYPE_ROOM), number=1)
+
+    assert [key for key, _ in index.within(lat, lon, 20, Advert.ADV_TYPE_REPEATER)] == \
+        [key for key, _ in loop_within(nodes, lat, lon, 20, Advert.ADV_TYPE_REPEATER)]
+    assert index.nearest(lat, lon, 1, Advert.ADV_TYPE_ROOM)[0][0] == loop_nearest(nodes, lat, lon, Advert.ADV_TYPE_ROOM)[0]
+
+    print(f"repeaters within 20 km   index: {radius * 1e3:8.2f} ms   loop: {radius_loop * 1e3:8.2f} ms")
+    print(f"nearest room server      index: {nearest * 1e3:8.2f} ms   loop: {nearest_loop * 1e3:8.2f} ms")
@@ -0,0 +1,77 @@
+"""
+CPU per received frame for a Contact / LogRxData flood, comparing the previous eager
+dict decoding with lazy frame views, with and without anyone listening.
+
+    python -m benchmarks.bench_lazy_frames
+"""
+import struct
+import timeit
+
+from meshcore.buffer_reader import BufferReader
+from meshcore.connection.base_connection import Connection
+from meshcore.constants import Constants
+
+
+class EagerConnection(Connection):
+    """Decodes every field up front, as the handlers did before frame views."""
+
+    def on_contact_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.Contact, {
+            "publicKey": reader.read_bytes(32),
+            "type": reader.read_uint8(),
+            "flags": reader.read_uint8(),
+            "outPathLen": reader.read_int8(),
+            "outPath": reader.read_bytes(64),
+            "advName": reader.read_cstring(32),
+            "lastAdvert": reader.read_uint32_le(),
+            "advLat": reader.read_uint32_le(),
+            "advLon": reader.read_uint32_le(),
+            "lastMod": reader.read_uint32_le(),
+        })
+
+    def on_log_rx_data_push(self, reader: BufferReader):
+        self.emit(Constants.PushCodes.LogRxData, {
+            "lastSnr": reader.read_int8() / 4,
+            "lastRssi": reader.read_int8(),
+            "raw": reader.read_remaining_bytes(),
+        })
+
+
+def contact_frame() -> bytes:
+    return (
+        bytes([Constants.ResponseCodes.Contact])
+        + bytes(range(32)) + bytes([1, 0, 2]) + bytes(64)
+        + b"node".ljust(32, b"\x00")
+        + struct.pack("<IIII", 1700000000, 51500000, 4294967000, 1700000001)
+    )
+
+
+def log_rx_frame() -> bytes:
+    return bytes([Constants.PushCodes.LogRxData, 0xF4, 0xA0]) + bytes(120)
+
+
+def bench(connection_class, frame: bytes, listen: bool, read_field, count: int) -> float:
+    connection = connection_class()
+    code = frame[0]
+    if listen:
+        # inline listener reading one field, the common "filter on a key" case
+        connection.on(code, read_field, inline=True)
+    elif connection_class is EagerConnection:
+        # previous behaviour: decoding happened even without listeners
+        connection._frame_skippable = [False] * 256
+    return timeit.timeit(lambda: connection.on_frame_received(frame), number=count) / count
+
+
+if __name__ == "__main__":
+    count = 100_000
+    cases = (
+        ("Contact", contact_frame(), lambda data: data["publicKey"]),
+        ("LogRxData", log_rx_frame(), lambda data: data["lastSnr"]),
+    )
+    for name, frame, read_field in cases:
+        for listen in (True, False):
+            eager = bench(EagerConnection, frame, listen, read_field, count)
+            lazy = bench(Connection, frame, listen, read_field, count)
+            label = "listened" if listen else "unheard"
+            print(f"{name:>10} {label:>9}   eager: {eager * 1e9:8.0f} ns/frame"
+                  f"   lazy: {lazy * 1e9:8.0f} ns/frame")
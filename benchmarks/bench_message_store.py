@@ -0,0 +1,51 @@
+"""
+MessageStore ingest throughput for 1M synthetic messages, with 10% retried duplicates,
+then time and sender range queries.
+
+    python -m benchmarks.bench_message_store
+"""
+import random
+import tempfile
+import time
+
+from meshcore.message_store import MessageStore
+
+
+if __name__ == "__main__":
+    count = 1_000_000
+    rng = random.Random(1)
+    senders = [rng.randbytes(6) for _ in range(500)]
+    texts = [f"synthetic message {i} " + "x" * rng.randrange(0, 80) for i in range(1000)]
+    start_time = 1_700_000_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = MessageStore(directory)
+        started = time.perf_counter()
+        added = 0
+        for i in range(count):
+            if i and rng.random() < 0.1:
+                # a retried send, same message seen again
+                j = i - rng.randrange(1, min(i, 1000) + 1)
+            else:
+                j = i
+            if store.add(MessageStore.KIND_CONTACT, senders[j % 500], start_time + j, texts[j % 1000],
+                         received_at=start_time + i // 10):
+                added += 1
+        store.flush()
+        ingest = time.perf_counter() - started
+        print(f"ingest {count} messages: {ingest:6.2f} s ({count / ingest:,.0f} msg/s), "
+              f"{added} stored, {store.duplicate_count} duplicates dropped")
+
+        started = time.perf_counter()
+        in_range = sum(1 for _ in store.query(since=start_time + 50_000, until=start_time + 51_000))
+        print(f"time range query: {in_range} messages in {(time.perf_counter() - started) * 1e3:.1f} ms")
+
+        started = time.perf_counter()
+        from_sender = sum(1 for _ in store.query(sender=senders[7], since=start_time + 50_000))
+        print(f"sender query: {from_sender} messages in {(time.perf_counter() - started) * 1e3:.1f} ms")
+        store.close()
+
+        started = time.perf_counter()
+        reopened = MessageStore(directory)
+        print(f"reopen and rebuild indexes: {len(reopened)} messages in {time.perf_counter() - started:.2f} s")
+        reopened.close()
@@ -0,0 +1,73 @@
+"""
+Construction time and retained memory of Packet.from_bytes, compared with the previous
+Packet that computed every derived field eagerly in __init__.
+
+    python -m benchmarks.bench_packet
+"""
+import random
+import timeit
+import tracemalloc
+
+from meshcore.buffer_reader import BufferReader
+from meshcore.packets import Packet
+
+
+class LegacyPacket:
+    def __init__(self, header: int, path: bytes, payload: bytes):
+        self.header = header
+        self.path = path
+        self.payload = payload
+        self.route_type = header & Packet.PH_ROUTE_MASK
+        self.route_type_string = {Packet.ROUTE_TYPE_FLOOD: "FLOOD", Packet.ROUTE_TYPE_DIRECT: "DIRECT"}.get(self.route_type)
+        self.payload_type = (header >> Packet.PH_TYPE_SHIFT) & Packet.PH_TYPE_MASK
+        self.payload_type_string = {
+            Packet.PAYLOAD_TYPE_REQ: "REQ",
+            Packet.PAYLOAD_TYPE_RESPONSE: "RESPONSE",
+            Packet.PAYLOAD_TYPE_TXT_MSG: "TXT_MSG",
+            Packet.PAYLOAD_TYPE_ACK: "ACK",
+            Packet.PAYLOAD_TYPE_ADVERT: "ADVERT",
+            Packet.PAYLOAD_TYPE_GRP_TXT: "GRP_TXT",
+            Packet.PAYLOAD_TYPE_GRP_DATA: "GRP_DATA",
+            Packet.PAYLOAD_TYPE_ANON_REQ: "ANON_REQ",
+            Packet.PAYLOAD_TYPE_PATH: "PATH",
+            Packet.PAYLOAD_TYPE_TRACE: "TRACE",
+            Packet.PAYLOAD_TYPE_RAW_CUSTOM: "RAW_CUSTOM",
+        }.get(self.payload_type)
+        self.payload_version = (header >> Packet.PH_VER_SHIFT) & Packet.PH_VER_MASK
+        self.is_marked_do_not_retransmit = header == 0xFF
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "LegacyPacket":
+        buffer_reader = BufferReader(data)
+        header = buffer_reader.read_byte()
+        path_len = buffer_reader.read_int8()
+        path = buffer_reader.read_bytes(path_len)
+        payload = buffer_reader.read_remaining_bytes()
+        return LegacyPacket(header, path, payload)
+
+
+def retained_bytes(parse, packets) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    retained = [parse(packet) for packet in packets]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del retained
+    return (after - before) / len(packets)
+
+
+if __name__ == "__main__":
+    count = 100_000
+    rng = random.Random(1)
+    packets = []
+    for _ in range(count):
+        path_len = rng.randrange(0, 8)
+        packets.append(bytes([rng.randrange(256), path_len]) + rng.randbytes(path_len + rng.randrange(10, 150)))
+
+    for name, parse in (("Packet", Packet.from_bytes), ("legacy", LegacyPacket.from_bytes)):
+        elapsed = timeit.timeit(lambda: [parse(packet) for packet in packets], number=1)
+        # raw packet bytes are shared with the caller, only count what parsing adds
+        memory = retained_bytes(parse, packets)
+        print(f"{name:>7}: {elapsed / count * 1e9:6.0f} ns/packet, {memory:6.0f} bytes retained/packet")
+
+    assert all(Packet.from_bytes(packet).to_bytes() == packet for packet in packets)
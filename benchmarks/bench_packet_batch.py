@@ -0,0 +1,38 @@
+"""
+Header decoding of 1M logged raw packets: parse_packets() against Packet.from_bytes.
+
+    python -m benchmarks.bench_packet_batch
+"""
+import random
+import time
+
+from meshcore.packet_batch import parse_packets
+from meshcore.packets import Packet
+
+
+if __name__ == "__main__":
+    count = 1_000_000
+    rng = random.Random(1)
+    packets = []
+    for _ in range(count):
+        path_len = rng.randrange(0, 8)
+        packets.append(bytes([rng.randrange(256), path_len]) + rng.randbytes(path_len + rng.randrange(10, 150)))
+
+    started = time.perf_counter()
+    buffer, records = parse_packets(packets)
+    batch = time.perf_counter() - started
+
+    started = time.perf_counter()
+    objects = [Packet.from_bytes(packet) for packet in packets]
+    per_object = time.perf_counter() - started
+
+    for i in range(0, count, 9973):
+        packet = objects[i]
+        assert records["payload_type"][i] == packet.payload_type
+        assert records["route_type"][i] == packet.route_type
+        assert records["payload_version"][i] == packet.payload_version
+        assert records["payload_length"][i] == len(packet.payload)
+
+    print(f"parse_packets:      {batch:6.2f} s ({batch / count * 1e9:6.0f} ns/packet)")
+    print(f"Packet.from_bytes:  {per_object:6.2f} s ({per_object / count * 1e9:6.0f} ns/packet)")
+    print(f"speedup: {per_object / batch:.1f}x")
@@ -0,0 +1,53 @@
+"""
+Wall-clock time for N commands over a simulated slow link, awaited one at a time
+versus pipelined with Connection.pipeline().
+
+    python -m benchmarks.bench_pipelining
+"""
+import asyncio
+import struct
+import time
+
+from meshcore.connection.base_connection import Connection
+from meshcore.constants import Constants
+
+
+class SlowLinkConnection(Connection):
+    """
+    Answers every command with a BatteryVoltage frame after a fixed one-way delay,
+    processing commands one after another like the radio does.
+    """
+
+    def __init__(self, one_way_delay: float, processing_time: float):
+        super().__init__()
+        self.one_way_delay = one_way_delay
+        self.processing_time = processing_time
+        self.radio_free_at = 0.0
+
+    async def send_to_radio_frame(self, data: bytes):
+        loop = asyncio.get_running_loop()
+        arrives = loop.time() + self.one_way_delay
+        self.radio_free_at = max(arrives, self.radio_free_at) + self.processing_time
+        response = bytes([Constants.ResponseCodes.BatteryVoltage]) + struct.pack("<H", 4100)
+        loop.call_at(self.radio_free_at + self.one_way_delay, self.on_frame_received, response)
+
+
+async def main(count: int = 50):
+    # roughly a BLE-bridged TCP link: 40 ms each way, 2 ms per command on the radio
+    connection = SlowLinkConnection(0.040, 0.002)
+
+    start = time.perf_counter()
+    for _ in range(count):
+        await connection.get_battery_voltage()
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await connection.pipeline(*(connection.get_battery_voltage() for _ in range(count)))
+    pipelined = time.perf_counter() - start
+
+    print(f"{count} commands  sequential: {sequential * 1000:8.1f} ms"
+          f"   pipelined (max {Connection.MAX_IN_FLIGHT} in flight): {pipelined * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,161 @@
+import asyncio
+import struct
+
+from .advert import Advert
+from .advert_verifier import AdvertVerifier
+from .constants import Constants
+from .events import ConnectionListener, EventEmitter
+from .packets import Packet
+
+
+class AdvertRegistry(EventEmitter, ConnectionListener):
+    """
+    Latest advert of each node, from raw advert payloads (public key, timestamp,
+    signature, app data).
+
+    An advert is only accepted if its timestamp is newer than the one held for its
+    public key. That is checked on the first 36 bytes before anything else, so replays
+    and the repeated copies of an advert storm cost a dict lookup each. New adverts are
+    signature checked with verifier (the shared AdvertVerifier.default() if None) unless
+    verify is False, and kept as Advert objects whose app data is decoded on first use.
+
+    Emits "advert" with each accepted Advert.
+    """
+
+    # attach(connection): ingest the adverts among the packets reported by LogRxData pushes
+    LISTENERS = {
+        Constants.PushCodes.LogRxData: "add_log_rx_data",
+    }
+
+    _HEADER = struct.Struct("<32sI")
+    SIGNATURE_OFFSET = 36
+    APP_DATA_OFFSET = 100
+
+    def __init__(self, verifier: AdvertVerifier | None = None, verify: bool = True):
+        super().__init__()
+        self.verifier = verifier
+        self.verify = verify
+        self.accepted_count = 0
+        self.stale_count = 0
+        self.invalid_count = 0
+        # public key -> latest accepted Advert
+        self._adverts = {}
+        # payloads being verified, whole so a corrupted copy cannot shadow the genuine one
+        self._verifying = set()
+        self._tasks = set()
+
+    def __len__(self) -> int:
+        return len(self._adverts)
+
+    def __contains__(self, public_key) -> bool:
+        return bytes(public_key) in self._adverts
+
+    def __iter__(self):
+        return iter(self._adverts.values())
+
+    def get(self, public_key: bytes) -> Advert | None:
+        return self._adverts.get(bytes(public_key))
+
+    def remove(self, public_key: bytes) -> Advert | None:
+        return self._adverts.pop(bytes(public_key), None)
+
+    def is_newer(self, public_key: bytes, timestamp: int) -> bool:
+        """True if an advert with this timestamp would replace the one held for public_key."""
+        advert = self._adverts.get(bytes(public_key))
+        return advert is None or timestamp > advert.timestamp
+
+    def add_log_rx_data(self, data) -> bool:
+        try:
+            packet = Packet.from_bytes(data["raw"])
+        except ValueError:
+            self.invalid_count += 1
+            return False
+        if packet.get_payload_type() != Packet.PAYLOAD_TYPE_ADVERT:
+            return False
+        return self.ingest_nowait(packet.payload_view)
+
+    async def ingest(self, payload) -> Advert | None:
+        """Add a raw advert payload, returns the Advert if it was accepted, None otherwise."""
+        header = self._check(payload)
+        if header is None:
+            return None
+        return await self._accept(*header, payload)
+
+    def ingest_nowait(self, payload) -> bool:
+        """
+        ingest() for synchronous callers such as inline listeners. Returns True if the
+        advert is newer than the one held, listen for "advert" to know when it is accepted.
+        """
+        header = self._check(payload)
+        if header is None:
+            return False
+        if not self.verify:
+            self._store(self._advert(*header, payload))
+            return True
+
+        task = asyncio.ensure_future(self._accept(*header, payload))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_accept_done)
+        return True
+
+    def _on_accept_done(self, task: asyncio.Future):
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            # nobody awaits the task, e.g. the verifier was closed
+            task.get_loop().call_exception_handler({
+                "message": "Advert verification failed",
+                "exception": exc,
+            })
+
+    def _check(self, payload) -> tuple | None:
+        if len(payload) <= self.APP_DATA_OFFSET:
+            self.invalid_count += 1
+            return None
+        public_key, timestamp = self._HEADER.unpack_from(payload)
+        advert = self._adverts.get(public_key)
+        if advert is not None and timestamp <= advert.timestamp:
+            self.stale_count += 1
+            return None
+        if self._verifying and bytes(payload) in self._verifying:
+            # an identical copy is already being verified
+            self.stale_count += 1
+            return None
+        return public_key, timestamp
+
+    def _advert(self, public_key: bytes, timestamp: int, payload) -> Advert:
+        signature = bytes(payload[self.SIGNATURE_OFFSET:self.APP_DATA_OFFSET])
+        return Advert(public_key, timestamp, signature, bytes(payload[self.APP_DATA_OFFSET:]))
+
+    def _accept(self, public_key: bytes, timestamp: int, payload):
+        """Coroutine accepting the advert once verified, marked as in progress right away."""
+        advert = self._advert(public_key, timestamp, payload)
+        verifying = None
+        if self.verify:
+            verifying = bytes(payload)
+            self._verifying.add(verifying)
+        return self._verify_and_store(advert, verifying)
+
+    async def _verify_and_store(self, advert: Advert, verifying: bytes | None) -> Advert | None:
+        if self.verify:
+            public_key, timestamp = advert.public_key, advert.timestamp
+            try:
+                valid = await advert.is_verified(self.verifier)
+            finally:
+                self._verifying.discard(verifying)
+            if not valid:
+                self.invalid_count += 1
+                return None
+            # a newer advert may have been accepted while this one was verified
+            if not self.is_newer(public_key, timestamp):
+                self.stale_count += 1
+                return None
+        return self._store(advert)
+
+    def _store(self, advert: Advert) -> Advert:
+        self._adverts[advert.public_key] = advert
+        self.accepted_count += 1
+        self.emit("advert", advert)
+        return advert
@@ -0,0 +1,201 @@
+import asyncio
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    from nacl.signing import VerifyKey
+    from nacl.exceptions import BadSignatureError, CryptoError
+    HAS_NACL = True
+except ImportError:
+    HAS_NACL = False
+
+
+# public key -> VerifyKey, per process (worker processes each keep their own)
+_VERIFY_KEYS = OrderedDict()
+_VERIFY_KEYS_LOCK = threading.Lock()
+_VERIFY_KEYS_SIZE = 4096
+
+
+def _verify_key(public_key: bytes):
+    with _VERIFY_KEYS_LOCK:
+        verify_key = _VERIFY_KEYS.get(public_key)
+        if verify_key is not None:
+            _VERIFY_KEYS.move_to_end(public_key)
+            return verify_key
+
+    verify_key = VerifyKey(public_key)
+    with _VERIFY_KEYS_LOCK:
+        _VERIFY_KEYS[public_key] = verify_key
+        if len(_VERIFY_KEYS) > _VERIFY_KEYS_SIZE:
+            _VERIFY_KEYS.popitem(last=False)
+    return verify_key
+
+
+def verify_batch(items) -> list:
+    """
+    Verify (public key, signed data, signature) tuples, returns a bool for each.
+    Module level so it can run in worker processes as well as threads.
+    """
+    results = []
+    for public_key, signed_data, signature in items:
+        try:
+            _verify_key(public_key).verify(signed_data, signature)
+            results.append(True)
+        except (BadSignatureError, CryptoError, ValueError):
+            results.append(False)
+    return results
+
+
+class AdvertVerifier:
+    """
+    Verifies advert signatures off the event loop.
+
+    verify() returns a future. Requests made in the same loop iteration are collected
+    into batches of up to batch_size and verified on a thread pool (or a process pool
+    with use_processes=True, or the given executor). VerifyKey objects are cached per
+    public key, results are memoized per signed advert in an LRU of cache_size, and
+    identical adverts already being verified share one verification. Each caller gets
+    its own future, cancelling it does not affect the others.
+
+    A verifier serves one event loop at a time. Used from a new loop once the previous
+    one stopped, verifications still pending on the old loop are dropped.
+    Requires PyNaCl.
+    """
+
+    # event loop -> its default() verifier
+    _defaults = weakref.WeakKeyDictionary()
+    _defaults_lock = threading.Lock()
+
+    def __init__(self, executor=None, max_workers: int | None = None, use_processes: bool = False,
+                 batch_size: int = 64, cache_size: int = 16384):
+        if not HAS_NACL:
+            raise RuntimeError("PyNaCl is required for signature verification")
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers) if use_processes else ThreadPoolExecutor(max_workers)
+            self._owns_executor = True
+        else:
+            self._owns_executor = False
+        self.executor = executor
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.verified_count = 0
+        # (public key, timestamp, signature, app data) -> bool
+        self._results = OrderedDict()
+        # same key -> shared future of the verification in progress
+        self._in_progress = {}
+        self._batch = []
+        self._flush_handle = None
+        # weak reference to the loop the pending batch and futures belong to, weak so
+        # that default() verifiers do not keep their loop alive
+        self._loop_ref = None
+
+    @classmethod
+    def default(cls) -> "AdvertVerifier":
+        """Shared verifier of the running event loop, used by Advert.is_verified()."""
+        loop = asyncio.get_running_loop()
+        with cls._defaults_lock:
+            verifier = cls._defaults.get(loop)
+            if verifier is None:
+                verifier = cls._defaults[loop] = cls()
+        return verifier
+
+    def close(self):
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+
+    def verify(self, advert) -> asyncio.Future:
+        """Future resolved with True if the advert's signature is valid."""
+        loop = asyncio.get_running_loop()
+        if self._loop() is not loop:
+            self._bind(loop)
+        key = (bytes(advert.public_key), advert.timestamp, bytes(advert.signature), bytes(advert.app_data))
+
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+            self.cache_hits += 1
+            future = loop.create_future()
+            future.set_result(result)
+            return future
+
+        shared = self._in_progress.get(key)
+        if shared is not None:
+            self.cache_hits += 1
+        else:
+            shared = self._in_progress[key] = loop.create_future()
+            self._batch.append((key, (key[0], advert.get_signed_data(), key[2])))
+            if len(self._batch) >= self.batch_size:
+                self._flush(loop)
+            elif self._flush_handle is None:
+                # collect everything requested in this loop iteration first
+                self._flush_handle = loop.call_soon(self._flush, loop)
+
+        future = loop.create_future()
+        shared.add_done_callback(lambda done: _copy_result(done, future))
+        return future
+
+    async def verify_many(self, adverts) -> list:
+        return list(await asyncio.gather(*(self.verify(advert) for advert in adverts)))
+
+    def _loop(self):
+        return self._loop_ref() if self._loop_ref is not None else None
+
+    def _bind(self, loop):
+        previous = self._loop()
+        if previous is not None and previous.is_running():
+            raise RuntimeError("AdvertVerifier is in use by another event loop")
+        # anything pending belongs to a loop that stopped, its flush never ran
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._batch = []
+        self._in_progress = {}
+        self._loop_ref = weakref.ref(loop)
+
+    def _flush(self, loop):
+        if loop is not self._loop():
+            return
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+
+        keys = [key for key, _ in batch]
+        in_progress = self._in_progress
+        work = loop.run_in_executor(self.executor, verify_batch, [item for _, item in batch])
+        work.add_done_callback(lambda done: self._on_batch_done(in_progress, keys, done))
+
+    def _on_batch_done(self, in_progress: dict, keys, done: asyncio.Future):
+        if done.cancelled() or done.exception() is not None:
+            exc = asyncio.CancelledError() if done.cancelled() else done.exception()
+            for key in keys:
+                future = in_progress.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(exc)
+            return
+
+        results = self._results
+        for key, result in zip(keys, done.result()):
+            self.verified_count += 1
+            results[key] = result
+            if len(results) > self.cache_size:
+                results.popitem(last=False)
+            future = in_progress.pop(key, None)
+            if future is not None and not future.done():
+                future.set_result(result)
+
+
+def _copy_result(source: asyncio.Future, target: asyncio.Future):
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
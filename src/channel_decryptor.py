@@ -0,0 +1,154 @@
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+from .constants import Constants
+from .crypto_utils import CachedKey, CryptoUtils
+from .events import ConnectionListener
+from .packets import Packet
+
+
+class _ChannelKey(CachedKey):
+    __slots__ = ("channel_idx", "name", "channel_hash")
+
+    def __init__(self, secret: bytes, channel_idx: int | None, name: str | None):
+        super().__init__(secret)
+        self.channel_idx = channel_idx
+        self.name = name
+        self.channel_hash = CryptoUtils.channel_hash(secret)
+
+
+class ChannelDecryptor(ConnectionListener):
+    """
+    Decrypts GRP_TXT / GRP_DATA packets for known group channels.
+
+    Channels are indexed by the 1-byte channel hash at the start of the payload, so a
+    packet is only tried against the channels sharing its hash, and the 2-byte MAC is
+    checked before anything is decrypted. Requires the cryptography package.
+    """
+
+    # attach(connection): learn channels from ChannelInfo responses, e.g. get_channel(idx) for each index
+    LISTENERS = {
+        Constants.ResponseCodes.ChannelInfo: "add_channel_info",
+    }
+
+    def __init__(self):
+        CryptoUtils.require_cryptography()
+        # channel hash -> [_ChannelKey]
+        self._by_hash = {}
+        self.decrypted_count = 0
+        self.unknown_count = 0
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self._by_hash.values())
+
+    def add_channel(self, secret: bytes, channel_idx: int | None = None, name: str | None = None):
+        """Add a channel by its 16-byte secret, replacing a channel with the same secret."""
+        key = _ChannelKey(bytes(secret), channel_idx, name)
+        keys = [k for k in self._by_hash.get(key.channel_hash, ()) if k.secret != key.secret]
+        keys.append(key)
+        self._by_hash[key.channel_hash] = keys
+
+    def remove_channel(self, secret: bytes):
+        channel_hash = CryptoUtils.channel_hash(secret)
+        keys = [k for k in self._by_hash.get(channel_hash, ()) if k.secret != bytes(secret)]
+        if keys:
+            self._by_hash[channel_hash] = keys
+        else:
+            self._by_hash.pop(channel_hash, None)
+
+    def add_channel_info(self, data):
+        """Add a channel from ChannelInfo data, as returned by get_channel()."""
+        if any(data["secret"]):
+            self.add_channel(data["secret"], data["channelIdx"], data["name"])
+
+    def decrypt(self, packet: Packet) -> dict | None:
+        """
+        Decrypt a group packet, None if it is not one or no known channel matches.
+        GRP_TXT returns channel, timestamp, txtType, attempt and text;
+        GRP_DATA returns channel and the decrypted data.
+        """
+        result, unknown = self._decrypt(packet)
+        if result is not None:
+            self.decrypted_count += 1
+        elif unknown:
+            self.unknown_count += 1
+        return result
+
+    def decrypt_batch(self, packets, executor=None, chunk_size: int = 256) -> list:
+        """
+        Decrypt many packets (Packet objects or raw bytes) in a thread pool, results in order.
+        Uses executor if given, otherwise a temporary ThreadPoolExecutor.
+        """
+        packets = list(packets)
+        chunks = [packets[i:i + chunk_size] for i in range(0, len(packets), chunk_size)]
+        if executor is None:
+            with ThreadPoolExecutor() as pool:
+                chunk_results = list(pool.map(self._decrypt_chunk, chunks))
+        else:
+            chunk_results = list(executor.map(self._decrypt_chunk, chunks))
+
+        # counters are only updated here, on the calling thread
+        results = []
+        for chunk, decrypted, unknown in chunk_results:
+            results.extend(chunk)
+            self.decrypted_count += decrypted
+            self.unknown_count += unknown
+        return results
+
+    def _decrypt_chunk(self, packets) -> tuple:
+        results = []
+        decrypted = unknown = 0
+        for packet in packets:
+            if not isinstance(packet, Packet):
+                try:
+                    packet = Packet.from_bytes(packet)
+                except ValueError:
+                    results.append(None)
+                    continue
+            result, is_unknown = self._decrypt(packet)
+            results.append(result)
+            if result is not None:
+                decrypted += 1
+            elif is_unknown:
+                unknown += 1
+        return results, decrypted, unknown
+
+    def _decrypt(self, packet: Packet) -> tuple:
+        # (result, whether it is a group packet for a channel we do not know)
+        payload_type = packet.get_payload_type()
+        if payload_type != Packet.PAYLOAD_TYPE_GRP_TXT and payload_type != Packet.PAYLOAD_TYPE_GRP_DATA:
+            return None, False
+        payload = packet.payload_view
+        if len(payload) < 1 + CryptoUtils.CIPHER_MAC_SIZE + CryptoUtils.CIPHER_BLOCK_SIZE:
+            return None, False
+
+        keys = self._by_hash.get(payload[0])
+        if keys is None:
+            return None, True
+
+        mac = bytes(payload[1:1 + CryptoUtils.CIPHER_MAC_SIZE])
+        ciphertext = bytes(payload[1 + CryptoUtils.CIPHER_MAC_SIZE:])
+        if len(ciphertext) % CryptoUtils.CIPHER_BLOCK_SIZE:
+            return None, False
+        for key in keys:
+            plaintext = key.mac_then_decrypt(mac, ciphertext)
+            if plaintext is not None:
+                return self._decode(key, payload_type, plaintext), False
+        return None, True
+
+    @staticmethod
+    def _decode(key: _ChannelKey, payload_type: int, plaintext: bytes) -> dict:
+        channel = {"channelIdx": key.channel_idx, "channelName": key.name, "channelHash": key.channel_hash}
+        if payload_type == Packet.PAYLOAD_TYPE_GRP_DATA:
+            channel["data"] = plaintext
+            return channel
+
+        timestamp, flags = struct.unpack_from("<IB", plaintext)
+        channel.update({
+            "timestamp": timestamp,
+            "txtType": flags >> 2,
+            "attempt": flags & 0x03,
+            # "sender name: message", zero padded to the cipher block size
+            "text": plaintext[5:].split(b"\x00", 1)[0].decode("utf-8", errors="ignore"),
+        })
+        return channel
@@ -0,0 +1,133 @@
+import asyncio
+from collections import deque
+
+from ..buffer_writer import BufferWriter
+from ..frame_decoder import FrameDecoder
+from .connection import Connection
+
+
+class _TCPProtocol(asyncio.Protocol):
+    """
+    asyncio protocol feeding received bytes straight into the connection's frame decoder.
+    Tracks transport flow control so writers can wait for the send buffer to drain.
+    """
+
+    def __init__(self, connection: "AsyncTCPConnection"):
+        self.connection = connection
+        self.transport = None
+        self._paused = False
+        self._drain_waiters = deque()
+        self._closed = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self._closed = asyncio.get_running_loop().create_future()
+
+    def data_received(self, data: bytes):
+        self.connection.on_socket_data_received(data)
+
+    def connection_lost(self, exc):
+        self._paused = False
+        self._wake_drain_waiters(exc or ConnectionResetError("Connection lost"))
+        if not self._closed.done():
+            self._closed.set_result(None)
+        self.connection.on_transport_lost(exc)
+
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        self._wake_drain_waiters(None)
+
+    def _wake_drain_waiters(self, exc):
+        while self._drain_waiters:
+            waiter = self._drain_waiters.popleft()
+            if not waiter.done():
+                if exc is None:
+                    waiter.set_result(None)
+                else:
+                    waiter.set_exception(exc)
+
+    async def drain(self):
+        if self.transport.is_closing():
+            # wait a tick so connection_lost gets a chance to run
+            await asyncio.sleep(0)
+            raise ConnectionResetError("Connection lost")
+        if not self._paused:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._drain_waiters.append(waiter)
+        await waiter
+
+
+class AsyncTCPConnection(Connection):
+    """
+    TCP connection running entirely on the asyncio event loop.
+    Frames are decoded and dispatched from data_received without any thread hand-off,
+    and writes go through the transport's buffer with drain() backpressure.
+    """
+
+    def __init__(self, host: str, port: int, write_buffer_high_water: int = 64 * 1024):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.write_buffer_high_water = write_buffer_high_water
+        self.frame_decoder = FrameDecoder()
+        self.transport = None
+        self.protocol = None
+
+    async def connect(self):
+        """Connect to TCP server, frames are processed on the running event loop."""
+        loop = asyncio.get_running_loop()
+        try:
+            self.transport, self.protocol = await loop.create_connection(
+                lambda: _TCPProtocol(self), self.host, self.port,
+            )
+        except Exception as e:
+            print("Connection Error", e)
+            return
+
+        self.transport.set_write_buffer_limits(high=self.write_buffer_high_water)
+        await self.on_connected()
+
+    def on_socket_data_received(self, data: bytes):
+        """Feed received bytes to the frame decoder and process complete frames."""
+        for frame_data in self.frame_decoder.feed(data):
+            try:
+                self.on_frame_received(frame_data)
+            except Exception as e:
+                print("Failed to process frame", e)
+
+    def on_transport_lost(self, exc):
+        self.transport = None
+        self.frame_decoder.reset()
+        if exc is not None:
+            print("Receive Error", exc)
+        self.on_disconnected()
+
+    async def close(self):
+        if self.transport:
+            protocol = self.protocol
+            self.transport.close()
+            await protocol._closed
+
+    async def write(self, data: bytes):
+        """Queue raw bytes on the transport, waiting while its buffer is above the high-water mark."""
+        if not self.transport:
+            raise ConnectionError("Not connected")
+        self.transport.write(data)
+        await self.protocol.drain()
+
+    async def write_frame(self, frame_type: int, frame_data: bytes):
+        """Construct and send a framed packet."""
+        frame = BufferWriter()
+        frame.write_byte(frame_type)
+        frame.write_uint16_le(len(frame_data))
+        frame.write_bytes(frame_data)
+        await self.write(frame.to_bytes())
+
+    async def send_to_radio_frame(self, data: bytes):
+        """Send 'app to radio' frame (0x3c '<')."""
+        self.emit("tx", data)
+        await self.write_frame(0x3C, data)
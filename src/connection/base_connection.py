@@ -1,1188 +1,1411 @@
-# meshcore/connection/base_connection.py
-
-from meshcore.buffer.buffer_writer import BufferWriter
-from meshcore.buffer.buffer_reader import BufferReader
-from meshcore.constants import Constants
-from meshcore.events import EventEmitter
-
-
-class Connection(EventEmitter):
-    """
-    Base connection class for MeshCore.
-    Subclasses must implement transport-specific methods like close() and send_to_radio_frame().
-    """
-
-    async def on_connected(self):
-        try:
-            await self.device_query(Constants.SupportedCompanionProtocolVersion)
-        except Exception:
-            pass
-        self.emit("connected")
-
-    def on_disconnected(self):
-        self.emit("disconnected")
-
-    async def close(self):
-        raise NotImplementedError("Subclass must implement close()")
-
-    async def send_to_radio_frame(self, data: bytes):
-        raise NotImplementedError("Subclass must implement send_to_radio_frame()")
-
-    # -------------------------
-    # Command senders
-    # -------------------------
-
-    async def send_command_app_start(self):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.AppStart)
-        data.write_uint8(1)  # appVer
-        data.write_bytes(b"\x00" * 6)  # reserved
-        data.write_string("test")
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_send_txt_msg(self, txt_type, attempt, sender_timestamp, pubkey_prefix, text):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SendTxtMsg)
-        data.write_uint8(txt_type)
-        data.write_uint8(attempt)
-        data.write_uint32_le(sender_timestamp)
-        data.write_bytes(pubkey_prefix[:6])  # only first 6 bytes
-        data.write_string(text)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_send_channel_txt_msg(self, txt_type, channel_idx, sender_timestamp, text):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SendChannelTxtMsg)
-        data.write_uint8(txt_type)
-        data.write_uint8(channel_idx)
-        data.write_uint32_le(sender_timestamp)
-        data.write_string(text)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_get_contacts(self, since=None):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.GetContacts)
-        if since is not None:
-            data.write_uint32_le(since)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_get_device_time(self):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.GetDeviceTime)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_set_device_time(self, epoch_secs):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SetDeviceTime)
-        data.write_uint32_le(epoch_secs)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_send_self_advert(self, advert_type):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SendSelfAdvert)
-        data.write_uint8(advert_type)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_set_advert_name(self, name):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SetAdvertName)
-        data.write_string(name)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_add_update_contact(self, public_key, type_, flags, out_path_len,
-                                              out_path, adv_name, last_advert, adv_lat, adv_lon):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.AddUpdateContact)
-        data.write_bytes(public_key)
-        data.write_uint8(type_)
-        data.write_uint8(flags)
-        data.write_uint8(out_path_len)
-        data.write_bytes(out_path)  # 64 bytes
-        data.write_cstring(adv_name, 32)  # fixed length
-        data.write_uint32_le(last_advert)
-        data.write_uint32_le(adv_lat)
-        data.write_uint32_le(adv_lon)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_sync_next_message(self):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SyncNextMessage)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_set_radio_params(self, freq, bw, sf, cr):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SetRadioParams)
-        data.write_uint32_le(freq)
-        data.write_uint32_le(bw)
-        data.write_uint8(sf)
-        data.write_uint8(cr)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_set_tx_power(self, tx_power):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SetTxPower)
-        data.write_uint8(tx_power)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_reset_path(self, pubkey):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.ResetPath)
-        data.write_bytes(pubkey)  # 32 bytes
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_set_advert_lat_lon(self, lat, lon):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SetAdvertLatLon)
-        data.write_int32_le(lat)
-        data.write_int32_le(lon)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_remove_contact(self, pubkey):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.RemoveContact)
-        data.write_bytes(pubkey)  # 32 bytes
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_share_contact(self, pubkey):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.ShareContact)
-        data.write_bytes(pubkey)  # 32 bytes
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_export_contact(self, pubkey=None):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.ExportContact)
-        if pubkey:
-            data.write_bytes(pubkey)  # 32 bytes
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_import_contact(self, advert_packet_bytes):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.ImportContact)
-        data.write_bytes(advert_packet_bytes)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_reboot(self):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.Reboot)
-        data.write_string("reboot")
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_get_battery_voltage(self):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.GetBatteryVoltage)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_device_query(self, app_target_ver):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.DeviceQuery)
-        data.write_uint8(app_target_ver)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_export_private_key(self):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.ExportPrivateKey)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_import_private_key(self, private_key):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.ImportPrivateKey)
-        data.write_bytes(private_key)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_send_raw_data(self, path, raw_data):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SendRawData)
-        data.write_uint8(len(path))
-        data.write_bytes(path)
-        data.write_bytes(raw_data)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_send_login(self, public_key, password):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SendLogin)
-        data.write_bytes(public_key)  # 32 bytes
-        data.write_string(password)   # max 15 chars
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_send_status_req(self, public_key):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SendStatusReq)
-        data.write_bytes(public_key)  # 32 bytes
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_send_telemetry_req(self, public_key):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SendTelemetryReq)
-        data.write_uint8(0)  # reserved
-        data.write_uint8(0)  # reserved
-        data.write_uint8(0)  # reserved
-        data.write_bytes(public_key)  # 32 bytes
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_send_binary_req(self, public_key, request_code_and_params):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SendBinaryReq)
-        data.write_bytes(public_key)  # 32 bytes
-        data.write_bytes(request_code_and_params)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_get_channel(self, channel_idx):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.GetChannel)
-        data.write_uint8(channel_idx)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_set_channel(self, channel_idx, name, secret):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SetChannel)
-        data.write_uint8(channel_idx)
-        data.write_cstring(name, 32)
-        data.write_bytes(secret)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_sign_start(self):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SignStart)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_sign_data(self, data_to_sign):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SignData)
-        data.write_bytes(data_to_sign)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_sign_finish(self):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SignFinish)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_send_trace_path(self, tag, auth, path):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SendTracePath)
-        data.write_uint32_le(tag)
-        data.write_uint32_le(auth)
-        data.write_uint8(0)  # flags
-        data.write_bytes(path)
-        await self.send_to_radio_frame(data.to_bytes())
-
-    async def send_command_set_other_params(self, manual_add_contacts):
-        data = BufferWriter()
-        data.write_uint8(Constants.CommandCodes.SetOtherParams)
-        data.write_uint8(manual_add_contacts)  # 0 or 1
-        await self.send_to_radio_frame(data.to_bytes())
-
-    def on_ok_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.Ok, {})
-
-    def on_err_response(self, reader: BufferReader):
-        err_code = reader.read_uint8() if reader.remaining() > 0 else None
-        self.emit(Constants.ResponseCodes.Err, {"errCode": err_code})
-
-    def on_contacts_start_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.ContactsStart, {
-            "count": reader.read_uint32_le(),
-        })
-
-    def on_contact_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.Contact, {
-            "publicKey": reader.read_bytes(32),
-            "type": reader.read_uint8(),
-            "flags": reader.read_uint8(),
-            "outPathLen": reader.read_int8(),
-            "outPath": reader.read_bytes(64),
-            "advName": reader.read_cstring(32),
-            "lastAdvert": reader.read_uint32_le(),
-            "advLat": reader.read_uint32_le(),
-            "advLon": reader.read_uint32_le(),
-            "lastMod": reader.read_uint32_le(),
-        })
-
-    def on_end_of_contacts_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.EndOfContacts, {
-            "mostRecentLastmod": reader.read_uint32_le(),
-        })
-
-    def on_sent_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.Sent, {
-            "result": reader.read_int8(),
-            "expectedAckCrc": reader.read_uint32_le(),
-            "estTimeout": reader.read_uint32_le(),
-        })
-
-    def on_export_contact_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.ExportContact, {
-            "advertPacketBytes": reader.read_remaining_bytes(),
-        })
-
-    def on_battery_voltage_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.BatteryVoltage, {
-            "batteryMilliVolts": reader.read_uint16_le(),
-        })
-
-    def on_device_info_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.DeviceInfo, {
-            "firmwareVer": reader.read_int8(),
-            "reserved": reader.read_bytes(6),
-            "firmwareBuildDate": reader.read_cstring(12),
-            "manufacturerModel": reader.read_string(),
-        })
-
-    def on_private_key_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.PrivateKey, {
-            "privateKey": reader.read_bytes(64),
-        })
-
-    def on_disabled_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.Disabled, {})
-
-    def on_channel_info_response(self, reader: BufferReader):
-        idx = reader.read_uint8()
-        name = reader.read_cstring(32)
-        remaining = reader.remaining()
-        if remaining == 16:
-            self.emit(Constants.ResponseCodes.ChannelInfo, {
-                "channelIdx": idx,
-                "name": name,
-                "secret": reader.read_bytes(remaining),
-            })
-        else:
-            print(f"ChannelInfo unexpected key length: {remaining}")
-
-    def on_sign_start_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.SignStart, {
-            "reserved": reader.read_uint8(),
-            "maxSignDataLen": reader.read_uint32_le(),
-        })
-
-    def on_signature_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.Signature, {
-            "signature": reader.read_bytes(64),
-        })
-
-    def on_self_info_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.SelfInfo, {
-            "type": reader.read_uint8(),
-            "txPower": reader.read_uint8(),
-            "maxTxPower": reader.read_uint8(),
-            "publicKey": reader.read_bytes(32),
-            "advLat": reader.read_int32_le(),
-            "advLon": reader.read_int32_le(),
-            "reserved": reader.read_bytes(3),
-            "manualAddContacts": reader.read_uint8(),
-            "radioFreq": reader.read_uint32_le(),
-            "radioBw": reader.read_uint32_le(),
-            "radioSf": reader.read_uint8(),
-            "radioCr": reader.read_uint8(),
-            "name": reader.read_string(),
-        })
-
-    def on_curr_time_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.CurrTime, {
-            "epochSecs": reader.read_uint32_le(),
-        })
-
-    def on_no_more_messages_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.NoMoreMessages, {})
-
-    def on_contact_msg_recv_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.ContactMsgRecv, {
-            "pubKeyPrefix": reader.read_bytes(6),
-            "pathLen": reader.read_uint8(),
-            "txtType": reader.read_uint8(),
-            "senderTimestamp": reader.read_uint32_le(),
-            "text": reader.read_string(),
-        })
-
-    def on_channel_msg_recv_response(self, reader: BufferReader):
-        self.emit(Constants.ResponseCodes.ChannelMsgRecv, {
-            "channelIdx": reader.read_int8(),
-            "pathLen": reader.read_uint8(),
-            "txtType": reader.read_uint8(),
-            "senderTimestamp": reader.read_uint32_le(),
-            "text": reader.read_string(),
-        })
-
-    def on_advert_push(self, reader: BufferReader):
-        self.emit(Constants.PushCodes.Advert, {
-            "publicKey": reader.read_bytes(32),
-        })
-
-    def on_path_updated_push(self, reader: BufferReader):
-        self.emit(Constants.PushCodes.PathUpdated, {
-            "publicKey": reader.read_bytes(32),
-        })
-
-    def on_send_confirmed_push(self, reader: BufferReader):
-        self.emit(Constants.PushCodes.SendConfirmed, {
-            "ackCode": reader.read_uint32_le(),
-            "roundTrip": reader.read_uint32_le(),
-        })
-
-    def on_msg_waiting_push(self, reader: BufferReader):
-        self.emit(Constants.PushCodes.MsgWaiting, {})
-
-    def on_raw_data_push(self, reader: BufferReader):
-        self.emit(Constants.PushCodes.RawData, {
-            "lastSnr": reader.read_int8() / 4,
-            "lastRssi": reader.read_int8(),
-            "reserved": reader.read_uint8(),
-            "payload": reader.read_remaining_bytes(),
-        })
-
-    def on_login_success_push(self, reader: BufferReader):
-        self.emit(Constants.PushCodes.LoginSuccess, {
-            "reserved": reader.read_uint8(),
-            "pubKeyPrefix": reader.read_bytes(6),
-        })
-
-    def on_status_response_push(self, reader: BufferReader):
-        self.emit(Constants.PushCodes.StatusResponse, {
-            "reserved": reader.read_uint8(),
-            "pubKeyPrefix": reader.read_bytes(6),
-            "statusData": reader.read_remaining_bytes(),
-        })
-
-    def on_log_rx_data_push(self, reader: BufferReader):
-        self.emit(Constants.PushCodes.LogRxData, {
-            "lastSnr": reader.read_int8() / 4,
-            "lastRssi": reader.read_int8(),
-            "raw": reader.read_remaining_bytes(),
-        })
-
-    def on_telemetry_response_push(self, reader: BufferReader):
-        self.emit(Constants.PushCodes.TelemetryResponse, {
-            "reserved": reader.read_uint8(),
-            "pubKeyPrefix": reader.read_bytes(6),
-            "lppSensorData": reader.read_remaining_bytes(),
-        })
-
-    def on_binary_response_push(self, reader: BufferReader):
-        self.emit(Constants.PushCodes.BinaryResponse, {
-            "reserved": reader.read_uint8(),
-            "tag": reader.read_uint32_le(),
-            "responseData": reader.read_remaining_bytes(),
-        })
-
-    def on_trace_data_push(self, reader: BufferReader):
-        reserved = reader.read_uint8()
-        path_len = reader.read_uint8()
-        self.emit(Constants.PushCodes.TraceData, {
-            "reserved": reserved,
-            "pathLen": path_len,
-            "flags": reader.read_uint8(),
-            "tag": reader.read_uint32_le(),
-            "authCode": reader.read_uint32_le(),
-            "pathHashes": reader.read_bytes(path_len),
-            "pathSnrs": reader.read_bytes(path_len),
-            "lastSnr": reader.read_int8() / 4,
-        })
-
-    def on_new_advert_push(self, reader: BufferReader):
-        self.emit(Constants.PushCodes.NewAdvert, {
-            "publicKey": reader.read_bytes(32),
-            "type": reader.read_uint8(),
-            "flags": reader.read_uint8(),
-            "outPathLen": reader.read_int8(),
-            "outPath": reader.read_bytes(64),
-            "advName": reader.read_cstring(32),
-            "lastAdvert": reader.read_uint32_le(),
-            "advLat": reader.read_uint32_le(),
-            "advLon": reader.read_uint32_le(),
-            "lastMod": reader.read_uint32_le(),
-        })
-
-    # -------------------------
-    # High-level convenience APIs
-    # -------------------------
-
-    async def get_contacts(self, since=None, timeout=None):
-        """
-        Request contacts list from the device.
-        Resolves when EndOfContacts is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_end(data):
-            self.off(Constants.ResponseCodes.EndOfContacts, on_end)
-            fut.set_result(data)
-
-        self.once(Constants.ResponseCodes.EndOfContacts, on_end)
-        await self.send_command_get_contacts(since)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def get_self_info(self, timeout=None):
-        """
-        Request self info from the device.
-        Resolves when SelfInfo response is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_self_info(data):
-            self.off(Constants.ResponseCodes.SelfInfo, on_self_info)
-            fut.set_result(data)
-
-        self.once(Constants.ResponseCodes.SelfInfo, on_self_info)
-        await self.send_command_app_start()
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def get_waiting_messages(self, timeout=None):
-        """
-        Request next waiting message.
-        Resolves when NoMoreMessages or a message response is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_no_more(data):
-            self.off(Constants.ResponseCodes.NoMoreMessages, on_no_more)
-            fut.set_result({"messages": []})
-
-        def on_contact_msg(data):
-            self.off(Constants.ResponseCodes.ContactMsgRecv, on_contact_msg)
-            fut.set_result({"contactMsg": data})
-
-        def on_channel_msg(data):
-            self.off(Constants.ResponseCodes.ChannelMsgRecv, on_channel_msg)
-            fut.set_result({"channelMsg": data})
-
-        self.once(Constants.ResponseCodes.NoMoreMessages, on_no_more)
-        self.once(Constants.ResponseCodes.ContactMsgRecv, on_contact_msg)
-        self.once(Constants.ResponseCodes.ChannelMsgRecv, on_channel_msg)
-
-        await self.send_command_sync_next_message()
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def get_channel(self, channel_idx, timeout=None):
-        """
-        Request channel info by index.
-        Resolves when ChannelInfo response is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_channel_info(data):
-            self.off(Constants.ResponseCodes.ChannelInfo, on_channel_info)
-            fut.set_result(data)
-
-        self.once(Constants.ResponseCodes.ChannelInfo, on_channel_info)
-        await self.send_command_get_channel(channel_idx)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def send_advert(self, advert_type, timeout=None):
-        """
-        Send an advert and resolve when Ok or Err is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_ok(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_result(True)
-
-        def on_err(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_exception(Exception("Advert failed"))
-
-        self.once(Constants.ResponseCodes.Ok, on_ok)
-        self.once(Constants.ResponseCodes.Err, on_err)
-
-        await self.send_command_send_self_advert(advert_type)
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def set_advert_name(self, name, timeout=None):
-        """
-        Set advert name and resolve when Ok or Err is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_ok(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_result(True)
-
-        def on_err(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_exception(Exception("SetAdvertName failed"))
-
-        self.once(Constants.ResponseCodes.Ok, on_ok)
-        self.once(Constants.ResponseCodes.Err, on_err)
-
-        await self.send_command_set_advert_name(name)
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def set_advert_lat_lon(self, lat, lon, timeout=None):
-        """
-        Set advert latitude/longitude and resolve when Ok or Err is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_ok(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_result(True)
-
-        def on_err(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_exception(Exception("SetAdvertLatLon failed"))
-
-        self.once(Constants.ResponseCodes.Ok, on_ok)
-        self.once(Constants.ResponseCodes.Err, on_err)
-
-        await self.send_command_set_advert_lat_lon(lat, lon)
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def set_tx_power(self, tx_power, timeout=None):
-        """
-        Set transmit power and resolve when Ok or Err is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_ok(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_result(True)
-
-        def on_err(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_exception(Exception("SetTxPower failed"))
-
-        self.once(Constants.ResponseCodes.Ok, on_ok)
-        self.once(Constants.ResponseCodes.Err, on_err)
-
-        await self.send_command_set_tx_power(tx_power)
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def reboot(self, timeout=None):
-        """
-        Reboot the device and resolve when Ok or Err is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_ok(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_result(True)
-
-        def on_err(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_exception(Exception("Reboot failed"))
-
-        self.once(Constants.ResponseCodes.Ok, on_ok)
-        self.once(Constants.ResponseCodes.Err, on_err)
-
-        await self.send_command_reboot()
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def get_battery_voltage(self, timeout=None):
-        """
-        Request battery voltage and resolve when BatteryVoltage response is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_voltage(data):
-            self.off(Constants.ResponseCodes.BatteryVoltage, on_voltage)
-            fut.set_result(data)
-
-        self.once(Constants.ResponseCodes.BatteryVoltage, on_voltage)
-        await self.send_command_get_battery_voltage()
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def device_query(self, app_target_ver, timeout=None):
-        """
-        Query device for supported protocol version.
-        Resolves when DeviceInfo response is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_info(data):
-            self.off(Constants.ResponseCodes.DeviceInfo, on_info)
-            fut.set_result(data)
-
-        self.once(Constants.ResponseCodes.DeviceInfo, on_info)
-        await self.send_command_device_query(app_target_ver)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def export_private_key(self, timeout=None):
-        """
-        Request private key export.
-        Resolves when PrivateKey response is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_key(data):
-            self.off(Constants.ResponseCodes.PrivateKey, on_key)
-            fut.set_result(data)
-
-        self.once(Constants.ResponseCodes.PrivateKey, on_key)
-        await self.send_command_export_private_key()
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def import_private_key(self, private_key, timeout=None):
-        """
-        Import a private key and resolve when Ok or Err is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_ok(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_result(True)
-
-        def on_err(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_exception(Exception("ImportPrivateKey failed"))
-
-        self.once(Constants.ResponseCodes.Ok, on_ok)
-        self.once(Constants.ResponseCodes.Err, on_err)
-        await self.send_command_import_private_key(private_key)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def get_channel(self, channel_idx, timeout=None):
-        """
-        Request channel info by index.
-        Resolves when ChannelInfo response is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_channel_info(data):
-            self.off(Constants.ResponseCodes.ChannelInfo, on_channel_info)
-            fut.set_result(data)
-
-        self.once(Constants.ResponseCodes.ChannelInfo, on_channel_info)
-        await self.send_command_get_channel(channel_idx)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def set_channel(self, channel_idx, name, secret, timeout=None):
-        """
-        Set channel info and resolve when Ok or Err is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_ok(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_result(True)
-
-        def on_err(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_exception(Exception("SetChannel failed"))
-
-        self.once(Constants.ResponseCodes.Ok, on_ok)
-        self.once(Constants.ResponseCodes.Err, on_err)
-        await self.send_command_set_channel(channel_idx, name, secret)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def sign_start(self, timeout=None):
-        """
-        Begin signing session. Resolves when SignStart response is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_start(data):
-            self.off(Constants.ResponseCodes.SignStart, on_start)
-            fut.set_result(data)
-
-        self.once(Constants.ResponseCodes.SignStart, on_start)
-        await self.send_command_sign_start()
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def sign_data(self, data_to_sign, timeout=None):
-        """
-        Send data to be signed. Resolves when Signature response is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_sig(data):
-            self.off(Constants.ResponseCodes.Signature, on_sig)
-            fut.set_result(data)
-
-        self.once(Constants.ResponseCodes.Signature, on_sig)
-        await self.send_command_sign_data(data_to_sign)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def sign_finish(self, timeout=None):
-        """
-        Finish signing session. Resolves when Ok or Err is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_ok(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_result(True)
-
-        def on_err(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_exception(Exception("SignFinish failed"))
-
-        self.once(Constants.ResponseCodes.Ok, on_ok)
-        self.once(Constants.ResponseCodes.Err, on_err)
-        await self.send_command_sign_finish()
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def send_trace_path(self, tag, auth, path, timeout=None):
-        """
-        Send a trace path. Resolves when Ok or Err is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_ok(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_result(True)
-
-        def on_err(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_exception(Exception("SendTracePath failed"))
-
-        self.once(Constants.ResponseCodes.Ok, on_ok)
-        self.once(Constants.ResponseCodes.Err, on_err)
-        await self.send_command_send_trace_path(tag, auth, path)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def add_update_contact(self, public_key, type_, flags, out_path_len,
-                                 out_path, adv_name, last_advert, adv_lat, adv_lon, timeout=None):
-        """
-        Add or update a contact. Resolves when Ok or Err is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_ok(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_result(True)
-
-        def on_err(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_exception(Exception("AddUpdateContact failed"))
-
-        self.once(Constants.ResponseCodes.Ok, on_ok)
-        self.once(Constants.ResponseCodes.Err, on_err)
-        await self.send_command_add_update_contact(public_key, type_, flags, out_path_len,
-                                                   out_path, adv_name, last_advert, adv_lat, adv_lon)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def remove_contact(self, pubkey, timeout=None):
-        """
-        Remove a contact. Resolves when Ok or Err is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_ok(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_result(True)
-
-        def on_err(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_exception(Exception("RemoveContact failed"))
-
-        self.once(Constants.ResponseCodes.Ok, on_ok)
-        self.once(Constants.ResponseCodes.Err, on_err)
-        await self.send_command_remove_contact(pubkey)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def share_contact(self, pubkey, timeout=None):
-        """
-        Share a contact. Resolves when Ok or Err is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_ok(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_result(True)
-
-        def on_err(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_exception(Exception("ShareContact failed"))
-
-        self.once(Constants.ResponseCodes.Ok, on_ok)
-        self.once(Constants.ResponseCodes.Err, on_err)
-        await self.send_command_share_contact(pubkey)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def export_contact(self, pubkey=None, timeout=None):
-        """
-        Export a contact. Resolves when ExportContact response is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_export(data):
-            self.off(Constants.ResponseCodes.ExportContact, on_export)
-            fut.set_result(data)
-
-        self.once(Constants.ResponseCodes.ExportContact, on_export)
-        await self.send_command_export_contact(pubkey)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def import_contact(self, advert_packet_bytes, timeout=None):
-        """
-        Import a contact. Resolves when Ok or Err is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_ok(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_result(True)
-
-        def on_err(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_exception(Exception("ImportContact failed"))
-
-        self.once(Constants.ResponseCodes.Ok, on_ok)
-        self.once(Constants.ResponseCodes.Err, on_err)
-        await self.send_command_import_contact(advert_packet_bytes)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def send_txt_msg(self, txt_type, attempt, sender_timestamp, pubkey_prefix, text, timeout=None):
-        """
-        Send a text message to a contact. Resolves when Sent response is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_sent(data):
-            self.off(Constants.ResponseCodes.Sent, on_sent)
-            fut.set_result(data)
-
-        self.once(Constants.ResponseCodes.Sent, on_sent)
-        await self.send_command_send_txt_msg(txt_type, attempt, sender_timestamp, pubkey_prefix, text)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def send_channel_txt_msg(self, txt_type, channel_idx, sender_timestamp, text, timeout=None):
-        """
-        Send a text message to a channel. Resolves when Sent response is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_sent(data):
-            self.off(Constants.ResponseCodes.Sent, on_sent)
-            fut.set_result(data)
-
-        self.once(Constants.ResponseCodes.Sent, on_sent)
-        await self.send_command_send_channel_txt_msg(txt_type, channel_idx, sender_timestamp, text)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def send_raw_data(self, path, raw_data, timeout=None):
-        """
-        Send raw data along a path. Resolves when Sent response is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_sent(data):
-            self.off(Constants.ResponseCodes.Sent, on_sent)
-            fut.set_result(data)
-
-        self.once(Constants.ResponseCodes.Sent, on_sent)
-        await self.send_command_send_raw_data(path, raw_data)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def sync_next_message(self, timeout=None):
-        """
-        Request next waiting message. Resolves when NoMoreMessages or a message response is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_no_more(data):
-            self.off(Constants.ResponseCodes.NoMoreMessages, on_no_more)
-            fut.set_result({"messages": []})
-
-        def on_contact_msg(data):
-            self.off(Constants.ResponseCodes.ContactMsgRecv, on_contact_msg)
-            fut.set_result({"contactMsg": data})
-
-        def on_channel_msg(data):
-            self.off(Constants.ResponseCodes.ChannelMsgRecv, on_channel_msg)
-            fut.set_result({"channelMsg": data})
-
-        self.once(Constants.ResponseCodes.NoMoreMessages, on_no_more)
-        self.once(Constants.ResponseCodes.ContactMsgRecv, on_contact_msg)
-        self.once(Constants.ResponseCodes.ChannelMsgRecv, on_channel_msg)
-
-        await self.send_command_sync_next_message()
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def send_status_req(self, public_key, timeout=None):
-        """
-        Send a status request. Resolves when StatusResponse push is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_status(data):
-            self.off(Constants.PushCodes.StatusResponse, on_status)
-            fut.set_result(data)
-
-        self.once(Constants.PushCodes.StatusResponse, on_status)
-        await self.send_command_send_status_req(public_key)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def send_telemetry_req(self, public_key, timeout=None):
-        """
-        Send a telemetry request. Resolves when TelemetryResponse push is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_telemetry(data):
-            self.off(Constants.PushCodes.TelemetryResponse, on_telemetry)
-            fut.set_result(data)
-
-        self.once(Constants.PushCodes.TelemetryResponse, on_telemetry)
-        await self.send_command_send_telemetry_req(public_key)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def send_binary_req(self, public_key, request_code_and_params, timeout=None):
-        """
-        Send a binary request. Resolves when BinaryResponse push is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_binary(data):
-            self.off(Constants.PushCodes.BinaryResponse, on_binary)
-            fut.set_result(data)
-
-        self.once(Constants.PushCodes.BinaryResponse, on_binary)
-        await self.send_command_send_binary_req(public_key, request_code_and_params)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    async def set_other_params(self, manual_add_contacts, timeout=None):
-        """
-        Set other parameters (e.g. manualAddContacts flag).
-        Resolves when Ok or Err is received.
-        """
-        loop = asyncio.get_event_loop()
-        fut = loop.create_future()
-
-        def on_ok(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_result(True)
-
-        def on_err(_):
-            self.off(Constants.ResponseCodes.Ok, on_ok)
-            self.off(Constants.ResponseCodes.Err, on_err)
-            fut.set_exception(Exception("SetOtherParams failed"))
-
-        self.once(Constants.ResponseCodes.Ok, on_ok)
-        self.once(Constants.ResponseCodes.Err, on_err)
-        await self.send_command_set_other_params(manual_add_contacts)
-
-        return await asyncio.wait_for(fut, timeout) if timeout else await fut
-
-    def on_frame_received(self, frame_bytes: bytes):
-        reader = BufferReader(frame_bytes)
-        code = reader.read_uint8()
-
-        # Response dispatch table
-        response_handlers = {
-            Constants.ResponseCodes.Ok: self.on_ok_response,
-            Constants.ResponseCodes.Err: self.on_err_response,
-            Constants.ResponseCodes.ContactsStart: self.on_contacts_start_response,
-            Constants.ResponseCodes.Contact: self.on_contact_response,
-            Constants.ResponseCodes.EndOfContacts: self.on_end_of_contacts_response,
-            Constants.ResponseCodes.Sent: self.on_sent_response,
-            Constants.ResponseCodes.ExportContact: self.on_export_contact_response,
-            Constants.ResponseCodes.BatteryVoltage: self.on_battery_voltage_response,
-            Constants.ResponseCodes.DeviceInfo: self.on_device_info_response,
-            Constants.ResponseCodes.PrivateKey: self.on_private_key_response,
-            Constants.ResponseCodes.Disabled: self.on_disabled_response,
-            Constants.ResponseCodes.ChannelInfo: self.on_channel_info_response,
-            Constants.ResponseCodes.SignStart: self.on_sign_start_response,
-            Constants.ResponseCodes.Signature: self.on_signature_response,
-            Constants.ResponseCodes.SelfInfo: self.on_self_info_response,
-            Constants.ResponseCodes.CurrTime: self.on_curr_time_response,
-            Constants.ResponseCodes.NoMoreMessages: self.on_no_more_messages_response,
-            Constants.ResponseCodes.ContactMsgRecv: self.on_contact_msg_recv_response,
-            Constants.ResponseCodes.ChannelMsgRecv: self.on_channel_msg_recv_response,
-        }
-
-        # Push dispatch table
-        push_handlers = {
-            Constants.PushCodes.Advert: self.on_advert_push,
-            Constants.PushCodes.PathUpdated: self.on_path_updated_push,
-            Constants.PushCodes.SendConfirmed: self.on_send_confirmed_push,
-            Constants.PushCodes.MsgWaiting: self.on_msg_waiting_push,
-            Constants.PushCodes.RawData: self.on_raw_data_push,
-            Constants.PushCodes.LoginSuccess: self.on_login_success_push,
-            Constants.PushCodes.StatusResponse: self.on_status_response_push,
-            Constants.PushCodes.LogRxData: self.on_log_rx_data_push,
-            Constants.PushCodes.TelemetryResponse: self.on_telemetry_response_push,
-            Constants.PushCodes.BinaryResponse: self.on_binary_response_push,
-            Constants.PushCodes.TraceData: self.on_trace_data_push,
-            Constants.PushCodes.NewAdvert: self.on_new_advert_push,
-        }
-
-        # Dispatch
-        if code in response_handlers:
-            response_handlers[code](reader)
-        elif code in push_handlers:
-            push_handlers[code](reader)
-        else:
-            print(f"Unknown frame code: {code}")
+# meshcore/connection/base_connection.py
+
+import asyncio
+import functools
+from collections import defaultdict, deque
+
+from meshcore.buffer.buffer_writer import BufferWriter
+from meshcore.buffer.buffer_reader import BufferReader
+from meshcore.constants import Constants
+from meshcore.contact_store import ContactRecord, ContactStore
+from meshcore.events import EventEmitter
+from meshcore.frame_views import (
+    BinaryResponseFrame,
+    ChannelMsgRecvFrame,
+    ContactFrame,
+    ContactMsgRecvFrame,
+    DeviceInfoFrame,
+    LogRxDataFrame,
+    LoginSuccessFrame,
+    RawDataFrame,
+    SelfInfoFrame,
+    SendConfirmedFrame,
+    SentFrame,
+    StatusResponseFrame,
+    TelemetryResponseFrame,
+)
+from meshcore.connection.pending_requests import PendingRequests
+from meshcore.connection.delivery_tracker import DeliveryTracker
+from meshcore.connection.message_drain import MessageDrain
+from meshcore.connection.outbound_scheduler import OutboundScheduler
+
+
+_OK_OR_ERR_CODES = (Constants.ResponseCodes.Ok, Constants.ResponseCodes.Err)
+
+_NEXT_MESSAGE_CODES = (
+    Constants.ResponseCodes.NoMoreMessages,
+    Constants.ResponseCodes.ContactMsgRecv,
+    Constants.ResponseCodes.ChannelMsgRecv,
+    Constants.ResponseCodes.Err,
+)
+
+
+_SENT_CODES = (Constants.ResponseCodes.Sent, Constants.ResponseCodes.Err)
+
+# push code -> field correlating the push with the request that caused it
+_PUSH_CORRELATION_KEYS = {
+    Constants.PushCodes.StatusResponse: "pubKeyPrefix",
+    Constants.PushCodes.TelemetryResponse: "pubKeyPrefix",
+    Constants.PushCodes.BinaryResponse: "tag",
+}
+
+
+def _resolve_data(code, data, name):
+    if code == Constants.ResponseCodes.Err:
+        raise Exception(f"{name} failed")
+    return data
+
+
+def _resolve_ok(code, data, name):
+    if code == Constants.ResponseCodes.Err:
+        raise Exception(f"{name} failed")
+    return True
+
+
+def _resolve_next_message(code, data, name):
+    if code == Constants.ResponseCodes.Err:
+        raise Exception(f"{name} failed")
+    if code == Constants.ResponseCodes.ContactMsgRecv:
+        return {"contactMsg": data}
+    if code == Constants.ResponseCodes.ChannelMsgRecv:
+        return {"channelMsg": data}
+    return {"messages": []}
+
+
+def _track_delivery(delivery_tracker, code, data, name):
+    if code == Constants.ResponseCodes.Err:
+        raise Exception(f"{name} failed")
+    return PendingDelivery(data, delivery_tracker.track(data))
+
+
+def _expect_tagged_push(pending_requests, push_code, registered, code, data, name):
+    if code == Constants.ResponseCodes.Err:
+        raise Exception(f"{name} failed")
+    tag = data["expectedAckCrc"]
+    registered.append((tag, pending_requests.add_keyed(push_code, tag)))
+    return registered[-1]
+
+
+class _InFlightLimit:
+    """
+    Semaphore-like bound on concurrent requests whose limit can be changed while
+    permits are held: lowering it only lets new requests in once enough holders are done.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._waiters = deque()
+
+    def set_limit(self, limit: int):
+        self.limit = limit
+        self._wake()
+
+    async def __aenter__(self):
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # granted a permit but cancelled before running, pass it on
+                self._release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._release()
+
+    def _release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        waiters = self._waiters
+        while waiters and self.in_flight < self.limit:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class PendingDelivery(dict):
+    """
+    Sent response of a direct message, with delivered() to await its ACK.
+    """
+
+    def __init__(self, sent: dict, delivery: asyncio.Future):
+        super().__init__(sent)
+        self._delivery = delivery
+
+    def delivered(self) -> asyncio.Future:
+        """
+        Resolves with the SendConfirmed data (ackCode, roundTrip),
+        fails with TimeoutError if no ACK arrives within estTimeout.
+        """
+        return self._delivery
+
+
+class Connection(EventEmitter):
+    """
+    Base connection class for MeshCore.
+    Subclasses must implement transport-specific methods like close() and send_to_radio_frame().
+    """
+
+    # frame code -> name of the method decoding that frame
+    FRAME_DECODERS = {
+        Constants.ResponseCodes.Ok: "on_ok_response",
+        Constants.ResponseCodes.Err: "on_err_response",
+        Constants.ResponseCodes.ContactsStart: "on_contacts_start_response",
+        Constants.ResponseCodes.Contact: "on_contact_response",
+        Constants.ResponseCodes.EndOfContacts: "on_end_of_contacts_response",
+        Constants.ResponseCodes.Sent: "on_sent_response",
+        Constants.ResponseCodes.ExportContact: "on_export_contact_response",
+        Constants.ResponseCodes.BatteryVoltage: "on_battery_voltage_response",
+        Constants.ResponseCodes.DeviceInfo: "on_device_info_response",
+        Constants.ResponseCodes.PrivateKey: "on_private_key_response",
+        Constants.ResponseCodes.Disabled: "on_disabled_response",
+        Constants.ResponseCodes.ChannelInfo: "on_channel_info_response",
+        Constants.ResponseCodes.SignStart: "on_sign_start_response",
+        Constants.ResponseCodes.Signature: "on_signature_response",
+        Constants.ResponseCodes.SelfInfo: "on_self_info_response",
+        Constants.ResponseCodes.CurrTime: "on_curr_time_response",
+        Constants.ResponseCodes.NoMoreMessages: "on_no_more_messages_response",
+        Constants.ResponseCodes.ContactMsgRecv: "on_contact_msg_recv_response",
+        Constants.ResponseCodes.ChannelMsgRecv: "on_channel_msg_recv_response",
+        Constants.PushCodes.Advert: "on_advert_push",
+        Constants.PushCodes.PathUpdated: "on_path_updated_push",
+        Constants.PushCodes.SendConfirmed: "on_send_confirmed_push",
+        Constants.PushCodes.MsgWaiting: "on_msg_waiting_push",
+        Constants.PushCodes.RawData: "on_raw_data_push",
+        Constants.PushCodes.LoginSuccess: "on_login_success_push",
+        Constants.PushCodes.StatusResponse: "on_status_response_push",
+        Constants.PushCodes.LogRxData: "on_log_rx_data_push",
+        Constants.PushCodes.TelemetryResponse: "on_telemetry_response_push",
+        Constants.PushCodes.BinaryResponse: "on_binary_response_push",
+        Constants.PushCodes.TraceData: "on_trace_data_push",
+        Constants.PushCodes.NewAdvert: "on_new_advert_push",
+    }
+
+    # maximum number of commands awaiting their response at the same time
+    MAX_IN_FLIGHT = 16
+
+    # contacts iter_contacts buffers for a slow consumer before failing
+    CONTACTS_QUEUE_SIZE = 1024
+
+    # seconds a contacts listing may take when no timeout is given, it holds the contacts lock
+    CONTACTS_TIMEOUT = 60.0
+
+    def __init__(self):
+        super().__init__()
+        self._frame_dispatch = type(self)._get_frame_dispatch()
+        self._frame_skippable = type(self)._class_frame_skippable
+        self.unknown_frame_counts = defaultdict(int)
+        self.skipped_frame_count = 0
+        self._pending_requests = PendingRequests()
+        self.delivery_tracker = DeliveryTracker()
+        self._in_flight = _InFlightLimit(self.MAX_IN_FLIGHT)
+        self._send_lock = asyncio.Lock()
+        # Contact frames carry nothing tying them to a request, list one at a time
+        self._contacts_lock = asyncio.Lock()
+        # mostRecentLastmod of the last sync_contacts, None until the first sync
+        self.contacts_lastmod = None
+        # set by enable_message_drain() / enable_outbound_scheduler()
+        self.message_drain = None
+        self.outbound_scheduler = None
+
+    @classmethod
+    def _get_frame_dispatch(cls) -> list:
+        """
+        Return the 256-slot dispatch list for this class, building it on first use.
+        Slots hold plain functions called as fn(connection, reader).
+        """
+        dispatch = cls.__dict__.get("_class_frame_dispatch")
+        if dispatch is None:
+            dispatch = [cls.on_unknown_frame] * 256
+            skippable = [False] * 256
+            for code, name in cls.FRAME_DECODERS.items():
+                decoder = getattr(cls, name)
+                dispatch[code] = decoder
+                # built-in decoders only emit their own code, so they can be skipped unheard,
+                # an override in a subclass may do more
+                skippable[code] = decoder is getattr(Connection, name, None)
+            cls._class_frame_dispatch = dispatch
+            cls._class_frame_skippable = skippable
+        return dispatch
+
+    def register_frame_decoder(self, code: int, fn):
+        """
+        Add or override the decoder for a frame code on this connection.
+        fn is called as fn(connection, reader) with the reader positioned after the code byte.
+        Passing None restores the built-in decoder.
+        """
+        if not 0 <= code <= 0xFF:
+            raise ValueError(f"Frame code out of range: {code}")
+
+        class_dispatch = type(self)._get_frame_dispatch()
+        class_skippable = type(self)._class_frame_skippable
+        if self._frame_dispatch is class_dispatch:
+            # copy on first registration, the class tables are shared by all connections
+            self._frame_dispatch = list(class_dispatch)
+            self._frame_skippable = list(class_skippable)
+
+        self._frame_dispatch[code] = fn if fn is not None else class_dispatch[code]
+        # custom decoders may do more than emit, always run them
+        self._frame_skippable[code] = class_skippable[code] if fn is None else False
+
+    def on_unknown_frame(self, reader: BufferReader):
+        code = reader.buffer[0]
+        self.unknown_frame_counts[code] += 1
+        self.emit("unknown_frame", {
+            "code": code,
+            "data": reader.read_remaining_bytes(),
+        })
+
+    async def on_connected(self):
+        try:
+            await self.device_query(Constants.SupportedCompanionProtocolVersion)
+        except Exception:
+            pass
+        self.emit("connected")
+
+    def on_disconnected(self):
+        self._pending_requests.fail_all(ConnectionError("Disconnected"))
+        self.delivery_tracker.fail_all(ConnectionError("Disconnected"))
+        self.emit("disconnected")
+
+    def has_listeners(self, event) -> bool:
+        """True if a listener or a pending request is interested in event."""
+        return (
+            event in self._event_listeners
+            or self._pending_requests.is_waiting_for(event)
+            or self._pending_requests.is_waiting_for_keyed(event)
+            or (event == Constants.PushCodes.SendConfirmed and self.delivery_tracker.is_tracking())
+        )
+
+    def emit(self, event, *args, **kwargs):
+        """Resolve the request waiting for this response or push, then notify listeners."""
+        pending_requests = self._pending_requests
+        if pending_requests.is_waiting_for(event):
+            pending_requests.resolve(event, args[0] if args else None)
+        elif pending_requests.is_waiting_for_keyed(event):
+            data = args[0]
+            pending_requests.resolve_keyed(event, data[_PUSH_CORRELATION_KEYS[event]], data)
+        elif event == Constants.PushCodes.SendConfirmed and self.delivery_tracker.is_tracking():
+            self.delivery_tracker.confirm(args[0])
+        super().emit(event, *args, **kwargs)
+
+    async def close(self):
+        raise NotImplementedError("Subclass must implement close()")
+
+    async def send_to_radio_frame(self, data: bytes):
+        raise NotImplementedError("Subclass must implement send_to_radio_frame()")
+
+    # -------------------------
+    # Command senders
+    # -------------------------
+
+    async def send_command_app_start(self):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.AppStart)
+        data.write_uint8(1)  # appVer
+        data.write_bytes(b"\x00" * 6)  # reserved
+        data.write_string("test")
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_send_txt_msg(self, txt_type, attempt, sender_timestamp, pubkey_prefix, text):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SendTxtMsg)
+        data.write_uint8(txt_type)
+        data.write_uint8(attempt)
+        data.write_uint32_le(sender_timestamp)
+        data.write_bytes(pubkey_prefix[:6])  # only first 6 bytes
+        data.write_string(text)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_send_channel_txt_msg(self, txt_type, channel_idx, sender_timestamp, text):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SendChannelTxtMsg)
+        data.write_uint8(txt_type)
+        data.write_uint8(channel_idx)
+        data.write_uint32_le(sender_timestamp)
+        data.write_string(text)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_get_contacts(self, since=None):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.GetContacts)
+        if since is not None:
+            data.write_uint32_le(since)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_get_device_time(self):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.GetDeviceTime)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_set_device_time(self, epoch_secs):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SetDeviceTime)
+        data.write_uint32_le(epoch_secs)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_send_self_advert(self, advert_type):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SendSelfAdvert)
+        data.write_uint8(advert_type)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_set_advert_name(self, name):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SetAdvertName)
+        data.write_string(name)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_add_update_contact(self, public_key, type_, flags, out_path_len,
+                                              out_path, adv_name, last_advert, adv_lat, adv_lon):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.AddUpdateContact)
+        data.write_bytes(public_key)
+        data.write_uint8(type_)
+        data.write_uint8(flags)
+        data.write_uint8(out_path_len)
+        data.write_bytes(out_path)  # 64 bytes
+        data.write_cstring(adv_name, 32)  # fixed length
+        data.write_uint32_le(last_advert)
+        data.write_uint32_le(adv_lat)
+        data.write_uint32_le(adv_lon)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_sync_next_message(self):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SyncNextMessage)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_set_radio_params(self, freq, bw, sf, cr):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SetRadioParams)
+        data.write_uint32_le(freq)
+        data.write_uint32_le(bw)
+        data.write_uint8(sf)
+        data.write_uint8(cr)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_set_tx_power(self, tx_power):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SetTxPower)
+        data.write_uint8(tx_power)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_reset_path(self, pubkey):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.ResetPath)
+        data.write_bytes(pubkey)  # 32 bytes
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_set_advert_lat_lon(self, lat, lon):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SetAdvertLatLon)
+        data.write_int32_le(lat)
+        data.write_int32_le(lon)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_remove_contact(self, pubkey):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.RemoveContact)
+        data.write_bytes(pubkey)  # 32 bytes
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_share_contact(self, pubkey):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.ShareContact)
+        data.write_bytes(pubkey)  # 32 bytes
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_export_contact(self, pubkey=None):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.ExportContact)
+        if pubkey:
+            data.write_bytes(pubkey)  # 32 bytes
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_import_contact(self, advert_packet_bytes):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.ImportContact)
+        data.write_bytes(advert_packet_bytes)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_reboot(self):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.Reboot)
+        data.write_string("reboot")
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_get_battery_voltage(self):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.GetBatteryVoltage)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_device_query(self, app_target_ver):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.DeviceQuery)
+        data.write_uint8(app_target_ver)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_export_private_key(self):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.ExportPrivateKey)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_import_private_key(self, private_key):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.ImportPrivateKey)
+        data.write_bytes(private_key)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_send_raw_data(self, path, raw_data):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SendRawData)
+        data.write_uint8(len(path))
+        data.write_bytes(path)
+        data.write_bytes(raw_data)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_send_login(self, public_key, password):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SendLogin)
+        data.write_bytes(public_key)  # 32 bytes
+        data.write_string(password)   # max 15 chars
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_send_status_req(self, public_key):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SendStatusReq)
+        data.write_bytes(public_key)  # 32 bytes
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_send_telemetry_req(self, public_key):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SendTelemetryReq)
+        data.write_uint8(0)  # reserved
+        data.write_uint8(0)  # reserved
+        data.write_uint8(0)  # reserved
+        data.write_bytes(public_key)  # 32 bytes
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_send_binary_req(self, public_key, request_code_and_params):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SendBinaryReq)
+        data.write_bytes(public_key)  # 32 bytes
+        data.write_bytes(request_code_and_params)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_get_channel(self, channel_idx):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.GetChannel)
+        data.write_uint8(channel_idx)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_set_channel(self, channel_idx, name, secret):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SetChannel)
+        data.write_uint8(channel_idx)
+        data.write_cstring(name, 32)
+        data.write_bytes(secret)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_sign_start(self):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SignStart)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_sign_data(self, data_to_sign):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SignData)
+        data.write_bytes(data_to_sign)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_sign_finish(self):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SignFinish)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_send_trace_path(self, tag, auth, path):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SendTracePath)
+        data.write_uint32_le(tag)
+        data.write_uint32_le(auth)
+        data.write_uint8(0)  # flags
+        data.write_bytes(path)
+        await self.send_to_radio_frame(data.to_bytes())
+
+    async def send_command_set_other_params(self, manual_add_contacts):
+        data = BufferWriter()
+        data.write_uint8(Constants.CommandCodes.SetOtherParams)
+        data.write_uint8(manual_add_contacts)  # 0 or 1
+        await self.send_to_radio_frame(data.to_bytes())
+
+    def on_ok_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.Ok, {})
+
+    def on_err_response(self, reader: BufferReader):
+        err_code = reader.read_uint8() if reader.remaining() > 0 else None
+        self.emit(Constants.ResponseCodes.Err, {"errCode": err_code})
+
+    def on_contacts_start_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.ContactsStart, {
+            "count": reader.read_uint32_le(),
+        })
+
+    def on_contact_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.Contact, ContactFrame(reader.buffer, reader.pointer))
+
+    def on_end_of_contacts_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.EndOfContacts, {
+            "mostRecentLastmod": reader.read_uint32_le(),
+        })
+
+    def on_sent_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.Sent, SentFrame(reader.buffer, reader.pointer))
+
+    def on_export_contact_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.ExportContact, {
+            "advertPacketBytes": reader.read_remaining_bytes(),
+        })
+
+    def on_battery_voltage_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.BatteryVoltage, {
+            "batteryMilliVolts": reader.read_uint16_le(),
+        })
+
+    def on_device_info_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.DeviceInfo, DeviceInfoFrame(reader.buffer, reader.pointer))
+
+    def on_private_key_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.PrivateKey, {
+            "privateKey": reader.read_bytes(64),
+        })
+
+    def on_disabled_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.Disabled, {})
+
+    def on_channel_info_response(self, reader: BufferReader):
+        idx = reader.read_uint8()
+        name = reader.read_cstring(32)
+        remaining = reader.remaining()
+        if remaining == 16:
+            self.emit(Constants.ResponseCodes.ChannelInfo, {
+                "channelIdx": idx,
+                "name": name,
+                "secret": reader.read_bytes(remaining),
+            })
+        else:
+            print(f"ChannelInfo unexpected key length: {remaining}")
+
+    def on_sign_start_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.SignStart, {
+            "reserved": reader.read_uint8(),
+            "maxSignDataLen": reader.read_uint32_le(),
+        })
+
+    def on_signature_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.Signature, {
+            "signature": reader.read_bytes(64),
+        })
+
+    def on_self_info_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.SelfInfo, SelfInfoFrame(reader.buffer, reader.pointer))
+
+    def on_curr_time_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.CurrTime, {
+            "epochSecs": reader.read_uint32_le(),
+        })
+
+    def on_no_more_messages_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.NoMoreMessages, {})
+
+    def on_contact_msg_recv_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.ContactMsgRecv, ContactMsgRecvFrame(reader.buffer, reader.pointer))
+
+    def on_channel_msg_recv_response(self, reader: BufferReader):
+        self.emit(Constants.ResponseCodes.ChannelMsgRecv, ChannelMsgRecvFrame(reader.buffer, reader.pointer))
+
+    def on_advert_push(self, reader: BufferReader):
+        self.emit(Constants.PushCodes.Advert, {
+            "publicKey": reader.read_bytes(32),
+        })
+
+    def on_path_updated_push(self, reader: BufferReader):
+        self.emit(Constants.PushCodes.PathUpdated, {
+            "publicKey": reader.read_bytes(32),
+        })
+
+    def on_send_confirmed_push(self, reader: BufferReader):
+        self.emit(Constants.PushCodes.SendConfirmed, SendConfirmedFrame(reader.buffer, reader.pointer))
+
+    def on_msg_waiting_push(self, reader: BufferReader):
+        self.emit(Constants.PushCodes.MsgWaiting, {})
+
+    def on_raw_data_push(self, reader: BufferReader):
+        self.emit(Constants.PushCodes.RawData, RawDataFrame(reader.buffer, reader.pointer))
+
+    def on_login_success_push(self, reader: BufferReader):
+        self.emit(Constants.PushCodes.LoginSuccess, LoginSuccessFrame(reader.buffer, reader.pointer))
+
+    def on_status_response_push(self, reader: BufferReader):
+        self.emit(Constants.PushCodes.StatusResponse, StatusResponseFrame(reader.buffer, reader.pointer))
+
+    def on_log_rx_data_push(self, reader: BufferReader):
+        self.emit(Constants.PushCodes.LogRxData, LogRxDataFrame(reader.buffer, reader.pointer))
+
+    def on_telemetry_response_push(self, reader: BufferReader):
+        self.emit(Constants.PushCodes.TelemetryResponse, TelemetryResponseFrame(reader.buffer, reader.pointer))
+
+    def on_binary_response_push(self, reader: BufferReader):
+        self.emit(Constants.PushCodes.BinaryResponse, BinaryResponseFrame(reader.buffer, reader.pointer))
+
+    def on_trace_data_push(self, reader: BufferReader):
+        reserved = reader.read_uint8()
+        path_len = reader.read_uint8()
+        self.emit(Constants.PushCodes.TraceData, {
+            "reserved": reserved,
+            "pathLen": path_len,
+            "flags": reader.read_uint8(),
+            "tag": reader.read_uint32_le(),
+            "authCode": reader.read_uint32_le(),
+            "pathHashes": reader.read_bytes(path_len),
+            "pathSnrs": reader.read_bytes(path_len),
+            "lastSnr": reader.read_int8() / 4,
+        })
+
+    def on_new_advert_push(self, reader: BufferReader):
+        self.emit(Constants.PushCodes.NewAdvert, ContactFrame(reader.buffer, reader.pointer))
+
+    # -------------------------
+    # High-level convenience APIs
+    # -------------------------
+
+    def set_max_in_flight(self, max_in_flight: int):
+        """
+        Set how many commands may await their response at once. Requests already
+        in flight keep their slot, new ones wait until fewer than max_in_flight remain.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self._in_flight.set_limit(max_in_flight)
+
+    async def _request(self, send, codes, resolver=None, name=None, timeout=None):
+        """
+        Register a pending request for codes, send the command and wait for the response.
+
+        Registration and write happen under one lock, so commands reach the radio in the
+        order their requests were registered. The radio answers commands in order, which
+        makes the oldest request waiting for a code the owner of each response. A request
+        that times out or is cancelled after its command was written therefore stays in
+        the pending table, cancelled, to swallow the reply the radio still sends, which
+        would otherwise resolve the next request waiting for that code, until a later
+        request is answered or the placeholder expires.
+        """
+        try:
+            async with self._in_flight:
+                async with self._send_lock:
+                    fut = self._pending_requests.add(codes, resolver or _resolve_data, name)
+                    try:
+                        await send
+                    except BaseException:
+                        self._pending_requests.remove(fut)
+                        raise
+                if timeout:
+                    return await asyncio.wait_for(fut, timeout)
+                return await fut
+        finally:
+            # no-op once sent, avoids a never-awaited warning if cancelled while queued
+            send.close()
+
+    async def pipeline(self, *requests, return_exceptions=False):
+        """
+        Run several high-level requests at once, e.g.
+        await connection.pipeline(connection.get_battery_voltage(), connection.get_channel(0)).
+        Commands are written back-to-back in argument order, without waiting for each
+        response, and results are returned in the same order.
+        """
+        return await asyncio.gather(*requests, return_exceptions=return_exceptions)
+
+    async def get_contacts(self, since=None, timeout=None):
+        """
+        Request contacts list from the device.
+        Resolves when EndOfContacts is received, fails after timeout seconds
+        (CONTACTS_TIMEOUT if None).
+        """
+        async with self._contacts_lock:
+            return await self._request_contacts(since, timeout)
+
+    async def _request_contacts(self, since, timeout):
+        return await self._request(
+            self.send_command_get_contacts(since),
+            (Constants.ResponseCodes.EndOfContacts, Constants.ResponseCodes.Err),
+            _resolve_data,
+            "GetContacts",
+            timeout if timeout is not None else self.CONTACTS_TIMEOUT,
+        )
+
+    async def iter_contacts(self, since=None, timeout=None, max_queued=CONTACTS_QUEUE_SIZE, on_end=None):
+        """
+        Request contacts list from the device and yield each Contact as it arrives, e.g.
+        async for contact in connection.iter_contacts(): ...
+        When since is given only contacts with a lastMod after it are sent.
+
+        Up to max_queued contacts are buffered while the consumer is busy, beyond that
+        the iterator fails with OverflowError. on_end is called with the EndOfContacts
+        data once all contacts have been yielded. The listing fails with TimeoutError
+        after timeout seconds (CONTACTS_TIMEOUT if None).
+
+        Stopping early, e.g. with break, is fine: the Contact listener and the contacts
+        lock are released when the radio finishes listing, without waiting for the
+        generator to be closed.
+        """
+        await self._contacts_lock.acquire()
+        contacts = deque()
+        overflowed = False
+        waiter = None
+
+        def wake(_=None):
+            if waiter is not None and not waiter.done():
+                waiter.set_result(None)
+
+        def on_contact(contact):
+            nonlocal overflowed
+            if len(contacts) < max_queued:
+                contacts.append(contact)
+            else:
+                overflowed = True
+            wake()
+
+        def on_listed(request):
+            # keep the lock until the radio is done listing, even if the consumer stopped early
+            subscription.unsubscribe()
+            self._contacts_lock.release()
+            if not request.cancelled():
+                request.exception()
+
+        subscription = self.on(Constants.ResponseCodes.Contact, on_contact, inline=True)
+        request = asyncio.ensure_future(self._request_contacts(since, timeout))
+        request.add_done_callback(on_listed)
+        request.add_done_callback(wake)
+        try:
+            while True:
+                if overflowed:
+                    raise OverflowError(f"More than {max_queued} contacts queued, consumer too slow")
+                if contacts:
+                    yield contacts.popleft()
+                elif request.done():
+                    break
+                else:
+                    waiter = asyncio.get_running_loop().create_future()
+                    await waiter
+            end_of_contacts = request.result()
+        finally:
+            subscription.unsubscribe()
+
+        if on_end is not None:
+            on_end(end_of_contacts)
+
+    async def sync_contacts(self, timeout=None):
+        """
+        Fetch the contacts added or changed since the previous sync_contacts call,
+        all contacts on the first call. Returns the list of received contacts.
+        Set contacts_lastmod to None to force a full listing, e.g. for another device.
+        """
+        def on_end(end_of_contacts):
+            # mostRecentLastmod is 0 when nothing changed, keep the previous mark then
+            most_recent_lastmod = end_of_contacts["mostRecentLastmod"]
+            if self.contacts_lastmod is None or most_recent_lastmod > self.contacts_lastmod:
+                self.contacts_lastmod = most_recent_lastmod
+
+        return [
+            contact async for contact in self.iter_contacts(self.contacts_lastmod, timeout, on_end=on_end)
+        ]
+
+    async def warm_start_contacts(self, cache, store=None, device_public_key=None, timeout=None):
+        """
+        Fill a ContactStore from this device's ContactCache file, fetch only the contacts
+        changed since the cached mostRecentLastmod and save the updated cache.
+        The device public key is taken from SelfInfo unless given.
+        Contacts removed on the radio are only noticed on a full listing: delete the
+        cache file or set contacts_lastmod to None and call sync_contacts().
+        """
+        if store is None:
+            store = ContactStore()
+        if device_public_key is None:
+            device_public_key = (await self.get_self_info(timeout))["publicKey"]
+
+        cached = cache.load(device_public_key)
+        if cached is not None:
+            lastmod, records = cached
+            for record in records:
+                store.add(record)
+            self.contacts_lastmod = lastmod
+        else:
+            self.contacts_lastmod = None
+
+        for contact in await self.sync_contacts(timeout):
+            store.add_frame(contact)
+
+        cache.save(device_public_key, self.contacts_lastmod, store)
+        return store
+
+    async def get_self_info(self, timeout=None):
+        """
+        Request self info from the device.
+        Resolves when SelfInfo response is received.
+        """
+        return await self._request(
+            self.send_command_app_start(),
+            (Constants.ResponseCodes.SelfInfo, Constants.ResponseCodes.Err),
+            _resolve_data,
+            "AppStart",
+            timeout,
+        )
+
+    async def get_waiting_messages(self, timeout=None):
+        """
+        Request next waiting message.
+        Resolves when NoMoreMessages or a message response is received.
+        """
+        return await self._request(
+            self.send_command_sync_next_message(),
+            _NEXT_MESSAGE_CODES,
+            _resolve_next_message,
+            "SyncNextMessage",
+            timeout,
+        )
+
+    async def get_channel(self, channel_idx, timeout=None):
+        """
+        Request channel info by index.
+        Resolves when ChannelInfo response is received.
+        """
+        return await self._request(
+            self.send_command_get_channel(channel_idx),
+            (Constants.ResponseCodes.ChannelInfo, Constants.ResponseCodes.Err),
+            _resolve_data,
+            "GetChannel",
+            timeout,
+        )
+
+    async def send_advert(self, advert_type, timeout=None):
+        """
+        Send an advert and resolve when Ok or Err is received.
+        """
+        return await self._request(
+            self.send_command_send_self_advert(advert_type),
+            _OK_OR_ERR_CODES,
+            _resolve_ok,
+            "Advert",
+            timeout,
+        )
+
+    async def set_advert_name(self, name, timeout=None):
+        """
+        Set advert name and resolve when Ok or Err is received.
+        """
+        return await self._request(
+            self.send_command_set_advert_name(name),
+            _OK_OR_ERR_CODES,
+            _resolve_ok,
+            "SetAdvertName",
+            timeout,
+        )
+
+    async def set_advert_lat_lon(self, lat, lon, timeout=None):
+        """
+        Set advert latitude/longitude and resolve when Ok or Err is received.
+        """
+        return await self._request(
+            self.send_command_set_advert_lat_lon(lat, lon),
+            _OK_OR_ERR_CODES,
+            _resolve_ok,
+            "SetAdvertLatLon",
+            timeout,
+        )
+
+    async def set_tx_power(self, tx_power, timeout=None):
+        """
+        Set transmit power and resolve when Ok or Err is received.
+        """
+        return await self._request(
+            self.send_command_set_tx_power(tx_power),
+            _OK_OR_ERR_CODES,
+            _resolve_ok,
+            "SetTxPower",
+            timeout,
+        )
+
+    async def reboot(self, timeout=None):
+        """
+        Reboot the device. The firmware restarts without answering, so this resolves
+        once the command is written rather than waiting for a response that never comes.
+        """
+        async with self._send_lock:
+            await self.send_command_reboot()
+
+    async def get_battery_voltage(self, timeout=None):
+        """
+        Request battery voltage and resolve when BatteryVoltage response is received.
+        """
+        return await self._request(
+            self.send_command_get_battery_voltage(),
+            (Constants.ResponseCodes.BatteryVoltage, Constants.ResponseCodes.Err),
+            _resolve_data,
+            "GetBatteryVoltage",
+            timeout,
+        )
+
+    async def device_query(self, app_target_ver, timeout=None):
+        """
+        Query device for supported protocol version.
+        Resolves when DeviceInfo response is received.
+        """
+        return await self._request(
+            self.send_command_device_query(app_target_ver),
+            (Constants.ResponseCodes.DeviceInfo, Constants.ResponseCodes.Err),
+            _resolve_data,
+            "DeviceQuery",
+            timeout,
+        )
+
+    async def export_private_key(self, timeout=None):
+        """
+        Request private key export.
+        Resolves when PrivateKey response is received.
+        """
+        return await self._request(
+            self.send_command_export_private_key(),
+            (Constants.ResponseCodes.PrivateKey, Constants.ResponseCodes.Err),
+            _resolve_data,
+            "ExportPrivateKey",
+            timeout,
+        )
+
+    async def import_private_key(self, private_key, timeout=None):
+        """
+        Import a private key and resolve when Ok or Err is received.
+        """
+        return await self._request(
+            self.send_command_import_private_key(private_key),
+            _OK_OR_ERR_CODES,
+            _resolve_ok,
+            "ImportPrivateKey",
+            timeout,
+        )
+
+    async def set_channel(self, channel_idx, name, secret, timeout=None):
+        """
+        Set channel info and resolve when Ok or Err is received.
+        """
+        return await self._request(
+            self.send_command_set_channel(channel_idx, name, secret),
+            _OK_OR_ERR_CODES,
+            _resolve_ok,
+            "SetChannel",
+            timeout,
+        )
+
+    async def sign_start(self, timeout=None):
+        """
+        Begin signing session. Resolves when SignStart response is received.
+        """
+        return await self._request(
+            self.send_command_sign_start(),
+            (Constants.ResponseCodes.SignStart, Constants.ResponseCodes.Err),
+            _resolve_data,
+            "SignStart",
+            timeout,
+        )
+
+    async def sign_data(self, data_to_sign, timeout=None):
+        """
+        Send data to be signed. Resolves when Signature response is received.
+        """
+        return await self._request(
+            self.send_command_sign_data(data_to_sign),
+            (Constants.ResponseCodes.Signature, Constants.ResponseCodes.Err),
+            _resolve_data,
+            "SignData",
+            timeout,
+        )
+
+    async def sign_finish(self, timeout=None):
+        """
+        Finish signing session. Resolves when Ok or Err is received.
+        """
+        return await self._request(
+            self.send_command_sign_finish(),
+            _OK_OR_ERR_CODES,
+            _resolve_ok,
+            "SignFinish",
+            timeout,
+        )
+
+    async def send_trace_path(self, tag, auth, path, timeout=None):
+        """
+        Send a trace path. Resolves when Ok or Err is received.
+        """
+        return await self._request(
+            self.send_command_send_trace_path(tag, auth, path),
+            _OK_OR_ERR_CODES,
+            _resolve_ok,
+            "SendTracePath",
+            timeout,
+        )
+
+    async def add_update_contact(self, public_key, type_, flags, out_path_len,
+                                 out_path, adv_name, last_advert, adv_lat, adv_lon, timeout=None):
+        """
+        Add or update a contact. Resolves when Ok or Err is received.
+        """
+        return await self._request(
+            self.send_command_add_update_contact(public_key, type_, flags, out_path_len,
+                                                 out_path, adv_name, last_advert, adv_lat, adv_lon),
+            _OK_OR_ERR_CODES,
+            _resolve_ok,
+            "AddUpdateContact",
+            timeout,
+        )
+
+    async def remove_contact(self, pubkey, timeout=None):
+        """
+        Remove a contact. Resolves when Ok or Err is received.
+        """
+        return await self._request(
+            self.send_command_remove_contact(pubkey),
+            _OK_OR_ERR_CODES,
+            _resolve_ok,
+            "RemoveContact",
+            timeout,
+        )
+
+    async def share_contact(self, pubkey, timeout=None):
+        """
+        Share a contact. Resolves when Ok or Err is received.
+        """
+        return await self._request(
+            self.send_command_share_contact(pubkey),
+            _OK_OR_ERR_CODES,
+            _resolve_ok,
+            "ShareContact",
+            timeout,
+        )
+
+    async def export_contact(self, pubkey=None, timeout=None):
+        """
+        Export a contact. Resolves when ExportContact response is received.
+        """
+        return await self._request(
+            self.send_command_export_contact(pubkey),
+            (Constants.ResponseCodes.ExportContact, Constants.ResponseCodes.Err),
+            _resolve_data,
+            "ExportContact",
+            timeout,
+        )
+
+    async def import_contact(self, advert_packet_bytes, timeout=None):
+        """
+        Import a contact. Resolves when Ok or Err is received.
+        """
+        return await self._request(
+            self.send_command_import_contact(advert_packet_bytes),
+            _OK_OR_ERR_CODES,
+            _resolve_ok,
+            "ImportContact",
+            timeout,
+        )
+
+    async def bulk_upsert_contacts(self, contacts, remove_missing=False, timeout=None):
+        """
+        Make the radio's contacts match contacts (ContactRecords or Contact data).
+        The current table is listed first and only contacts that differ are sent, with
+        all AddUpdateContact (and RemoveContact if remove_missing) commands pipelined.
+
+        Returns one result per contact, in order, followed by one per removed contact:
+        {"publicKey", "action": "added" | "updated" | "unchanged" | "removed", "error"}
+        where error is None or the exception that command failed with.
+        """
+        current = {}
+        async for contact in self.iter_contacts(timeout=timeout):
+            record = ContactRecord.from_frame(contact)
+            current[record.public_key] = record
+
+        results = []
+        requests = []
+        wanted_keys = set()
+        for contact in contacts:
+            record = ContactRecord.from_any(contact)
+            wanted_keys.add(record.public_key)
+            existing = current.get(record.public_key)
+            if existing is not None and existing.same_contact_as(record):
+                results.append({"publicKey": record.public_key, "action": "unchanged", "error": None})
+                continue
+            results.append({
+                "publicKey": record.public_key,
+                "action": "added" if existing is None else "updated",
+                "error": None,
+            })
+            requests.append(self.add_update_contact(
+                record.public_key, record.type, record.flags, record.out_path_len,
+                bytes(record.out_path).ljust(64, b"\x00")[:64], record.adv_name,
+                record.last_advert, record.adv_lat, record.adv_lon, timeout,
+            ))
+
+        changed = [result for result in results if result["action"] != "unchanged"]
+        if remove_missing:
+            for public_key in current.keys() - wanted_keys:
+                result = {"publicKey": public_key, "action": "removed", "error": None}
+                results.append(result)
+                changed.append(result)
+                requests.append(self.remove_contact(public_key, timeout))
+
+        outcomes = await self.pipeline(*requests, return_exceptions=True)
+        for result, outcome in zip(changed, outcomes):
+            if isinstance(outcome, BaseException):
+                result["error"] = outcome
+        return results
+
+    async def bulk_export(self, path, pubkeys=None, timeout=None):
+        """
+        Export contacts (all of them unless pubkeys is given) to a file, with the
+        ExportContact requests pipelined and each blob written as soon as it is in turn.
+        Each blob is stored as uint16 LE length + advert packet bytes, see bulk_import().
+        Returns {"exported": count, "errors": {public key: exception}}.
+        """
+        if pubkeys is None:
+            pubkeys = [bytes(contact["publicKey"]) async for contact in self.iter_contacts(timeout=timeout)]
+
+        exports = [asyncio.ensure_future(self.export_contact(pubkey, timeout)) for pubkey in pubkeys]
+        exported = 0
+        errors = {}
+        try:
+            with open(path, "wb") as f:
+                for pubkey, export in zip(pubkeys, exports):
+                    try:
+                        advert_packet_bytes = (await export)["advertPacketBytes"]
+                    except Exception as e:
+                        errors[bytes(pubkey)] = e
+                        continue
+                    f.write(len(advert_packet_bytes).to_bytes(2, "little"))
+                    f.write(advert_packet_bytes)
+                    exported += 1
+        finally:
+            for export in exports:
+                export.cancel()
+        return {"exported": exported, "errors": errors}
+
+    async def bulk_import(self, path, timeout=None):
+        """
+        Import every contact from a bulk_export() file, with the ImportContact requests
+        pipelined. Returns one result per blob, True or the exception it failed with.
+        Raises ValueError without importing anything if the file is truncated.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+
+        blobs = []
+        offset = 0
+        while offset < len(data):
+            if offset + 2 > len(data):
+                raise ValueError(f"Truncated bulk export file {path}: incomplete length at offset {offset}")
+            length = int.from_bytes(data[offset:offset + 2], "little")
+            end = offset + 2 + length
+            if end > len(data):
+                raise ValueError(
+                    f"Truncated bulk export file {path}: blob at offset {offset} declares {length} bytes, "
+                    f"{len(data) - offset - 2} left"
+                )
+            blobs.append(data[offset + 2:end])
+            offset = end
+
+        return await self.pipeline(
+            *(self.import_contact(blob, timeout) for blob in blobs),
+            return_exceptions=True,
+        )
+
+    async def send_txt_msg(self, txt_type, attempt, sender_timestamp, pubkey_prefix, text, timeout=None):
+        """
+        Send a text message to a contact. Resolves when Sent response is received,
+        with a PendingDelivery whose delivered() resolves on the matching SendConfirmed.
+        """
+        return await self._request(
+            self.send_command_send_txt_msg(txt_type, attempt, sender_timestamp, pubkey_prefix, text),
+            _SENT_CODES,
+            functools.partial(_track_delivery, self.delivery_tracker),
+            "SendTxtMsg",
+            timeout,
+        )
+
+    async def send_channel_txt_msg(self, txt_type, channel_idx, sender_timestamp, text, timeout=None):
+        """
+        Send a text message to a channel. Resolves when Sent response is received.
+        """
+        return await self._request(
+            self.send_command_send_channel_txt_msg(txt_type, channel_idx, sender_timestamp, text),
+            (Constants.ResponseCodes.Sent, Constants.ResponseCodes.Err),
+            _resolve_data,
+            "SendChannelTxtMsg",
+            timeout,
+        )
+
+    async def send_raw_data(self, path, raw_data, timeout=None):
+        """
+        Send raw data along a path. Resolves when Sent response is received.
+        """
+        return await self._request(
+            self.send_command_send_raw_data(path, raw_data),
+            (Constants.ResponseCodes.Sent, Constants.ResponseCodes.Err),
+            _resolve_data,
+            "SendRawData",
+            timeout,
+        )
+
+    async def sync_next_message(self, timeout=None):
+        """
+        Request next waiting message. Resolves when NoMoreMessages or a message response is received.
+        """
+        return await self._request(
+            self.send_command_sync_next_message(),
+            _NEXT_MESSAGE_CODES,
+            _resolve_next_message,
+            "SyncNextMessage",
+            timeout,
+        )
+
+    def enable_message_drain(self, window=4, max_queued=256) -> MessageDrain:
+        """
+        Fetch waiting messages automatically whenever the radio pushes MsgWaiting,
+        with up to window SyncNextMessage requests pipelined. Returns the MessageDrain,
+        iterate it to receive the messages: async for message in connection.enable_message_drain()
+        """
+        if self.message_drain is None:
+            self.message_drain = MessageDrain(self, window, max_queued)
+        self.message_drain.start()
+        return self.message_drain
+
+    def disable_message_drain(self):
+        if self.message_drain is not None:
+            self.message_drain.stop()
+            self.message_drain = None
+
+    def enable_outbound_scheduler(self, **kwargs) -> OutboundScheduler:
+        """
+        Start an OutboundScheduler for prioritised, airtime-paced text messages with
+        automatic resends, kwargs are passed to OutboundScheduler, e.g.
+        await connection.enable_outbound_scheduler().send_text(pubkey_prefix, "hi")
+        """
+        if self.outbound_scheduler is None:
+            self.outbound_scheduler = OutboundScheduler(self, **kwargs)
+        self.outbound_scheduler.start()
+        return self.outbound_scheduler
+
+    def disable_outbound_scheduler(self):
+        if self.outbound_scheduler is not None:
+            self.outbound_scheduler.stop()
+            self.outbound_scheduler = None
+
+    async def send_status_req(self, public_key, timeout=None):
+        """
+        Send a status request.
+        Resolves when the StatusResponse push from this contact's public key prefix is received.
+        """
+        return await self._with_timeout(self._keyed_push_request(
+            self.send_command_send_status_req(public_key),
+            "SendStatusReq",
+            Constants.PushCodes.StatusResponse,
+            bytes(public_key[:6]),
+        ), timeout)
+
+    async def send_telemetry_req(self, public_key, timeout=None):
+        """
+        Send a telemetry request.
+        Resolves when the TelemetryResponse push from this contact's public key prefix is received.
+        """
+        return await self._with_timeout(self._keyed_push_request(
+            self.send_command_send_telemetry_req(public_key),
+            "SendTelemetryReq",
+            Constants.PushCodes.TelemetryResponse,
+            bytes(public_key[:6]),
+        ), timeout)
+
+    async def send_binary_req(self, public_key, request_code_and_params, timeout=None):
+        """
+        Send a binary request.
+        Resolves when the BinaryResponse push carrying this request's tag is received,
+        the tag being the expectedAckCrc of the Sent response.
+        """
+        return await self._with_timeout(self._tagged_push_request(
+            self.send_command_send_binary_req(public_key, request_code_and_params),
+            "SendBinaryReq",
+            Constants.PushCodes.BinaryResponse,
+        ), timeout)
+
+    @staticmethod
+    async def _with_timeout(coro, timeout):
+        return await asyncio.wait_for(coro, timeout) if timeout else await coro
+
+    async def _keyed_push_request(self, send, name, push_code, key):
+        """
+        Send a command answered by Sent, then wait for the push_code push carrying key.
+        Only the Sent round trip counts against the in-flight limit, so any number of
+        these can be waiting on the mesh at once.
+        """
+        fut = self._pending_requests.add_keyed(push_code, key)
+        try:
+            await self._request(send, _SENT_CODES, _resolve_data, name)
+            return await fut
+        finally:
+            if not fut.done() or fut.cancelled():
+                self._pending_requests.remove_keyed(push_code, key, fut)
+
+    async def _tagged_push_request(self, send, name, push_code):
+        """
+        Like _keyed_push_request, keyed on the tag returned in the Sent response.
+        The push waiter is registered while the Sent frame is being dispatched, so a
+        response processed right after it cannot be missed. It is recorded in registered
+        at the same time, so it is dropped even if the caller is cancelled before
+        _request returns it.
+        """
+        registered = []
+        resolver = functools.partial(_expect_tagged_push, self._pending_requests, push_code, registered)
+        try:
+            _, fut = await self._request(send, _SENT_CODES, resolver, name)
+            return await fut
+        finally:
+            for tag, fut in registered:
+                if not fut.done() or fut.cancelled():
+                    self._pending_requests.remove_keyed(push_code, tag, fut)
+
+    async def set_other_params(self, manual_add_contacts, timeout=None):
+        """
+        Set other parameters (e.g. manualAddContacts flag).
+        Resolves when Ok or Err is received.
+        """
+        return await self._request(
+            self.send_command_set_other_params(manual_add_contacts),
+            _OK_OR_ERR_CODES,
+            _resolve_ok,
+            "SetOtherParams",
+            timeout,
+        )
+
+    def on_frame_received(self, frame_bytes: bytes):
+        code = frame_bytes[0]
+        if self._frame_skippable[code] and not self.has_listeners(code):
+            # nobody would see the decoded event, don't decode it
+            self.skipped_frame_count += 1
+            return
+
+        reader = BufferReader(frame_bytes)
+        reader.read_uint8()
+        self._frame_dispatch[code](self, reader)
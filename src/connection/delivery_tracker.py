@@ -0,0 +1,126 @@
+import asyncio
+from collections import deque
+
+from ..timer_wheel import TimerWheel
+
+
+class _Delivery:
+    __slots__ = ("ack_crc", "future")
+
+    def __init__(self, ack_crc: int, future: asyncio.Future):
+        self.ack_crc = ack_crc
+        self.future = future
+
+
+def _retrieve_exception(fut: asyncio.Future):
+    # expiry is an expected outcome, don't log it when nobody awaits delivered()
+    if not fut.cancelled():
+        fut.exception()
+
+
+class DeliveryTracker:
+    """
+    Tracks sent messages until the radio reports their ACK.
+    Sent.expectedAckCrc is indexed so a SendConfirmed.ackCode resolves its message
+    in O(1), and estTimeout expiries are handled by a TimerWheel.
+    """
+
+    # extra time allowed on top of the radio's estTimeout
+    TIMEOUT_GRACE = 1.0
+
+    def __init__(self, timeout_grace: float = TIMEOUT_GRACE):
+        self.timeout_grace = timeout_grace
+        # ack crc -> deque of _Delivery, oldest first
+        self._by_ack_crc = {}
+        self._timer_wheel = TimerWheel(self._on_expired)
+        self.confirmed_count = 0
+        self.expired_count = 0
+        self.round_trip_total = 0
+        self.round_trip_min = None
+        self.round_trip_max = None
+
+    def __len__(self) -> int:
+        return len(self._timer_wheel)
+
+    def is_tracking(self) -> bool:
+        return bool(self._by_ack_crc)
+
+    def track(self, sent: dict) -> asyncio.Future:
+        """
+        Start tracking a Sent response, returns a future resolved with the
+        SendConfirmed data or failed with TimeoutError after estTimeout.
+        """
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        fut.add_done_callback(_retrieve_exception)
+
+        ack_crc = sent["expectedAckCrc"]
+        delivery = _Delivery(ack_crc, fut)
+        queue = self._by_ack_crc.get(ack_crc)
+        if queue is None:
+            queue = self._by_ack_crc[ack_crc] = deque()
+        queue.append(delivery)
+
+        self._timer_wheel.schedule(delivery, sent["estTimeout"] / 1000 + self.timeout_grace)
+        return fut
+
+    def confirm(self, confirmed: dict) -> bool:
+        """
+        Resolve the message matching a SendConfirmed push. Returns False if none matched.
+        """
+        ack_crc = confirmed["ackCode"]
+        delivery = self._pop(ack_crc)
+        if delivery is None:
+            return False
+
+        self._timer_wheel.cancel(delivery)
+
+        round_trip = confirmed["roundTrip"]
+        self.confirmed_count += 1
+        self.round_trip_total += round_trip
+        if self.round_trip_min is None or round_trip < self.round_trip_min:
+            self.round_trip_min = round_trip
+        if self.round_trip_max is None or round_trip > self.round_trip_max:
+            self.round_trip_max = round_trip
+
+        if not delivery.future.done():
+            delivery.future.set_result(confirmed)
+        return True
+
+    def fail_all(self, exc: Exception):
+        by_ack_crc, self._by_ack_crc = self._by_ack_crc, {}
+        for queue in by_ack_crc.values():
+            for delivery in queue:
+                self._timer_wheel.cancel(delivery)
+                if not delivery.future.done():
+                    delivery.future.set_exception(exc)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self),
+            "confirmed": self.confirmed_count,
+            "expired": self.expired_count,
+            "roundTripAvg": self.round_trip_total / self.confirmed_count if self.confirmed_count else None,
+            "roundTripMin": self.round_trip_min,
+            "roundTripMax": self.round_trip_max,
+        }
+
+    def _pop(self, ack_crc: int):
+        queue = self._by_ack_crc.get(ack_crc)
+        if queue is None:
+            return None
+        delivery = queue.popleft()
+        if not queue:
+            del self._by_ack_crc[ack_crc]
+        return delivery
+
+    def _on_expired(self, delivery: _Delivery):
+        queue = self._by_ack_crc.get(delivery.ack_crc)
+        if queue is not None:
+            queue.remove(delivery)
+            if not queue:
+                del self._by_ack_crc[delivery.ack_crc]
+
+        self.expired_count += 1
+        if not delivery.future.done():
+            delivery.future.set_exception(TimeoutError(f"No ACK for {delivery.ack_crc:#010x}"))
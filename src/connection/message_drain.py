@@ -0,0 +1,143 @@
+import asyncio
+from collections import deque
+
+from ..constants import Constants
+
+
+class MessageDrain:
+    """
+    Fetches waiting messages whenever the radio pushes MsgWaiting, keeping up to
+    window SyncNextMessage requests in flight until NoMoreMessages. MsgWaiting pushes
+    arriving during a drain are merged into one more pass once it finishes.
+
+    Messages are delivered by iterating the drain, e.g. async for message in drain,
+    each as {"contactMsg": data} or {"channelMsg": data} like sync_next_message().
+    When max_queued messages are waiting for the consumer, draining pauses and the
+    remaining messages stay queued on the radio.
+
+    stop() sends no further requests, but replies to requests already written are
+    still awaited and queued, the radio has dequeued those messages. Iteration ends
+    once the stopped drain has finished and the queue is empty.
+    """
+
+    def __init__(self, connection, window: int = 4, max_queued: int = 256):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.connection = connection
+        self.window = window
+        self.queue = asyncio.Queue(max_queued)
+        self.drained_count = 0
+        self._task = None
+        self._triggered = False
+        self._stopped = False
+        self._subscription = None
+
+    def start(self):
+        """Drain on every MsgWaiting push, and once now for messages already waiting."""
+        self._stopped = False
+        if self._subscription is None:
+            self._subscription = self.connection.on(Constants.PushCodes.MsgWaiting, self._on_msg_waiting, inline=True)
+        self.trigger()
+
+    def stop(self):
+        self._stopped = True
+        self._triggered = False
+        if self._subscription is not None:
+            self._subscription.unsubscribe()
+            self._subscription = None
+        if self._task is None:
+            self._wake_consumers()
+
+    def trigger(self):
+        """Start a drain, or schedule one more pass if a drain is already running."""
+        if self._task is not None:
+            self._triggered = True
+            return
+        self._task = asyncio.ensure_future(self._drain())
+        self._task.add_done_callback(self._on_drain_done)
+
+    def is_draining(self) -> bool:
+        return self._task is not None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            if self._stopped and self._task is None and self.queue.empty():
+                raise StopAsyncIteration
+            result = await self.queue.get()
+            if result is not _STOPPED:
+                return result
+            if self._stopped:
+                # pass it on to any other consumer waiting
+                self._wake_consumers()
+                raise StopAsyncIteration
+            # left over from a drain stopped and started again
+
+    def _wake_consumers(self):
+        try:
+            self.queue.put_nowait(_STOPPED)
+        except asyncio.QueueFull:
+            # nobody is blocked on an empty queue, __anext__ ends once it is read
+            pass
+
+    def _on_msg_waiting(self, data):
+        self.trigger()
+
+    def _on_drain_done(self, task: asyncio.Future):
+        if self._task is task:
+            self._task = None
+            if self._stopped:
+                self._wake_consumers()
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            # the next MsgWaiting push retries
+            task.get_loop().call_exception_handler({
+                "message": "Message drain failed",
+                "exception": exc,
+            })
+
+    async def _drain(self):
+        while True:
+            self._triggered = False
+            await self._drain_once()
+            if not self._triggered or self._stopped:
+                return
+
+    async def _drain_once(self):
+        in_flight = deque()
+        more = True
+        error = None
+        try:
+            while in_flight or (more and not self._stopped):
+                while more and not self._stopped and len(in_flight) < self.window:
+                    in_flight.append(asyncio.ensure_future(self.connection.sync_next_message()))
+
+                try:
+                    result = await in_flight.popleft()
+                except Exception as e:
+                    # the requests already written still carry dequeued messages
+                    if error is None:
+                        error = e
+                    more = False
+                    continue
+                if "messages" in result:
+                    # NoMoreMessages, requests already in flight still get their answer
+                    more = False
+                    continue
+
+                self.drained_count += 1
+                # waits while the consumer is max_queued messages behind
+                await self.queue.put(result)
+        finally:
+            # only left with requests in flight when the drain task is cancelled
+            for request in in_flight:
+                request.cancel()
+        if error is not None:
+            raise error
+
+
+_STOPPED = object()
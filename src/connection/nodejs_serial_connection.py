@@ -1,56 +1,177 @@
-import serial
-import threading
-from .serial_connection import SerialConnection
-
-
-class PySerialConnection(SerialConnection):
-    """
-    Concrete SerialConnection using pyserial.
-    Equivalent to NodeJSSerialConnection in JS.
-    """
-
-    def __init__(self, path: str, baudrate: int = 115200):
-        super().__init__()
-        self.serial_port_path = path
-        self.baudrate = baudrate
-        self.serial_port = None
-        self._recv_thread = None
-
-    async def connect(self):
-        try:
-            self.serial_port = serial.Serial(
-                port=self.serial_port_path,
-                baudrate=self.baudrate,
-                timeout=0  # non-blocking
-            )
-            await self.on_connected()
-        except Exception as e:
-            print("SerialPort Error:", e)
-            return
-
-        # Start background thread to read incoming data
-        self._recv_thread = threading.Thread(target=self._recv_loop, daemon=True)
-        self._recv_thread.start()
-
-    def _recv_loop(self):
-        try:
-            while self.serial_port and self.serial_port.is_open:
-                data = self.serial_port.read(4096)
-                if data:
-                    # feed into SerialConnection's parser
-                    asyncio.run(self.on_data_received(data))
-        except Exception as e:
-            print("Serial receive error:", e)
-        finally:
-            asyncio.run(self.on_disconnected())
-
-    async def close(self):
-        try:
-            if self.serial_port and self.serial_port.is_open:
-                self.serial_port.close()
-        except Exception as e:
-            print("Failed to close serial port, ignoring...", e)
-
-    async def write(self, data: bytes):
-        if self.serial_port and self.serial_port.is_open:
-            self.serial_port.write(data)
+import asyncio
+import os
+import serial
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .serial_connection import SerialConnection
+
+
+class PySerialConnection(SerialConnection):
+    """
+    Concrete SerialConnection using pyserial.
+    Equivalent to NodeJSSerialConnection in JS.
+
+    The port's file descriptor is registered with loop.add_reader, so received bytes
+    are decoded and dispatched on the event loop that called connect(). Writes are
+    non-blocking: whatever the port does not accept immediately is buffered and
+    flushed from loop.add_writer, and write() waits while the buffer is above
+    write_buffer_high_water. On platforms where the loop cannot watch the port
+    (e.g. Windows), a single reader thread hands data to the loop instead, and writes
+    go through a single writer thread so frames reach the port whole and in order.
+    """
+
+    def __init__(self, path: str, baudrate: int = 115200, write_buffer_high_water: int = 16 * 1024):
+        super().__init__()
+        self.serial_port_path = path
+        self.baudrate = baudrate
+        self.write_buffer_high_water = write_buffer_high_water
+        self.serial_port = None
+        self._loop = None
+        self._fd = None
+        self._write_buffer = bytearray()
+        self._drain_waiters = []
+        self._recv_thread = None
+        self._write_executor = None
+        # set by close(), the reader thread then exits without reporting the port as lost
+        self._closing = False
+
+    async def connect(self):
+        self._loop = asyncio.get_running_loop()
+        self._closing = False
+        try:
+            self.serial_port = serial.Serial(
+                port=self.serial_port_path,
+                baudrate=self.baudrate,
+                timeout=0,  # non-blocking
+                write_timeout=0,
+            )
+        except Exception as e:
+            print("SerialPort Error:", e)
+            return
+
+        try:
+            self._fd = self.serial_port.fileno()
+            self._loop.add_reader(self._fd, self._on_readable)
+        except (AttributeError, NotImplementedError, serial.SerialException):
+            self._fd = None
+            self.serial_port.timeout = 0.1
+            self.serial_port.write_timeout = None
+            self._write_executor = ThreadPoolExecutor(max_workers=1)
+            self._recv_thread = threading.Thread(target=self._recv_loop, daemon=True)
+            self._recv_thread.start()
+
+        await self.on_connected()
+
+    def _on_readable(self):
+        try:
+            data = os.read(self._fd, 4096)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            print("Serial receive error:", e)
+            self._on_port_lost()
+            return
+
+        if not data:
+            self._on_port_lost()
+            return
+
+        self.feed_data(data)
+
+    def _recv_loop(self):
+        """Fallback reader thread, hands each batch of bytes to the event loop."""
+        loop = self._loop
+        port = self.serial_port
+        try:
+            while not self._closing and port.is_open:
+                data = port.read(max(1, port.in_waiting))
+                if data and not self._closing:
+                    loop.call_soon_threadsafe(self.feed_data, data)
+        except Exception as e:
+            # the read close() interrupted fails too
+            if not self._closing:
+                print("Serial receive error:", e)
+        if not self._closing:
+            try:
+                loop.call_soon_threadsafe(self._on_port_lost)
+            except RuntimeError:
+                # the loop was closed first, nothing left to report to
+                pass
+
+    def _on_writable(self):
+        try:
+            written = os.write(self._fd, self._write_buffer)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            print("Serial write error:", e)
+            self._on_port_lost()
+            return
+
+        del self._write_buffer[:written]
+        if not self._write_buffer:
+            self._loop.remove_writer(self._fd)
+        if len(self._write_buffer) <= self.write_buffer_high_water:
+            self._wake_drain_waiters(None)
+
+    def _wake_drain_waiters(self, exc):
+        waiters, self._drain_waiters = self._drain_waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                if exc is None:
+                    waiter.set_result(None)
+                else:
+                    waiter.set_exception(exc)
+
+    def _stop_watching(self):
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)
+            self._loop.remove_writer(self._fd)
+            self._fd = None
+        self._write_buffer.clear()
+
+    def _on_port_lost(self):
+        if self.serial_port is None:
+            return
+        self._stop_watching()
+        self._wake_drain_waiters(ConnectionResetError("Serial port closed"))
+        if self._write_executor is not None:
+            self._write_executor.shutdown(wait=False, cancel_futures=True)
+            self._write_executor = None
+        try:
+            self.serial_port.close()
+        except Exception:
+            pass
+        self.serial_port = None
+        self.frame_decoder.reset()
+        self.on_disconnected()
+
+    async def close(self):
+        # same teardown as a lost port: wakes blocked writers and reports the disconnect
+        self._closing = True
+        self._on_port_lost()
+
+    async def write(self, data: bytes):
+        if not (self.serial_port and self.serial_port.is_open):
+            return
+
+        if self._fd is None:
+            # reader thread fallback, port writes are blocking here
+            await self._loop.run_in_executor(self._write_executor, self.serial_port.write, data)
+            return
+
+        if not self._write_buffer:
+            try:
+                written = os.write(self._fd, data)
+            except BlockingIOError:
+                written = 0
+            if written == len(data):
+                return
+            data = memoryview(data)[written:]
+            self._loop.add_writer(self._fd, self._on_writable)
+
+        self._write_buffer.extend(data)
+        if len(self._write_buffer) > self.write_buffer_high_water:
+            waiter = self._loop.create_future()
+            self._drain_waiters.append(waiter)
+            await waiter
@@ -0,0 +1,226 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+
+from ..constants import Constants
+from ..random_utils import RandomUtils
+
+
+def lora_airtime(payload_length: int, sf: int, bw: int, cr: int, preamble_symbols: int = 8) -> float:
+    """
+    Time on air in seconds of a LoRa packet with an explicit header and CRC, as in the
+    Semtech SX127x datasheet. bw in Hz, cr as the coding rate denominator (5-8 for 4/5-4/8).
+    """
+    symbol_time = (1 << sf) / bw
+    # low data rate optimisation is required once symbols are longer than 16 ms
+    low_data_rate = 1 if symbol_time > 0.016 else 0
+    payload_symbols = 8 + max(
+        math.ceil((8 * payload_length - 4 * sf + 28 + 16) / (4 * (sf - 2 * low_data_rate))) * cr,
+        0,
+    )
+    return (preamble_symbols + 4.25) * symbol_time + payload_symbols * symbol_time
+
+
+def estimate_text_packet_length(text: str, path_len: int = 0) -> int:
+    """
+    Approximate over-the-air size of a text message packet: header, path length and path,
+    destination and source hashes, MAC, then timestamp, flags and text AES-padded to 16.
+    """
+    plaintext_length = 5 + len(text.encode("utf-8"))
+    return 2 + path_len + 4 + (plaintext_length + 15) // 16 * 16
+
+
+class _Outbound:
+    __slots__ = ("priority", "kind", "target", "text", "txt_type", "sender_timestamp", "attempt",
+                 "max_attempts", "future")
+
+    def __init__(self, priority, kind, target, text, txt_type, sender_timestamp, max_attempts, future):
+        self.priority = priority
+        self.kind = kind
+        self.target = target
+        self.text = text
+        self.txt_type = txt_type
+        self.sender_timestamp = sender_timestamp
+        self.attempt = 0
+        self.max_attempts = max_attempts
+        self.future = future
+
+
+class OutboundScheduler:
+    """
+    Queues outgoing text messages and hands them to the radio one at a time, paced by
+    the LoRa airtime of each message so the radio's TX queue never builds up.
+
+    Interactive messages always go before bulk ones. Direct messages whose ACK does not
+    arrive within the radio's estTimeout are resent with attempt + 1 after an
+    exponential backoff, up to max_attempts. Radio parameters are read from SelfInfo.
+    """
+
+    PRIORITY_INTERACTIVE = 0
+    PRIORITY_BULK = 1
+
+    # MeshCore defaults until a SelfInfo response is seen
+    DEFAULT_RADIO = {"radioBw": 250000, "radioSf": 11, "radioCr": 5}
+
+    def __init__(self, connection, max_attempts: int = 3, backoff: float = 2.0, max_backoff: float = 60.0,
+                 airtime_factor: float = 1.0):
+        self.connection = connection
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        # extra idle time after each message, as a multiple of its airtime
+        self.airtime_factor = airtime_factor
+        self.radio = dict(self.DEFAULT_RADIO)
+        self.sent_count = 0
+        self.retry_count = 0
+
+        self._queue = []
+        self._sequence = itertools.count()
+        self._wakeup = None
+        self._next_send_at = 0.0
+        self._task = None
+        # resend timer -> the message it resends
+        self._retry_handles = {}
+        self._subscription = None
+        self._stopped = False
+
+    def start(self):
+        self._stopped = False
+        if self._subscription is None:
+            self._subscription = self.connection.on(Constants.ResponseCodes.SelfInfo, self.set_radio, inline=True)
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self):
+        """
+        Stop sending, queued messages fail with CancelledError. Messages already sent
+        still resolve with their ACK, but fail with CancelledError instead of being
+        resent when it does not arrive.
+        """
+        self._stopped = True
+        if self._subscription is not None:
+            self._subscription.unsubscribe()
+            self._subscription = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        retries, self._retry_handles = self._retry_handles, {}
+        for handle, outbound in retries.items():
+            handle.cancel()
+            outbound.future.cancel()
+        queue, self._queue = self._queue, []
+        for _, _, outbound in queue:
+            outbound.future.cancel()
+
+    def set_radio(self, self_info):
+        """Take the radio's spreading factor, bandwidth and coding rate from SelfInfo data."""
+        self.radio = {name: self_info[name] for name in self.DEFAULT_RADIO}
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def send_text(self, pubkey_prefix: bytes, text: str, txt_type: int = Constants.TxtTypes.Plain,
+                  priority: int = PRIORITY_INTERACTIVE, max_attempts: int | None = None) -> asyncio.Future:
+        """
+        Queue a direct message. Returns a future resolved with the SendConfirmed data,
+        failed with TimeoutError once every attempt went unacknowledged.
+        """
+        return self._submit(priority, "direct", bytes(pubkey_prefix[:6]), text, txt_type,
+                            max_attempts or self.max_attempts)
+
+    def send_channel_text(self, channel_idx: int, text: str, txt_type: int = Constants.TxtTypes.Plain,
+                          priority: int = PRIORITY_BULK) -> asyncio.Future:
+        """Queue a channel message. Channel messages are not acknowledged, so never resent."""
+        return self._submit(priority, "channel", channel_idx, text, txt_type, 1)
+
+    def airtime(self, text: str) -> float:
+        radio = self.radio
+        return lora_airtime(estimate_text_packet_length(text), radio["radioSf"], radio["radioBw"], radio["radioCr"])
+
+    def _submit(self, priority, kind, target, text, txt_type, max_attempts) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        outbound = _Outbound(priority, kind, target, text, txt_type, int(time.time()), max_attempts, future)
+        self._push(outbound)
+        return future
+
+    def _push(self, outbound: _Outbound):
+        heapq.heappush(self._queue, (outbound.priority, next(self._sequence), outbound))
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._queue:
+                self._wakeup = loop.create_future()
+                await self._wakeup
+                continue
+
+            delay = self._next_send_at - loop.time()
+            if delay > 0:
+                # pick the message after the wait, an interactive one may have been queued meanwhile
+                await asyncio.sleep(delay)
+                continue
+
+            _, _, outbound = heapq.heappop(self._queue)
+            if outbound.future.done():
+                continue
+
+            airtime = self.airtime(outbound.text)
+            self._next_send_at = loop.time() + airtime * (1 + self.airtime_factor)
+            try:
+                await self._send(outbound)
+            except asyncio.CancelledError:
+                outbound.future.cancel()
+                raise
+            except Exception as e:
+                if not outbound.future.done():
+                    outbound.future.set_exception(e)
+
+    async def _send(self, outbound: _Outbound):
+        self.sent_count += 1
+        if outbound.kind == "channel":
+            sent = await self.connection.send_channel_txt_msg(
+                outbound.txt_type, outbound.target, outbound.sender_timestamp, outbound.text,
+            )
+            if not outbound.future.done():
+                outbound.future.set_result(sent)
+            return
+
+        sent = await self.connection.send_txt_msg(
+            outbound.txt_type, outbound.attempt, outbound.sender_timestamp, outbound.target, outbound.text,
+        )
+        sent.delivered().add_done_callback(lambda delivery: self._on_delivery(outbound, delivery))
+
+    def _on_delivery(self, outbound: _Outbound, delivery: asyncio.Future):
+        if outbound.future.done():
+            return
+        if delivery.cancelled():
+            outbound.future.cancel()
+            return
+
+        exc = delivery.exception()
+        if exc is None:
+            outbound.future.set_result(delivery.result())
+            return
+        if not isinstance(exc, TimeoutError) or outbound.attempt + 1 >= outbound.max_attempts:
+            outbound.future.set_exception(exc)
+            return
+        if self._stopped:
+            outbound.future.cancel()
+            return
+
+        # same senderTimestamp on every attempt, receivers use it to drop duplicates
+        outbound.attempt += 1
+        self.retry_count += 1
+        delay = min(self.backoff * 2 ** (outbound.attempt - 1), self.max_backoff)
+        delay *= RandomUtils.get_random_int(75, 125) / 100
+
+        def retry():
+            self._retry_handles.pop(handle, None)
+            self._push(outbound)
+
+        handle = asyncio.get_running_loop().call_later(delay, retry)
+        self._retry_handles[handle] = outbound
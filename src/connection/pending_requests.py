@@ -0,0 +1,242 @@
+import asyncio
+import itertools
+from collections import deque
+
+
+class _Pending:
+    __slots__ = ("future", "codes", "resolver", "name", "sequence", "expires")
+
+    def __init__(self, future, codes, resolver, name, sequence):
+        self.future = future
+        self.codes = codes
+        self.resolver = resolver
+        self.name = name
+        # order the request was registered, which is the order commands are written
+        self.sequence = sequence
+        # loop time after which an abandoned request stops waiting for its response
+        self.expires = None
+
+
+class PendingRequests:
+    """
+    Table of in-flight requests keyed by the response code(s) they expect.
+    A response resolves the oldest request waiting for its code (FIFO), the
+    request's resolver turns the decoded frame into its result or error.
+
+    Pushes answering a request sent over the mesh (binary, telemetry, status) can
+    arrive in any order, so those are matched on (code, key) instead, where key is
+    the request's tag or the target's public key prefix.
+
+    Responses decoded on a reader thread are handed to the event loop the requests
+    were made on before any future is touched.
+
+    A request cancelled or timed out keeps its place to consume the response the radio
+    may still send. Since responses arrive in the order commands were sent, such a
+    placeholder is dropped as soon as a later request gets its response, and in any
+    case abandoned_lifetime seconds after it was abandoned, so a command the radio never
+    answers (or a response frame lost on the way) does not shift every later response.
+    """
+
+    def __init__(self, abandoned_lifetime: float = 5.0):
+        self.abandoned_lifetime = abandoned_lifetime
+        self._loop = None
+        self._sequence = itertools.count()
+        # response code -> deque of _Pending, oldest first
+        self._waiting = {}
+        # (push code, key) -> deque of futures
+        self._keyed = {}
+        # push code -> number of keyed futures waiting
+        self._keyed_counts = {}
+
+    def __len__(self) -> int:
+        waiting = len({id(entry) for queue in self._waiting.values() for entry in queue})
+        return waiting + sum(self._keyed_counts.values())
+
+    def is_waiting_for(self, code) -> bool:
+        return code in self._waiting
+
+    def is_waiting_for_keyed(self, code) -> bool:
+        return code in self._keyed_counts
+
+    def add(self, codes: tuple, resolver, name: str | None = None) -> asyncio.Future:
+        """
+        Register a request expecting any of codes and return its future.
+        resolver(code, data, name) returns the result or raises to fail the request.
+        """
+        self._loop = loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        entry = _Pending(fut, codes, resolver, name, next(self._sequence))
+        fut.add_done_callback(lambda done: self._on_done(entry, done))
+        for code in codes:
+            queue = self._waiting.get(code)
+            if queue is None:
+                queue = self._waiting[code] = deque()
+            queue.append(entry)
+        return fut
+
+    def resolve(self, code, data) -> bool:
+        """
+        Resolve the oldest request waiting for code. Returns False if none was waiting.
+        A request that was cancelled or timed out still consumes its response, unless
+        it expired.
+        """
+        if self._off_loop():
+            self._loop.call_soon_threadsafe(self.resolve, code, data)
+            return True
+
+        entry = self._pop(code)
+        if entry is None:
+            return False
+        # every command sent before this one has been answered, or never will be
+        self._drop_abandoned_before(entry.sequence)
+
+        fut = entry.future
+        if fut.done():
+            return True
+        try:
+            result = entry.resolver(code, data, entry.name)
+        except Exception as e:
+            fut.set_exception(e)
+        else:
+            fut.set_result(result)
+        return True
+
+    def _pop(self, code) -> _Pending | None:
+        queue = self._waiting.get(code)
+        now = None
+        while queue:
+            entry = queue.popleft()
+            self._detach(entry, code)
+            if entry.expires is not None:
+                if now is None:
+                    now = self._loop.time()
+                if now >= entry.expires:
+                    continue
+            if not queue:
+                del self._waiting[code]
+            return entry
+        self._waiting.pop(code, None)
+        return None
+
+    def _drop_abandoned_before(self, sequence: int):
+        for code, queue in list(self._waiting.items()):
+            while queue and queue[0].sequence < sequence and queue[0].future.done():
+                self._detach(queue.popleft(), code)
+            if not queue:
+                self._waiting.pop(code, None)
+
+    def _on_done(self, entry: _Pending, fut: asyncio.Future):
+        if fut.cancelled():
+            entry.expires = self._loop.time() + self.abandoned_lifetime
+
+    def add_keyed(self, code, key) -> asyncio.Future:
+        """
+        Register a request expecting a code push carrying key and return its future.
+        """
+        self._loop = loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        queue = self._keyed.get((code, key))
+        if queue is None:
+            queue = self._keyed[(code, key)] = deque()
+        queue.append(fut)
+        self._keyed_counts[code] = self._keyed_counts.get(code, 0) + 1
+        return fut
+
+    def resolve_keyed(self, code, key, data) -> bool:
+        """
+        Resolve the oldest request waiting for a code push carrying key.
+        Returns False if none was waiting.
+        """
+        if self._off_loop():
+            self._loop.call_soon_threadsafe(self.resolve_keyed, code, key, data)
+            return True
+
+        queue = self._keyed.get((code, key))
+        if queue is None:
+            return False
+
+        fut = queue.popleft()
+        if not queue:
+            del self._keyed[(code, key)]
+        self._decrement_keyed(code)
+        if not fut.done():
+            fut.set_result(data)
+        return True
+
+    def remove_keyed(self, code, key, fut: asyncio.Future):
+        """
+        Drop a keyed request that timed out or was cancelled.
+        """
+        queue = self._keyed.get((code, key))
+        if queue is None or fut not in queue:
+            return
+        queue.remove(fut)
+        if not queue:
+            del self._keyed[(code, key)]
+        self._decrement_keyed(code)
+
+    def _decrement_keyed(self, code):
+        count = self._keyed_counts[code] - 1
+        if count:
+            self._keyed_counts[code] = count
+        else:
+            del self._keyed_counts[code]
+
+    def remove(self, fut: asyncio.Future):
+        """
+        Drop a request that timed out or was cancelled before its response arrived.
+        """
+        for code, queue in list(self._waiting.items()):
+            for entry in queue:
+                if entry.future is fut:
+                    queue.remove(entry)
+                    if not queue:
+                        del self._waiting[code]
+                    break
+
+    def fail_all(self, exc: Exception):
+        """
+        Fail every pending request, e.g. when the connection is lost.
+        """
+        if self._off_loop():
+            self._loop.call_soon_threadsafe(self.fail_all, exc)
+            return
+
+        waiting, self._waiting = self._waiting, {}
+        for queue in waiting.values():
+            for entry in queue:
+                if not entry.future.done():
+                    entry.future.set_exception(exc)
+
+        keyed, self._keyed = self._keyed, {}
+        self._keyed_counts = {}
+        for queue in keyed.values():
+            for fut in queue:
+                if not fut.done():
+                    fut.set_exception(exc)
+
+    def _off_loop(self) -> bool:
+        """True when called from another thread than the requests' loop, e.g. a reader thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return False
+        try:
+            return asyncio.get_running_loop() is not loop
+        except RuntimeError:
+            return True
+
+    def _detach(self, entry: _Pending, resolved_code):
+        # the entry is normally at the head of the other queues, since requests
+        # sharing a code are answered in the order they were sent
+        for code in entry.codes:
+            if code == resolved_code:
+                continue
+            queue = self._waiting.get(code)
+            if queue is None:
+                continue
+            if queue[0] is entry:
+                queue.popleft()
+            else:
+                queue.remove(entry)
+            if not queue:
+                del self._waiting[code]
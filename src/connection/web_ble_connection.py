@@ -1,57 +1,57 @@
-from ..constants import Constants
-from .connection import Connection
-
-class WebBleConnection(Connection):
-    """
-    Placeholder for Web Bluetooth connection.
-    In JS this uses navigator.bluetooth; in Python you'd use a BLE library
-    like bleak (https://github.com/hbldh/bleak) if you want actual BLE support.
-    """
-
-    def __init__(self, ble_device=None):
-        super().__init__()
-        self.ble_device = ble_device
-        self.gatt_server = None
-        self.rx_characteristic = None
-        self.tx_characteristic = None
-
-    @staticmethod
-    async def open():
-        """
-        In JS this prompts the user via navigator.bluetooth.
-        In Python you'd need to implement device discovery with bleak.
-        """
-        raise NotImplementedError("WebBleConnection.open is browser-only. Use a BLE library in Python.")
-
-    async def init(self):
-        """
-        In JS this connects to the GATT server and sets up characteristics.
-        In Python you'd use bleak to connect and discover services/characteristics.
-        """
-        raise NotImplementedError("WebBleConnection.init is browser-only. Use a BLE library in Python.")
-
-    async def close(self):
-        try:
-            if self.gatt_server:
-                # In JS: self.gattServer.disconnect()
-                # In Python: bleak client.disconnect()
-                await self.gatt_server.disconnect()
-            self.gatt_server = None
-        except Exception:
-            pass
-
-    async def write(self, data: bytes):
-        """
-        In JS this writes to rxCharacteristic.
-        In Python you'd use bleak's write_gatt_char().
-        """
-        if not self.rx_characteristic:
-            raise RuntimeError("No RX characteristic available")
-        try:
-            await self.rx_characteristic.write_value(data)
-        except Exception as e:
-            print("Failed to write to BLE device:", e)
-
-    async def send_to_radio_frame(self, frame: bytes):
-        self.emit("tx", frame)
-        await self.write(frame)
+from ..constants import Constants
+from .connection import Connection
+
+class WebBleConnection(Connection):
+    """
+    Placeholder for Web Bluetooth connection.
+    In JS this uses navigator.bluetooth; in Python you'd use a BLE library
+    like bleak (https://github.com/hbldh/bleak) if you want actual BLE support.
+    """
+
+    def __init__(self, ble_device=None):
+        super().__init__()
+        self.ble_device = ble_device
+        self.gatt_server = None
+        self.rx_characteristic = None
+        self.tx_characteristic = None
+
+    @staticmethod
+    async def open():
+        """
+        In JS this prompts the user via navigator.bluetooth.
+        In Python you'd need to implement device discovery with bleak.
+        """
+        raise NotImplementedError("WebBleConnection.open is browser-only. Use a BLE library in Python.")
+
+    async def init(self):
+        """
+        In JS this connects to the GATT server and sets up characteristics.
+        In Python you'd use bleak to connect and discover services/characteristics.
+        """
+        raise NotImplementedError("WebBleConnection.init is browser-only. Use a BLE library in Python.")
+
+    async def close(self):
+        try:
+            if self.gatt_server:
+                # In JS: self.gattServer.disconnect()
+                # In Python: bleak client.disconnect()
+                await self.gatt_server.disconnect()
+            self.gatt_server = None
+        except Exception:
+            pass
+
+    async def write(self, data: bytes):
+        """
+        In JS this writes to rxCharacteristic.
+        In Python you'd use bleak's write_gatt_char().
+        """
+        if not self.rx_characteristic:
+            raise RuntimeError("No RX characteristic available")
+        try:
+            await self.rx_characteristic.write_value(data)
+        except Exception as e:
+            print("Failed to write to BLE device:", e)
+
+    async def send_to_radio_frame(self, frame: bytes):
+        self.emit("tx", frame)
+        await self.write(frame)
@@ -0,0 +1,94 @@
+import mmap
+import os
+import struct
+
+from .contact_store import ContactRecord
+
+
+class ContactCache:
+    """
+    Contacts of each device saved to a local file of fixed-size records, so a restart
+    can load them with mmap and only ask the radio for contacts changed since.
+
+    File layout: header (magic, version, device public key, mostRecentLastmod),
+    followed by one record per contact with the same fields as a Contact response.
+    Files live in directory, one per device, named after the device public key.
+    """
+
+    MAGIC = b"MCCT"
+    VERSION = 1
+
+    # magic, version, device public key, mostRecentLastmod
+    HEADER = struct.Struct("<4sB3x32sI")
+    # publicKey, type, flags, outPathLen, outPath, advName, lastAdvert, advLat, advLon, lastMod
+    RECORD = struct.Struct("<32sBBb64s32sIIII")
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path_for(self, device_public_key: bytes) -> str:
+        return os.path.join(self.directory, f"{bytes(device_public_key).hex()}.contacts")
+
+    def load(self, device_public_key: bytes) -> tuple[int, list[ContactRecord]] | None:
+        """
+        Load the cached contacts of a device, returns (lastmod, records),
+        or None if there is no usable cache file for it.
+        """
+        try:
+            with open(self.path_for(device_public_key), "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < self.HEADER.size or (size - self.HEADER.size) % self.RECORD.size:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    magic, version, cached_device_key, lastmod = self.HEADER.unpack_from(mapped)
+                    if (magic != self.MAGIC or version != self.VERSION
+                            or cached_device_key != bytes(device_public_key)):
+                        return None
+                    with memoryview(mapped) as view:
+                        records = [
+                            ContactRecord(
+                                public_key,
+                                type_,
+                                flags,
+                                out_path_len,
+                                out_path,
+                                adv_name.split(b"\x00", 1)[0].decode("utf-8", errors="ignore"),
+                                last_advert,
+                                adv_lat,
+                                adv_lon,
+                                last_mod,
+                            )
+                            for (public_key, type_, flags, out_path_len, out_path, adv_name,
+                                 last_advert, adv_lat, adv_lon, last_mod)
+                            in self.RECORD.iter_unpack(view[self.HEADER.size:])
+                        ]
+        except FileNotFoundError:
+            return None
+        return lastmod, records
+
+    def save(self, device_public_key: bytes, lastmod: int, records):
+        """Write all records for a device, replacing the previous file atomically."""
+        record_struct = self.RECORD
+        data = bytearray(self.HEADER.pack(self.MAGIC, self.VERSION, bytes(device_public_key), lastmod or 0))
+        for record in records:
+            data += record_struct.pack(
+                record.public_key,
+                record.type,
+                record.flags,
+                record.out_path_len,
+                record.out_path,
+                record.adv_name.encode("utf-8")[:31],
+                record.last_advert,
+                record.adv_lat,
+                record.adv_lon,
+                record.last_mod,
+            )
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(device_public_key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
@@ -0,0 +1,206 @@
+from .constants import Constants
+from .events import ConnectionListener
+
+
+class ContactRecord:
+    """A contact as reported by Contact responses and NewAdvert pushes."""
+
+    __slots__ = (
+        "public_key",
+        "type",
+        "flags",
+        "out_path_len",
+        "out_path",
+        "adv_name",
+        "last_advert",
+        "adv_lat",
+        "adv_lon",
+        "last_mod",
+    )
+
+    def __init__(self, public_key: bytes, type: int, flags: int, out_path_len: int, out_path: bytes,
+                 adv_name: str, last_advert: int, adv_lat: int, adv_lon: int, last_mod: int):
+        self.public_key = public_key
+        self.type = type
+        self.flags = flags
+        self.out_path_len = out_path_len
+        self.out_path = out_path
+        self.adv_name = adv_name
+        self.last_advert = last_advert
+        self.adv_lat = adv_lat
+        self.adv_lon = adv_lon
+        self.last_mod = last_mod
+
+    @staticmethod
+    def from_frame(data) -> "ContactRecord":
+        return ContactRecord(
+            bytes(data["publicKey"]),
+            data["type"],
+            data["flags"],
+            data["outPathLen"],
+            data["outPath"],
+            data["advName"],
+            data["lastAdvert"],
+            data["advLat"],
+            data["advLon"],
+            data.get("lastMod", 0),
+        )
+
+    @staticmethod
+    def from_any(contact) -> "ContactRecord":
+        return contact if isinstance(contact, ContactRecord) else ContactRecord.from_frame(contact)
+
+    def same_contact_as(self, other: "ContactRecord") -> bool:
+        """True if AddUpdateContact with other would not change this contact."""
+        return (
+            self.type == other.type
+            and self.flags == other.flags
+            and self.out_path_len == other.out_path_len
+            and self.out_path[:max(self.out_path_len, 0)] == other.out_path[:max(other.out_path_len, 0)]
+            and self.adv_name == other.adv_name
+            and self.last_advert == other.last_advert
+            and self.adv_lat == other.adv_lat
+            and self.adv_lon == other.adv_lon
+        )
+
+    def update(self, other: "ContactRecord"):
+        for name in ContactRecord.__slots__[1:]:
+            setattr(self, name, getattr(other, name))
+
+    def to_dict(self) -> dict:
+        return {
+            "publicKey": self.public_key,
+            "type": self.type,
+            "flags": self.flags,
+            "outPathLen": self.out_path_len,
+            "outPath": self.out_path,
+            "advName": self.adv_name,
+            "lastAdvert": self.last_advert,
+            "advLat": self.adv_lat,
+            "advLon": self.adv_lon,
+            "lastMod": self.last_mod,
+        }
+
+    def __repr__(self) -> str:
+        return f"ContactRecord({self.public_key[:6].hex()}, {self.adv_name!r})"
+
+
+class ContactStore(ConnectionListener):
+    """
+    In-memory contacts indexed by full public key, by the 6-byte prefix used in
+    messages, logins and status responses, and by the 1-byte hash used in packet paths.
+
+    Prefixes are not unique, so prefix and hash lookups return every matching contact
+    (an ambiguity set); get_by_prefix() only answers when the match is unambiguous.
+    """
+
+    # attach(connection): keep the store filled from Contact responses and NewAdvert pushes
+    LISTENERS = {
+        Constants.ResponseCodes.Contact: "add_frame",
+        Constants.PushCodes.NewAdvert: "add_frame",
+    }
+
+    PREFIX_LENGTH = 6
+
+    def __init__(self):
+        # public key -> record
+        self._by_key = {}
+        # 6-byte prefix / first byte -> {public key: record}, insertion ordered sets
+        self._by_prefix = {}
+        self._by_hash = {}
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def __iter__(self):
+        return iter(self._by_key.values())
+
+    def __contains__(self, public_key) -> bool:
+        return bytes(public_key) in self._by_key
+
+    def add_frame(self, data) -> ContactRecord:
+        """Add or update a contact from Contact / NewAdvert data."""
+        return self.add(ContactRecord.from_frame(data))
+
+    def add(self, record: ContactRecord) -> ContactRecord:
+        """
+        Add a record, or update the stored record with the same public key in place.
+        Returns the stored record.
+        """
+        public_key = record.public_key
+        if type(public_key) is not bytes:
+            # bytearray / memoryview keys would not match the bytes used for lookups
+            public_key = record.public_key = bytes(public_key)
+        existing = self._by_key.get(public_key)
+        if existing is not None:
+            existing.update(record)
+            return existing
+
+        self._by_key[public_key] = record
+        self._by_prefix.setdefault(public_key[:self.PREFIX_LENGTH], {})[public_key] = record
+        self._by_hash.setdefault(public_key[0], {})[public_key] = record
+        return record
+
+    def remove(self, public_key) -> ContactRecord | None:
+        public_key = bytes(public_key)
+        record = self._by_key.pop(public_key, None)
+        if record is None:
+            return None
+        self._discard(self._by_prefix, public_key[:self.PREFIX_LENGTH], public_key)
+        self._discard(self._by_hash, public_key[0], public_key)
+        return record
+
+    def clear(self):
+        self._by_key.clear()
+        self._by_prefix.clear()
+        self._by_hash.clear()
+
+    def get(self, public_key) -> ContactRecord | None:
+        return self._by_key.get(bytes(public_key))
+
+    def find_by_prefix(self, prefix) -> tuple:
+        """All contacts whose public key starts with prefix, of any length."""
+        prefix = bytes(prefix)
+        length = len(prefix)
+        if length == 0:
+            return tuple(self._by_key.values())
+        if length >= 32:
+            record = self._by_key.get(prefix[:32])
+            return (record,) if record is not None else ()
+        if length >= self.PREFIX_LENGTH:
+            bucket = self._by_prefix.get(prefix[:self.PREFIX_LENGTH])
+        else:
+            bucket = self._by_hash.get(prefix[0])
+        if not bucket:
+            return ()
+        if length in (1, self.PREFIX_LENGTH):
+            return tuple(bucket.values())
+        return tuple(record for key, record in bucket.items() if key.startswith(prefix))
+
+    def get_by_prefix(self, prefix) -> ContactRecord | None:
+        """The contact matching prefix, None if there is none or more than one."""
+        bucket = self._by_prefix.get(bytes(prefix)) if len(prefix) == self.PREFIX_LENGTH else None
+        if bucket is None:
+            matches = self.find_by_prefix(prefix)
+            return matches[0] if len(matches) == 1 else None
+        if len(bucket) != 1:
+            return None
+        for record in bucket.values():
+            return record
+
+    def find_by_hash(self, path_hash: int) -> tuple:
+        """All contacts a 1-byte path hash may refer to."""
+        bucket = self._by_hash.get(path_hash)
+        return tuple(bucket.values()) if bucket else ()
+
+    def sender_of(self, data) -> ContactRecord | None:
+        """Contact that sent a ContactMsgRecv, LoginSuccess or StatusResponse, if unambiguous."""
+        return self.get_by_prefix(data["pubKeyPrefix"])
+
+    @staticmethod
+    def _discard(index: dict, index_key, public_key: bytes):
+        bucket = index.get(index_key)
+        if bucket is not None:
+            bucket.pop(public_key, None)
+            if not bucket:
+                del index[index_key]
@@ -0,0 +1,120 @@
+import hashlib
+import hmac
+
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    HAS_CRYPTOGRAPHY = True
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+
+try:
+    from nacl.bindings import (
+        crypto_scalarmult,
+        crypto_scalarmult_ed25519_base,
+        crypto_sign_ed25519_pk_to_curve25519,
+    )
+    HAS_NACL = True
+except ImportError:
+    HAS_NACL = False
+
+
+class CryptoUtils:
+    """
+    MeshCore packet encryption: AES-128-ECB, authenticated with a 2-byte truncated
+    HMAC-SHA256 over the ciphertext (encrypt-then-MAC). The HMAC key is the shared
+    secret zero-padded to 32 bytes, AES uses its first 16 bytes.
+    """
+
+    CIPHER_KEY_SIZE = 16
+    CIPHER_BLOCK_SIZE = 16
+    CIPHER_MAC_SIZE = 2
+    # secrets are stored in 32-byte buffers in the firmware, the HMAC key includes the padding
+    HMAC_KEY_SIZE = 32
+
+    @staticmethod
+    def require_cryptography():
+        if not HAS_CRYPTOGRAPHY:
+            raise RuntimeError("cryptography is required for packet decryption")
+
+    @staticmethod
+    def shared_secret(private_key: bytes, public_key: bytes) -> bytes:
+        """
+        ECDH shared secret with another node, as ed25519_key_exchange() in the firmware:
+        X25519 of the scalar in the first 32 bytes of our 64-byte private key and the
+        other node's Ed25519 public key converted to its Curve25519 form.
+        """
+        if not HAS_NACL:
+            raise RuntimeError("PyNaCl is required for key exchange")
+        return crypto_scalarmult(bytes(private_key[:32]), crypto_sign_ed25519_pk_to_curve25519(bytes(public_key)))
+
+    @staticmethod
+    def public_key_from_private_key(private_key: bytes) -> bytes:
+        if not HAS_NACL:
+            raise RuntimeError("PyNaCl is required for key exchange")
+        return crypto_scalarmult_ed25519_base(bytes(private_key[:32]))
+
+    @staticmethod
+    def channel_hash(secret: bytes) -> int:
+        """1-byte hash identifying a group channel in GRP_TXT/GRP_DATA payloads."""
+        return hashlib.sha256(secret).digest()[0]
+
+    @staticmethod
+    def hmac_key(secret: bytes) -> bytes:
+        return bytes(secret[:CryptoUtils.HMAC_KEY_SIZE]).ljust(CryptoUtils.HMAC_KEY_SIZE, b"\x00")
+
+    @staticmethod
+    def mac(hmac_key: bytes, ciphertext: bytes) -> bytes:
+        return hmac.new(hmac_key, ciphertext, hashlib.sha256).digest()[:CryptoUtils.CIPHER_MAC_SIZE]
+
+    @staticmethod
+    def aes_ecb_decrypt(key: bytes, ciphertext: bytes) -> bytes:
+        CryptoUtils.require_cryptography()
+        decryptor = Cipher(algorithms.AES(bytes(key[:CryptoUtils.CIPHER_KEY_SIZE])), modes.ECB()).decryptor()
+        return decryptor.update(ciphertext) + decryptor.finalize()
+
+    @staticmethod
+    def aes_ecb_encrypt(key: bytes, plaintext: bytes) -> bytes:
+        """Encrypt, zero-padding plaintext to the block size as the firmware does."""
+        CryptoUtils.require_cryptography()
+        padding = -len(plaintext) % CryptoUtils.CIPHER_BLOCK_SIZE
+        encryptor = Cipher(algorithms.AES(bytes(key[:CryptoUtils.CIPHER_KEY_SIZE])), modes.ECB()).encryptor()
+        return encryptor.update(bytes(plaintext) + b"\x00" * padding) + encryptor.finalize()
+
+    @staticmethod
+    def encrypt_then_mac(secret: bytes, plaintext: bytes) -> bytes:
+        """MAC followed by ciphertext, as found after the header fields of a payload."""
+        ciphertext = CryptoUtils.aes_ecb_encrypt(secret, plaintext)
+        return CryptoUtils.mac(CryptoUtils.hmac_key(secret), ciphertext) + ciphertext
+
+    @staticmethod
+    def mac_then_decrypt(secret: bytes, data: bytes) -> bytes | None:
+        """Verify the MAC in front of the ciphertext and decrypt, None if the MAC does not match."""
+        mac_size = CryptoUtils.CIPHER_MAC_SIZE
+        ciphertext = bytes(data[mac_size:])
+        if not ciphertext or len(ciphertext) % CryptoUtils.CIPHER_BLOCK_SIZE:
+            return None
+        if not hmac.compare_digest(CryptoUtils.mac(CryptoUtils.hmac_key(secret), ciphertext), bytes(data[:mac_size])):
+            return None
+        return CryptoUtils.aes_ecb_decrypt(secret, ciphertext)
+
+
+class CachedKey:
+    """A shared secret with its HMAC and AES state derived once, for decrypting many packets."""
+
+    __slots__ = ("secret", "hmac", "cipher")
+
+    def __init__(self, secret: bytes):
+        CryptoUtils.require_cryptography()
+        self.secret = bytes(secret)
+        # keyed HMAC state, copied per packet instead of rekeying
+        self.hmac = hmac.new(CryptoUtils.hmac_key(self.secret), digestmod=hashlib.sha256)
+        self.cipher = Cipher(algorithms.AES(self.secret[:CryptoUtils.CIPHER_KEY_SIZE]), modes.ECB())
+
+    def mac_then_decrypt(self, mac: bytes, ciphertext: bytes) -> bytes | None:
+        """Decrypt ciphertext if mac matches, None otherwise."""
+        check = self.hmac.copy()
+        check.update(ciphertext)
+        if not hmac.compare_digest(check.digest()[:CryptoUtils.CIPHER_MAC_SIZE], mac):
+            return None
+        decryptor = self.cipher.decryptor()
+        return decryptor.update(ciphertext) + decryptor.finalize()
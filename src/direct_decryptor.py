@@ -0,0 +1,130 @@
+import struct
+from collections import OrderedDict
+
+from .crypto_utils import CachedKey, CryptoUtils
+from .packets import Packet
+
+
+class DirectDecryptor:
+    """
+    Offline decoder for direct TXT_MSG / REQ / RESPONSE / PATH payloads sent to or by
+    a node, given its 64-byte private key (see export_private_key()).
+
+    Payloads start with the 1-byte hashes of the destination and source keys, so each
+    packet is only tried against the contacts whose hash matches the other end. The
+    ECDH shared secret of each contact is derived on first use and kept in an LRU of
+    at most cache_size entries, so a large capture costs one key agreement per contact.
+    Requires PyNaCl and cryptography.
+    """
+
+    DIRECT_PAYLOAD_TYPES = (
+        Packet.PAYLOAD_TYPE_TXT_MSG,
+        Packet.PAYLOAD_TYPE_REQ,
+        Packet.PAYLOAD_TYPE_RESPONSE,
+        Packet.PAYLOAD_TYPE_PATH,
+    )
+
+    def __init__(self, private_key: bytes, public_key: bytes | None = None, cache_size: int = 256):
+        CryptoUtils.require_cryptography()
+        self.private_key = bytes(private_key)
+        self.public_key = bytes(public_key) if public_key is not None else \
+            CryptoUtils.public_key_from_private_key(self.private_key)
+        self.cache_size = cache_size
+        self.key_agreements = 0
+        # path hash -> [contact public keys]
+        self._contacts_by_hash = {}
+        # contact public key -> CachedKey, least recently used first
+        self._secrets = OrderedDict()
+
+    def add_contact(self, public_key: bytes):
+        public_key = bytes(public_key)
+        candidates = self._contacts_by_hash.setdefault(public_key[0], [])
+        if public_key not in candidates:
+            candidates.append(public_key)
+
+    def add_contacts(self, contacts):
+        """Add public keys, ContactRecords or Contact data, e.g. a whole ContactStore."""
+        for contact in contacts:
+            if isinstance(contact, (bytes, bytearray, memoryview)):
+                self.add_contact(contact)
+            elif hasattr(contact, "public_key"):
+                self.add_contact(contact.public_key)
+            else:
+                self.add_contact(contact["publicKey"])
+
+    def remove_contact(self, public_key: bytes):
+        public_key = bytes(public_key)
+        candidates = self._contacts_by_hash.get(public_key[0])
+        if candidates and public_key in candidates:
+            candidates.remove(public_key)
+            if not candidates:
+                del self._contacts_by_hash[public_key[0]]
+        self._secrets.pop(public_key, None)
+
+    def decrypt(self, packet: Packet) -> dict | None:
+        """
+        Decrypt a direct packet to or from this node, None if it is not one, no contact
+        matches or the MAC check fails. The result has the contact key ("contact"),
+        "incoming", the payload type specific fields, and the full "plaintext".
+        """
+        payload_type = packet.get_payload_type()
+        if payload_type not in self.DIRECT_PAYLOAD_TYPES:
+            return None
+        payload = packet.payload_view
+        if len(payload) < 2 + CryptoUtils.CIPHER_MAC_SIZE + CryptoUtils.CIPHER_BLOCK_SIZE:
+            return None
+
+        dest_hash = payload[0]
+        src_hash = payload[1]
+        mac = bytes(payload[2:2 + CryptoUtils.CIPHER_MAC_SIZE])
+        ciphertext = bytes(payload[2 + CryptoUtils.CIPHER_MAC_SIZE:])
+        if len(ciphertext) % CryptoUtils.CIPHER_BLOCK_SIZE:
+            return None
+
+        own_hash = self.public_key[0]
+        for incoming, peer_hash in ((True, src_hash), (False, dest_hash)):
+            if (dest_hash if incoming else src_hash) != own_hash:
+                continue
+            for contact in self._contacts_by_hash.get(peer_hash, ()):
+                plaintext = self._key_for(contact).mac_then_decrypt(mac, ciphertext)
+                if plaintext is not None:
+                    result = {"contact": contact, "incoming": incoming, "dest": dest_hash, "src": src_hash}
+                    result.update(self._decode(payload_type, plaintext))
+                    result["plaintext"] = plaintext
+                    return result
+        return None
+
+    def _key_for(self, public_key: bytes) -> CachedKey:
+        secrets = self._secrets
+        key = secrets.get(public_key)
+        if key is not None:
+            secrets.move_to_end(public_key)
+            return key
+
+        self.key_agreements += 1
+        key = secrets[public_key] = CachedKey(CryptoUtils.shared_secret(self.private_key, public_key))
+        if len(secrets) > self.cache_size:
+            secrets.popitem(last=False)
+        return key
+
+    @staticmethod
+    def _decode(payload_type: int, plaintext: bytes) -> dict:
+        if payload_type == Packet.PAYLOAD_TYPE_TXT_MSG:
+            timestamp, flags = struct.unpack_from("<IB", plaintext)
+            return {
+                "timestamp": timestamp,
+                "txtType": flags >> 2,
+                "attempt": flags & 0x03,
+                "text": plaintext[5:].split(b"\x00", 1)[0].decode("utf-8", errors="ignore"),
+            }
+        if payload_type == Packet.PAYLOAD_TYPE_REQ:
+            return {"timestamp": struct.unpack_from("<I", plaintext)[0], "data": plaintext[4:]}
+        if payload_type == Packet.PAYLOAD_TYPE_RESPONSE:
+            return {"tag": struct.unpack_from("<I", plaintext)[0], "data": plaintext[4:]}
+        # PATH: returned path, then an optional piggy-backed extra payload
+        path_len = plaintext[0]
+        return {
+            "path": plaintext[1:1 + path_len],
+            "extraType": plaintext[1 + path_len] if len(plaintext) > 1 + path_len else None,
+            "extra": plaintext[2 + path_len:],
+        }
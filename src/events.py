@@ -1,34 +1,185 @@
-import asyncio
-from collections import defaultdict
-
-class EventEmitter:
-    def __init__(self):
-        self._event_listeners = defaultdict(list)
-
-    def on(self, event: str, callback):
-        """Register a persistent listener for an event."""
-        self._event_listeners[event].append(callback)
-
-    def off(self, event: str, callback):
-        """Remove a specific listener for an event."""
-        if event in self._event_listeners:
-            self._event_listeners[event] = [
-                cb for cb in self._event_listeners[event] if cb != callback
-            ]
-
-    def once(self, event: str, callback):
-        """Register a one-time listener for an event."""
-
-        def internal_callback(*args, **kwargs):
-            self.off(event, internal_callback)
-            loop = asyncio.get_event_loop()
-            loop.call_soon(callback, *args, **kwargs)
-
-        self.on(event, internal_callback)
-
-    def emit(self, event: str, *args, **kwargs):
-        """Trigger all listeners for an event asynchronously."""
-        if event in self._event_listeners:
-            loop = asyncio.get_event_loop()
-            for listener in list(self._event_listeners[event]):
-                loop.call_soon(listener, *args, **kwargs)
+import asyncio
+import threading
+
+
+class Subscription:
+    """Handle returned by on()/once(), unsubscribe() removes the listener in O(1)."""
+
+    __slots__ = ("emitter", "event", "callback", "inline", "once", "active")
+
+    def __init__(self, emitter, event, callback, inline: bool, once: bool):
+        self.emitter = emitter
+        self.event = event
+        self.callback = callback
+        self.inline = inline
+        self.once = once
+        self.active = True
+
+    def unsubscribe(self):
+        self.emitter._remove(self)
+
+
+class EventEmitter:
+    """
+    Listeners run on the event loop the emitter is used from, with one call_soon per
+    emit for all deferred listeners. Listeners registered with inline=True are called
+    synchronously from emit() instead, for cheap handlers that want no scheduling hop.
+
+    emit() may be called from other threads: events are queued and handed to the loop
+    in batches with a single call_soon_threadsafe per batch. Listeners may also be
+    added and removed from any thread, changes are serialized by a lock that emit()
+    only takes when the listener snapshot of an event has to be rebuilt.
+    """
+
+    def __init__(self):
+        # event -> {Subscription: None}, an insertion ordered set
+        self._event_listeners = {}
+        # event -> (inline listeners, deferred listeners), rebuilt after changes
+        self._listener_snapshots = {}
+        self._listeners_lock = threading.Lock()
+        self._loop = None
+        self._thread_batch = []
+        self._thread_batch_lock = threading.Lock()
+
+    def on(self, event, callback, inline: bool = False) -> Subscription:
+        """Register a persistent listener for an event."""
+        return self._add(event, callback, inline, False)
+
+    def once(self, event, callback, inline: bool = False) -> Subscription:
+        """Register a one-time listener for an event."""
+        return self._add(event, callback, inline, True)
+
+    def off(self, event, callback):
+        """Remove a specific listener for an event."""
+        with self._listeners_lock:
+            matching = [s for s in self._event_listeners.get(event, ()) if s.callback == callback]
+        for subscription in matching:
+            self._remove(subscription)
+
+    def has_listeners(self, event) -> bool:
+        """True if anything is subscribed to event, producers can skip work otherwise."""
+        return event in self._event_listeners
+
+    def emit(self, event, *args, **kwargs):
+        """Trigger all listeners for an event."""
+        snapshot = self._listener_snapshots.get(event)
+        if snapshot is None:
+            if event not in self._event_listeners:
+                return
+            snapshot = self._snapshot(event)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is None:
+            if self._loop is not None and not self._loop.is_closed():
+                self._emit_threadsafe(snapshot, args, kwargs)
+            else:
+                # no event loop in use at all, deliver synchronously
+                self._deliver(snapshot[0] + snapshot[1], args, kwargs)
+            return
+
+        self._loop = loop
+        inline, deferred = snapshot
+        if inline:
+            self._deliver(inline, args, kwargs)
+        if deferred:
+            loop.call_soon(self._deliver, deferred, args, kwargs)
+
+    def _add(self, event, callback, inline: bool, once: bool) -> Subscription:
+        if self._loop is None:
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+
+        subscription = Subscription(self, event, callback, inline, once)
+        with self._listeners_lock:
+            listeners = self._event_listeners.get(event)
+            if listeners is None:
+                listeners = self._event_listeners[event] = {}
+            listeners[subscription] = None
+            self._listener_snapshots.pop(event, None)
+        return subscription
+
+    def _remove(self, subscription: Subscription):
+        with self._listeners_lock:
+            if not subscription.active:
+                return
+            subscription.active = False
+            listeners = self._event_listeners.get(subscription.event)
+            if listeners is None:
+                return
+            listeners.pop(subscription, None)
+            if not listeners:
+                del self._event_listeners[subscription.event]
+            self._listener_snapshots.pop(subscription.event, None)
+
+    def _snapshot(self, event) -> tuple:
+        with self._listeners_lock:
+            listeners = self._event_listeners.get(event, ())
+            snapshot = (
+                tuple(s for s in listeners if s.inline),
+                tuple(s for s in listeners if not s.inline),
+            )
+            if listeners:
+                self._listener_snapshots[event] = snapshot
+        return snapshot
+
+    def _deliver(self, subscriptions: tuple, args, kwargs):
+        for subscription in subscriptions:
+            if not subscription.active:
+                continue
+            if subscription.once:
+                self._remove(subscription)
+            try:
+                subscription.callback(*args, **kwargs)
+            except Exception as e:
+                self._report_listener_error(subscription, e)
+
+    def _report_listener_error(self, subscription: Subscription, exc: Exception):
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_exception_handler({
+                "message": f"Exception in listener for event {subscription.event!r}",
+                "exception": exc,
+            })
+        else:
+            print(f"Exception in listener for event {subscription.event!r}:", exc)
+
+    def _emit_threadsafe(self, snapshot: tuple, args, kwargs):
+        with self._thread_batch_lock:
+            schedule = not self._thread_batch
+            self._thread_batch.append((snapshot, args, kwargs))
+        if schedule:
+            self._loop.call_soon_threadsafe(self._flush_thread_batch)
+
+    def _flush_thread_batch(self):
+        with self._thread_batch_lock:
+            batch, self._thread_batch = self._thread_batch, []
+        for (inline, deferred), args, kwargs in batch:
+            self._deliver(inline, args, kwargs)
+            self._deliver(deferred, args, kwargs)
+
+
+class ConnectionListener:
+    """
+    Mixin for helpers kept up to date from a connection's events. LISTENERS maps each
+    event to the name of the method handling it, attach(connection) registers those as
+    inline listeners and detach() removes every listener added by attach().
+    """
+
+    LISTENERS = {}
+
+    _subscriptions = ()
+
+    def attach(self, connection):
+        self._subscriptions = [*self._subscriptions, *(
+            connection.on(event, getattr(self, name), inline=True) for event, name in self.LISTENERS.items()
+        )]
+
+    def detach(self):
+        subscriptions, self._subscriptions = self._subscriptions, ()
+        for subscription in subscriptions:
+            subscription.unsubscribe()
@@ -0,0 +1,87 @@
+from .constants import Constants
+
+
+class FrameDecoder:
+    """
+    Incremental decoder for the companion serial framing used over serial and TCP.
+    Each frame is: frame type (0x3E '>' or 0x3C '<'), uint16 LE length, payload.
+
+    Bytes are accumulated in a bytearray with a read offset, so consumed frames and
+    skipped garbage are never sliced off the front of the buffer one step at a time.
+    Frames are handed out as zero-copy memoryviews, which stay valid until the
+    consumer drops them (the buffer is swapped rather than resized while views exist).
+    """
+
+    FRAME_HEADER_LENGTH = 3
+
+    # firmware frames are at most 172 bytes, leave plenty of headroom
+    DEFAULT_MAX_FRAME_LENGTH = 1024
+
+    def __init__(self, max_frame_length: int = DEFAULT_MAX_FRAME_LENGTH):
+        self.max_frame_length = max_frame_length
+        self.buffer = bytearray()
+        self.offset = 0
+        self.skipped_bytes = 0
+
+    def reset(self):
+        self.buffer = bytearray()
+        self.offset = 0
+
+    def buffered_bytes_count(self) -> int:
+        return len(self.buffer) - self.offset
+
+    def feed(self, data: bytes):
+        """
+        Append received bytes and yield every complete frame payload as a memoryview.
+        """
+        if self.offset:
+            # start a new buffer holding only the unconsumed tail, previously yielded
+            # views keep the old buffer alive for as long as they need it
+            self.buffer = self.buffer[self.offset:]
+            self.offset = 0
+        self.buffer.extend(data)
+
+        buffer = self.buffer
+        view = memoryview(buffer)
+        end = len(buffer)
+        offset = self.offset
+        header_length = FrameDecoder.FRAME_HEADER_LENGTH
+        incoming = Constants.SerialFrameTypes.Incoming
+        outgoing = Constants.SerialFrameTypes.Outgoing
+
+        try:
+            while end - offset >= header_length:
+                frame_type = buffer[offset]
+                if frame_type != incoming and frame_type != outgoing:
+                    # unexpected byte, jump to the next possible start byte
+                    next_offset = self._find_frame_start(buffer, offset + 1, end)
+                    self.skipped_bytes += next_offset - offset
+                    offset = self.offset = next_offset
+                    continue
+
+                frame_length = buffer[offset + 1] | (buffer[offset + 2] << 8)
+                if not frame_length or frame_length > self.max_frame_length:
+                    # not a real frame header, resync from the next byte
+                    self.skipped_bytes += 1
+                    offset = self.offset = offset + 1
+                    continue
+
+                required_length = header_length + frame_length
+                if end - offset < required_length:
+                    break
+
+                frame_start = offset + header_length
+                offset = self.offset = offset + required_length
+                yield view[frame_start:offset]
+        finally:
+            view.release()
+
+    @staticmethod
+    def _find_frame_start(buffer: bytearray, start: int, end: int) -> int:
+        incoming = buffer.find(Constants.SerialFrameTypes.Incoming, start, end)
+        outgoing = buffer.find(Constants.SerialFrameTypes.Outgoing, start, end)
+        if incoming == -1:
+            return end if outgoing == -1 else outgoing
+        if outgoing == -1:
+            return incoming
+        return min(incoming, outgoing)
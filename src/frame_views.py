@@ -0,0 +1,251 @@
+import struct
+from collections.abc import MutableMapping
+
+
+class FrameView(MutableMapping):
+    """
+    Mapping over a received frame that decodes each field on first access.
+    Subclasses list their FIELDS as (name, kind, size) in wire order, only the last
+    field may be variable length ("remaining" or "string").
+
+    Stands in for the dicts the decoders used to emit: data["publicKey"], get(),
+    dict(data), copy(), ==, iteration, and assigning or deleting keys all work, the
+    first change decoding every field into a plain dict. isinstance(data, dict) is
+    False, use dict(data) where a real dict is required. A frame shorter than its
+    fixed fields raises ValueError when the view is created, as eager decoding did.
+    """
+
+    __slots__ = ("buffer", "offset", "_cache", "_materialized")
+
+    FIELDS = ()
+
+    _STRUCT_KINDS = {
+        "uint8": struct.Struct("<B"),
+        "int8": struct.Struct("<b"),
+        "uint16": struct.Struct("<H"),
+        "uint32": struct.Struct("<I"),
+        "int32": struct.Struct("<i"),
+        "snr": struct.Struct("<b"),
+    }
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        layout = {}
+        offset = 0
+        for name, kind, size in cls.FIELDS:
+            layout[name] = (offset, kind, size)
+            if size is not None:
+                offset += size
+        cls._LAYOUT = layout
+        cls._NAMES = tuple(name for name, _, _ in cls.FIELDS)
+        cls._MIN_LENGTH = offset
+
+    def __init__(self, buffer: bytes, offset: int = 0):
+        if len(buffer) - offset < self._MIN_LENGTH:
+            raise ValueError(
+                f"Truncated {type(self).__name__}: {len(buffer) - offset} bytes, expected at least {self._MIN_LENGTH}"
+            )
+        self.buffer = buffer
+        self.offset = offset
+        self._cache = {}
+        self._materialized = False
+
+    def __getitem__(self, name):
+        cache = self._cache
+        if name in cache:
+            return cache[name]
+        if self._materialized:
+            raise KeyError(name)
+
+        field_offset, kind, size = self._LAYOUT[name]
+        start = self.offset + field_offset
+        buffer = self.buffer
+
+        struct_kind = FrameView._STRUCT_KINDS.get(kind)
+        if struct_kind is not None:
+            value = struct_kind.unpack_from(buffer, start)[0]
+            if kind == "snr":
+                value = value / 4
+        elif kind == "bytes":
+            value = bytes(buffer[start:start + size])
+        elif kind == "remaining":
+            value = bytes(buffer[start:])
+        elif kind == "cstring":
+            value = bytes(buffer[start:start + size])
+            terminator_index = value.find(b"\x00")
+            if terminator_index != -1:
+                value = value[:terminator_index]
+            value = value.decode("utf-8", errors="ignore")
+        elif kind == "string":
+            value = bytes(buffer[start:]).decode("utf-8", errors="ignore")
+        else:
+            raise ValueError(f"Unknown field kind: {kind}")
+
+        cache[name] = value
+        return value
+
+    def __setitem__(self, name, value):
+        self._materialize()[name] = value
+
+    def __delitem__(self, name):
+        del self._materialize()[name]
+
+    def _materialize(self) -> dict:
+        if not self._materialized:
+            self._cache = {name: self[name] for name in self._NAMES}
+            self._materialized = True
+        return self._cache
+
+    def copy(self) -> dict:
+        return dict(self)
+
+    def __iter__(self):
+        return iter(self._cache if self._materialized else self._NAMES)
+
+    def __len__(self) -> int:
+        return len(self._cache if self._materialized else self._NAMES)
+
+    def __contains__(self, name) -> bool:
+        return name in (self._cache if self._materialized else self._LAYOUT)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class ContactFrame(FrameView):
+    """Contact response and NewAdvert push, both carry a full contact record."""
+    __slots__ = ()
+    FIELDS = (
+        ("publicKey", "bytes", 32),
+        ("type", "uint8", 1),
+        ("flags", "uint8", 1),
+        ("outPathLen", "int8", 1),
+        ("outPath", "bytes", 64),
+        ("advName", "cstring", 32),
+        ("lastAdvert", "uint32", 4),
+        ("advLat", "uint32", 4),
+        ("advLon", "uint32", 4),
+        ("lastMod", "uint32", 4),
+    )
+
+
+class SentFrame(FrameView):
+    __slots__ = ()
+    FIELDS = (
+        ("result", "int8", 1),
+        ("expectedAckCrc", "uint32", 4),
+        ("estTimeout", "uint32", 4),
+    )
+
+
+class DeviceInfoFrame(FrameView):
+    __slots__ = ()
+    FIELDS = (
+        ("firmwareVer", "int8", 1),
+        ("reserved", "bytes", 6),
+        ("firmwareBuildDate", "cstring", 12),
+        ("manufacturerModel", "string", None),
+    )
+
+
+class SelfInfoFrame(FrameView):
+    __slots__ = ()
+    FIELDS = (
+        ("type", "uint8", 1),
+        ("txPower", "uint8", 1),
+        ("maxTxPower", "uint8", 1),
+        ("publicKey", "bytes", 32),
+        ("advLat", "int32", 4),
+        ("advLon", "int32", 4),
+        ("reserved", "bytes", 3),
+        ("manualAddContacts", "uint8", 1),
+        ("radioFreq", "uint32", 4),
+        ("radioBw", "uint32", 4),
+        ("radioSf", "uint8", 1),
+        ("radioCr", "uint8", 1),
+        ("name", "string", None),
+    )
+
+
+class ContactMsgRecvFrame(FrameView):
+    __slots__ = ()
+    FIELDS = (
+        ("pubKeyPrefix", "bytes", 6),
+        ("pathLen", "uint8", 1),
+        ("txtType", "uint8", 1),
+        ("senderTimestamp", "uint32", 4),
+        ("text", "string", None),
+    )
+
+
+class ChannelMsgRecvFrame(FrameView):
+    __slots__ = ()
+    FIELDS = (
+        ("channelIdx", "int8", 1),
+        ("pathLen", "uint8", 1),
+        ("txtType", "uint8", 1),
+        ("senderTimestamp", "uint32", 4),
+        ("text", "string", None),
+    )
+
+
+class SendConfirmedFrame(FrameView):
+    __slots__ = ()
+    FIELDS = (
+        ("ackCode", "uint32", 4),
+        ("roundTrip", "uint32", 4),
+    )
+
+
+class RawDataFrame(FrameView):
+    __slots__ = ()
+    FIELDS = (
+        ("lastSnr", "snr", 1),
+        ("lastRssi", "int8", 1),
+        ("reserved", "uint8", 1),
+        ("payload", "remaining", None),
+    )
+
+
+class LogRxDataFrame(FrameView):
+    __slots__ = ()
+    FIELDS = (
+        ("lastSnr", "snr", 1),
+        ("lastRssi", "int8", 1),
+        ("raw", "remaining", None),
+    )
+
+
+class LoginSuccessFrame(FrameView):
+    __slots__ = ()
+    FIELDS = (
+        ("reserved", "uint8", 1),
+        ("pubKeyPrefix", "bytes", 6),
+    )
+
+
+class StatusResponseFrame(FrameView):
+    __slots__ = ()
+    FIELDS = (
+        ("reserved", "uint8", 1),
+        ("pubKeyPrefix", "bytes", 6),
+        ("statusData", "remaining", None),
+    )
+
+
+class TelemetryResponseFrame(FrameView):
+    __slots__ = ()
+    FIELDS = (
+        ("reserved", "uint8", 1),
+        ("pubKeyPrefix", "bytes", 6),
+        ("lppSensorData", "remaining", None),
+    )
+
+
+class BinaryResponseFrame(FrameView):
+    __slots__ = ()
+    FIELDS = (
+        ("reserved", "uint8", 1),
+        ("tag", "uint32", 4),
+        ("responseData", "remaining", None),
+    )
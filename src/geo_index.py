@@ -0,0 +1,181 @@
+import math
+
+from .constants import Constants
+from .events import ConnectionListener
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+class GeoIndex(ConnectionListener):
+    """
+    Positions of nodes (contacts, adverts) kept in NumPy columns, answering radius and
+    k-nearest queries with vectorized haversine distances.
+
+    Rows are updated in place as adverts arrive and freed rows are reused, so updates
+    are O(1). A query first narrows the rows with a latitude/longitude bounding box,
+    then computes exact great-circle distances for the remaining candidates only.
+    Requires NumPy.
+    """
+
+    # attach(connection): keep the index updated from Contact responses and NewAdvert pushes
+    LISTENERS = {
+        Constants.ResponseCodes.Contact: "add_contact",
+        Constants.PushCodes.NewAdvert: "add_contact",
+    }
+
+    EARTH_RADIUS_KM = 6371.0088
+
+    def __init__(self, capacity: int = 1024):
+        if not HAS_NUMPY:
+            raise RuntimeError("NumPy is required for GeoIndex")
+
+        capacity = max(1, capacity)
+        # latitude / longitude in radians, cos(latitude) precomputed for haversine
+        self._lat = np.zeros(capacity, dtype=np.float64)
+        self._lon = np.zeros(capacity, dtype=np.float64)
+        self._cos_lat = np.zeros(capacity, dtype=np.float64)
+        self._type = np.zeros(capacity, dtype=np.uint8)
+        self._alive = np.zeros(capacity, dtype=np.bool_)
+        # row -> public key, public key -> row
+        self._keys = [None] * capacity
+        self._rows = {}
+        self._free_rows = []
+        # rows in use are all below this
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, public_key) -> bool:
+        return bytes(public_key) in self._rows
+
+    def add(self, public_key: bytes, lat: float, lon: float, type_: int = 0):
+        """Add or move a node, lat/lon in degrees."""
+        public_key = bytes(public_key)
+        row = self._rows.get(public_key)
+        if row is None:
+            row = self._allocate_row()
+            self._rows[public_key] = row
+            self._keys[row] = public_key
+            self._alive[row] = True
+
+        lat_rad = math.radians(lat)
+        self._lat[row] = lat_rad
+        self._lon[row] = math.radians(lon)
+        self._cos_lat[row] = math.cos(lat_rad)
+        self._type[row] = type_
+
+    def remove(self, public_key: bytes) -> bool:
+        row = self._rows.pop(bytes(public_key), None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        self._keys[row] = None
+        self._free_rows.append(row)
+        return True
+
+    def add_contact(self, data):
+        """
+        Add a node from Contact / NewAdvert data. advLat/advLon are received as uint32
+        holding signed micro-degrees, 0/0 means the node has no known position.
+        """
+        lat = data["advLat"]
+        lon = data["advLon"]
+        if not lat and not lon:
+            self.remove(data["publicKey"])
+            return
+        self.add(data["publicKey"], _int32(lat) / 1e6, _int32(lon) / 1e6, data["type"])
+
+    def add_advert(self, advert):
+        """Add a node from a parsed Advert, ignored if it carries no position."""
+        lat = advert.parsed["lat"]
+        lon = advert.parsed["lon"]
+        if lat is None or lon is None or (not lat and not lon):
+            return
+        self.add(advert.public_key, lat / 1e6, lon / 1e6, advert.get_type())
+
+    def within(self, lat: float, lon: float, radius_km: float, type_: int | None = None) -> list:
+        """
+        Nodes within radius_km of lat/lon (degrees), optionally only of one advert type,
+        as (public key, distance in km) sorted by distance.
+        """
+        size = self._size
+        lat0 = math.radians(lat)
+        lon0 = math.radians(lon)
+        angular_radius = radius_km / self.EARTH_RADIUS_KM
+
+        lats = self._lat[:size]
+        mask = self._alive[:size] & (lats >= lat0 - angular_radius) & (lats <= lat0 + angular_radius)
+        if type_ is not None:
+            mask &= self._type[:size] == type_
+        if abs(lat0) + angular_radius < math.pi / 2:
+            # the circle does not reach a pole, so it spans a bounded longitude range
+            max_dlon = math.asin(math.sin(angular_radius) / math.cos(lat0))
+            dlon = np.abs((self._lon[:size] - lon0 + math.pi) % (2 * math.pi) - math.pi)
+            mask &= dlon <= max_dlon
+
+        rows = np.flatnonzero(mask)
+        distances = self._distances(rows, lat0, lon0)
+        inside = distances <= radius_km
+        rows = rows[inside]
+        distances = distances[inside]
+        order = np.argsort(distances)
+        return self._results(rows[order], distances[order])
+
+    def nearest(self, lat: float, lon: float, k: int = 1, type_: int | None = None) -> list:
+        """
+        The k nodes closest to lat/lon (degrees), optionally only of one advert type,
+        as (public key, distance in km) sorted by distance.
+        """
+        size = self._size
+        mask = self._alive[:size]
+        if type_ is not None:
+            mask = mask & (self._type[:size] == type_)
+        rows = np.flatnonzero(mask)
+        if k <= 0 or not len(rows):
+            return []
+
+        distances = self._distances(rows, math.radians(lat), math.radians(lon))
+        if k < len(rows):
+            closest = np.argpartition(distances, k - 1)[:k]
+            rows = rows[closest]
+            distances = distances[closest]
+        order = np.argsort(distances)
+        return self._results(rows[order], distances[order])
+
+    def _distances(self, rows, lat0: float, lon0: float):
+        lats = self._lat[rows]
+        sin_dlat = np.sin((lats - lat0) / 2)
+        sin_dlon = np.sin((self._lon[rows] - lon0) / 2)
+        a = sin_dlat * sin_dlat + math.cos(lat0) * self._cos_lat[rows] * sin_dlon * sin_dlon
+        return 2 * self.EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def _results(self, rows, distances) -> list:
+        keys = self._keys
+        return [(keys[row], distance) for row, distance in zip(rows.tolist(), distances.tolist())]
+
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+        if self._size == len(self._alive):
+            self._grow(2 * len(self._alive))
+        row = self._size
+        self._size += 1
+        return row
+
+    def _grow(self, capacity: int):
+        size = self._size
+        for name in ("_lat", "_lon", "_cos_lat", "_type", "_alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:size] = old[:size]
+            setattr(self, name, new)
+        self._keys.extend([None] * (capacity - len(self._keys)))
+
+
+def _int32(value: int) -> int:
+    return value - 0x100000000 if value & 0x80000000 else value
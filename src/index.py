@@ -1,27 +1,54 @@
-# __init__.py
-
-from .connection.connection import Connection
-from .connection.web_ble_connection import WebBleConnection
-from .connection.serial_connection import SerialConnection
-from .connection.nodejs_serial_connection import NodeJSSerialConnection
-from .connection.web_serial_connection import WebSerialConnection
-from .connection.tcp_connection import TCPConnection
-from .constants import Constants
-from .advert import Advert
-from .packet import Packet
-from .buffer_utils import BufferUtils
-from .cayenne_lpp import CayenneLpp
-
-__all__ = [
-    "Connection",
-    "WebBleConnection",
-    "SerialConnection",
-    "NodeJSSerialConnection",
-    "WebSerialConnection",
-    "TCPConnection",
-    "Constants",
-    "Advert",
-    "Packet",
-    "BufferUtils",
-    "CayenneLpp",
-]
+# __init__.py
+
+from .connection.connection import Connection
+from .connection.web_ble_connection import WebBleConnection
+from .connection.serial_connection import SerialConnection
+from .connection.nodejs_serial_connection import NodeJSSerialConnection
+from .connection.web_serial_connection import WebSerialConnection
+from .connection.tcp_connection import TCPConnection
+from .connection.async_tcp_connection import AsyncTCPConnection
+from .constants import Constants
+from .advert import Advert
+from .packets import Packet
+from .buffer_utils import BufferUtils
+from .cayenne_lpp import CayenneLpp
+from .frame_decoder import FrameDecoder
+from .frame_views import FrameView
+from .contact_store import ContactStore, ContactRecord
+from .contact_cache import ContactCache
+from .geo_index import GeoIndex
+from .message_store import MessageStore
+from .packet_dedup import PacketDeduplicator
+from .crypto_utils import CryptoUtils
+from .channel_decryptor import ChannelDecryptor
+from .direct_decryptor import DirectDecryptor
+from .advert_verifier import AdvertVerifier
+from .advert_registry import AdvertRegistry
+
+__all__ = [
+    "Connection",
+    "WebBleConnection",
+    "SerialConnection",
+    "NodeJSSerialConnection",
+    "WebSerialConnection",
+    "TCPConnection",
+    "AsyncTCPConnection",
+    "Constants",
+    "Advert",
+    "Packet",
+    "BufferUtils",
+    "CayenneLpp",
+    "FrameDecoder",
+    "FrameView",
+    "ContactStore",
+    "ContactRecord",
+    "ContactCache",
+    "GeoIndex",
+    "MessageStore",
+    "PacketDeduplicator",
+    "CryptoUtils",
+    "ChannelDecryptor",
+    "DirectDecryptor",
+    "AdvertVerifier",
+    "AdvertRegistry",
+]
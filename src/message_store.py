@@ -0,0 +1,233 @@
+import bisect
+import os
+import struct
+import time
+from array import array
+from collections import OrderedDict
+
+from .constants import Constants
+from .events import ConnectionListener
+
+
+class MessageStore(ConnectionListener):
+    """
+    Persistent log of received contact and channel messages.
+
+    Messages are appended to segment files in directory (00000000.log, ...), a new
+    segment is started once the current one reaches segment_size. Each record is a
+    fixed header followed by the UTF-8 text, see RECORD_HEADER.
+
+    Retried sends (attempt > 0) arrive again with the same sender, senderTimestamp and
+    text, so add() drops messages already seen among the last dedup_capacity ones.
+    Record positions are indexed in memory by receive time and by sender, for range
+    queries without scanning the log. Indexes are rebuilt from the log on open.
+    """
+
+    # attach(connection): store every ContactMsgRecv and ChannelMsgRecv received
+    LISTENERS = {
+        Constants.ResponseCodes.ContactMsgRecv: "add_contact_message",
+        Constants.ResponseCodes.ChannelMsgRecv: "add_channel_message",
+    }
+
+    KIND_CONTACT = 0
+    KIND_CHANNEL = 1
+
+    # kind, txtType, sender (pubKeyPrefix or channelIdx), pathLen, senderTimestamp, receivedAt, text length
+    RECORD_HEADER = struct.Struct("<BB6sBIIH")
+
+    DEFAULT_SEGMENT_SIZE = 16 * 1024 * 1024
+
+    def __init__(self, directory: str, segment_size: int = DEFAULT_SEGMENT_SIZE, dedup_capacity: int = 100_000):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.dedup_capacity = dedup_capacity
+        self.duplicate_count = 0
+
+        # per record, in log order: receivedAt, segment number, offset in segment
+        self._received_at = array("I")
+        self._segments = array("I")
+        self._offsets = array("I")
+        # kind + sender -> indexes of its records
+        self._by_sender = {}
+        # (kind, sender, senderTimestamp, text hash) -> None, oldest first
+        self._recent = OrderedDict()
+
+        self._segment = 0
+        self._file = None
+        self._file_size = 0
+        self._dirty = False
+        self._readers = {}
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._received_at)
+
+    def add_contact_message(self, data, received_at: int | None = None) -> bool:
+        return self.add(self.KIND_CONTACT, data["pubKeyPrefix"], data["senderTimestamp"], data["text"],
+                        data["txtType"], data["pathLen"], received_at)
+
+    def add_channel_message(self, data, received_at: int | None = None) -> bool:
+        return self.add(self.KIND_CHANNEL, bytes([data["channelIdx"] & 0xFF]), data["senderTimestamp"], data["text"],
+                        data["txtType"], data["pathLen"], received_at)
+
+    def add(self, kind: int, sender: bytes, sender_timestamp: int, text: str,
+            txt_type: int = 0, path_len: int = 0, received_at: int | None = None) -> bool:
+        """
+        Append a message, returns False if it is a duplicate of a recent one.
+        sender is the 6-byte pubKeyPrefix, or the channel index as a single byte.
+
+        Log order is receive time order, which keeps time queries a binary search.
+        A received_at older than the last stored message raises ValueError. Without
+        received_at the current time is used, if the clock stepped back the message
+        is stored with the last message's time instead.
+        """
+        last_received_at = self._received_at[-1] if self._received_at else 0
+        if received_at is None:
+            received_at = max(int(time.time()), last_received_at)
+        elif received_at < last_received_at:
+            raise ValueError(f"received_at {received_at} is older than the last stored message ({last_received_at})")
+
+        sender = _sender_field(sender)
+        dedup_key = (kind, sender, sender_timestamp, hash(text))
+        recent = self._recent
+        if dedup_key in recent:
+            recent.move_to_end(dedup_key)
+            self.duplicate_count += 1
+            return False
+        recent[dedup_key] = None
+        if len(recent) > self.dedup_capacity:
+            recent.popitem(last=False)
+
+        encoded_text = text.encode("utf-8")
+        record = self.RECORD_HEADER.pack(
+            kind, txt_type, sender, path_len, sender_timestamp, received_at, len(encoded_text),
+        ) + encoded_text
+
+        if self._file_size and self._file_size + len(record) > self.segment_size:
+            self._open_segment(self._segment + 1)
+        self._index(received_at, kind, sender, self._segment, self._file_size)
+        self._file.write(record)
+        self._file_size += len(record)
+        self._dirty = True
+        return True
+
+    def query(self, since: int | None = None, until: int | None = None, sender=None, kind: int | None = None):
+        """
+        Yield stored messages received between since and until (inclusive, unix time),
+        optionally only those from sender: a pubKeyPrefix, or a channel index (int,
+        signed or unsigned).
+        """
+        if sender is not None:
+            if isinstance(sender, int):
+                kind, sender = self.KIND_CHANNEL, bytes([sender & 0xFF])
+            elif kind is None:
+                kind = self.KIND_CONTACT
+            indexes = self._by_sender.get(bytes([kind]) + _sender_field(sender), ())
+            times = self._received_at
+            start = 0 if since is None else bisect.bisect_left(indexes, since, key=times.__getitem__)
+            end = len(indexes) if until is None else bisect.bisect_right(indexes, until, key=times.__getitem__)
+            selected = (indexes[i] for i in range(start, end))
+        else:
+            start = 0 if since is None else bisect.bisect_left(self._received_at, since)
+            end = len(self) if until is None else bisect.bisect_right(self._received_at, until)
+            selected = range(start, end)
+
+        self.flush()
+        for index in selected:
+            message = self._read(self._segments[index], self._offsets[index])
+            if kind is None or message[0] == kind:
+                yield self._to_dict(message)
+
+    def flush(self, sync: bool = False):
+        if self._dirty:
+            self._file.flush()
+            self._dirty = False
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self.flush()
+        self._file.close()
+        for reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
+
+    def _index(self, received_at: int, kind: int, sender: bytes, segment: int, offset: int):
+        index = len(self._received_at)
+        self._received_at.append(received_at)
+        self._segments.append(segment)
+        self._offsets.append(offset)
+        sender_key = bytes([kind]) + sender
+        indexes = self._by_sender.get(sender_key)
+        if indexes is None:
+            indexes = self._by_sender[sender_key] = array("I")
+        indexes.append(index)
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{segment:08d}.log")
+
+    def _open_segment(self, segment: int):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+        self._segment = segment
+        self._file = open(self._segment_path(segment), "ab", buffering=1024 * 1024)
+        self._file_size = self._file.tell()
+
+    def _load(self):
+        segments = sorted(
+            int(name[:-4]) for name in os.listdir(self.directory)
+            if name.endswith(".log") and name[:-4].isdigit()
+        )
+        header = self.RECORD_HEADER
+        for segment in segments:
+            with open(self._segment_path(segment), "rb") as f:
+                data = f.read()
+            offset = 0
+            while offset + header.size <= len(data):
+                kind, _, sender, _, sender_timestamp, received_at, text_length = header.unpack_from(data, offset)
+                end = offset + header.size + text_length
+                if end > len(data):
+                    break
+                text = data[offset + header.size:end].decode("utf-8", errors="ignore")
+                self._recent[(kind, sender, sender_timestamp, hash(text))] = None
+                if len(self._recent) > self.dedup_capacity:
+                    self._recent.popitem(last=False)
+                self._index(received_at, kind, sender, segment, offset)
+                offset = end
+            if offset < len(data):
+                # partial record left by a crash mid-write
+                os.truncate(self._segment_path(segment), offset)
+
+        self._open_segment(segments[-1] if segments else 0)
+
+    def _read(self, segment: int, offset: int) -> tuple:
+        reader = self._readers.get(segment)
+        if reader is None:
+            reader = self._readers[segment] = open(self._segment_path(segment), "rb")
+        reader.seek(offset)
+        header = self.RECORD_HEADER
+        fields = header.unpack(reader.read(header.size))
+        return fields[:6] + (reader.read(fields[6]).decode("utf-8", errors="ignore"),)
+
+    def _to_dict(self, message: tuple) -> dict:
+        kind, txt_type, sender, path_len, sender_timestamp, received_at, text = message
+        if kind == self.KIND_CHANNEL:
+            # stored as a byte, signed like the channelIdx of ChannelMsgRecv
+            data = {"channelIdx": sender[0] - 256 if sender[0] > 127 else sender[0]}
+        else:
+            data = {"pubKeyPrefix": sender}
+        data.update({
+            "pathLen": path_len,
+            "txtType": txt_type,
+            "senderTimestamp": sender_timestamp,
+            "text": text,
+            "receivedAt": received_at,
+        })
+        return data
+
+
+def _sender_field(sender: bytes) -> bytes:
+    return bytes(sender[:6]).ljust(6, b"\x00")
@@ -0,0 +1,95 @@
+from .packets import Packet
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+if HAS_NUMPY:
+    # one row per packet, offsets point into the buffer passed to parse_packet_buffer()
+    PACKET_DTYPE = np.dtype([
+        ("offset", np.int64),
+        ("length", np.int32),
+        ("header", np.uint8),
+        ("route_type", np.uint8),
+        ("payload_type", np.uint8),
+        ("payload_version", np.uint8),
+        ("path_len", np.uint8),
+        ("payload_offset", np.int64),
+        ("payload_length", np.int32),
+        ("do_not_retransmit", np.bool_),
+        ("valid", np.bool_),
+    ])
+else:
+    PACKET_DTYPE = None
+
+
+def parse_packets(packets) -> tuple:
+    """
+    Parse a list of raw packets (e.g. LogRxData "raw" fields) in one vectorized pass.
+    Returns (buffer, records): the packets concatenated into one buffer and the
+    PACKET_DTYPE structured array describing them, see parse_packet_buffer().
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError("NumPy is required for batch packet parsing")
+    lengths = np.fromiter(map(len, packets), dtype=np.int64, count=len(packets))
+    buffer = b"".join(packets)
+    return buffer, parse_packet_buffer(buffer, lengths)
+
+
+def parse_packet_buffer(buffer, lengths):
+    """
+    Parse packets stored back to back in buffer, lengths giving the size of each one.
+    Header fields are decoded for all packets at once; packets too short for their
+    header and path are returned with valid set to False and zero payload.
+    Use packet_path() / packet_payload() to get the bytes of a row.
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError("NumPy is required for batch packet parsing")
+
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    count = len(lengths)
+    records = np.zeros(count, dtype=PACKET_DTYPE)
+    if not count:
+        return records
+
+    ends = np.cumsum(lengths)
+    if ends[-1] > len(data):
+        raise ValueError("Packet lengths exceed the buffer size")
+    offsets = ends - lengths
+
+    has_header = lengths >= 2
+    # read header and path length bytes only where they exist, the buffer may even be empty
+    header_offsets = offsets[has_header]
+    header = np.zeros(count, dtype=np.uint8)
+    header[has_header] = data[header_offsets]
+    path_len = np.zeros(count, dtype=np.int64)
+    path_len[has_header] = data[header_offsets + 1]
+    payload_length = lengths - 2 - path_len
+    valid = has_header & (payload_length >= 0)
+
+    records["offset"] = offsets
+    records["length"] = lengths
+    records["header"] = header
+    records["route_type"] = header & Packet.PH_ROUTE_MASK
+    records["payload_type"] = (header >> Packet.PH_TYPE_SHIFT) & Packet.PH_TYPE_MASK
+    records["payload_version"] = (header >> Packet.PH_VER_SHIFT) & Packet.PH_VER_MASK
+    records["path_len"] = np.where(valid, path_len, 0)
+    records["payload_offset"] = np.where(valid, offsets + 2 + path_len, 0)
+    records["payload_length"] = np.where(valid, payload_length, 0)
+    records["do_not_retransmit"] = header == 0xFF
+    records["valid"] = valid
+    return records
+
+
+def packet_path(buffer, record) -> bytes:
+    start = int(record["offset"]) + 2
+    return bytes(buffer[start:start + int(record["path_len"])])
+
+
+def packet_payload(buffer, record) -> bytes:
+    start = int(record["payload_offset"])
+    return bytes(buffer[start:start + int(record["payload_length"])])
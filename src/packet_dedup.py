@@ -0,0 +1,103 @@
+import asyncio
+from collections import OrderedDict
+
+from .constants import Constants
+from .events import ConnectionListener, EventEmitter
+from .packets import Packet
+from .timer_wheel import TimerWheel
+
+
+class PacketObservations:
+    """Every reception of one packet during the dedup window."""
+
+    __slots__ = ("packet_hash", "packet", "first_seen", "observations")
+
+    def __init__(self, packet_hash: bytes, packet: Packet, first_seen: float):
+        self.packet_hash = packet_hash
+        self.packet = packet
+        self.first_seen = first_seen
+        # {"path", "lastHop", "snr", "rssi", "time"} per reception, first one included
+        self.observations = []
+
+    def add(self, packet: Packet, snr: float, rssi: int, time: float):
+        path = packet.path
+        self.observations.append({
+            "path": path,
+            # the repeater we heard this copy from, None when heard from the origin
+            "lastHop": path[-1] if path else None,
+            "snr": snr,
+            "rssi": rssi,
+            "time": time,
+        })
+
+
+class PacketDeduplicator(EventEmitter, ConnectionListener):
+    """
+    Collapses the copies of flooded packets reported by LogRxData, one per repeater
+    that relayed it, using the firmware's packet hash (payload type + payload).
+
+    Emits "packet" with a PacketObservations the first time a packet is seen, and
+    "observations" with the same object once its window has passed, holding every
+    path it arrived on with the SNR/RSSI of each. At most capacity packets are tracked,
+    the oldest one is closed early when more arrive.
+    """
+
+    # attach(connection): deduplicate every LogRxData push received
+    LISTENERS = {
+        Constants.PushCodes.LogRxData: "add_log_rx_data",
+    }
+
+    def __init__(self, window: float = 30.0, capacity: int = 4096):
+        super().__init__()
+        self.window = window
+        self.capacity = capacity
+        self.first_seen_count = 0
+        self.duplicate_count = 0
+        self.invalid_count = 0
+        # packet hash -> PacketObservations, oldest first
+        self._seen = OrderedDict()
+        self._timer_wheel = TimerWheel(self._on_expired, tick=min(1.0, window / 4))
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add_log_rx_data(self, data) -> bool:
+        """Add a LogRxData reception, returns True if its packet was seen for the first time."""
+        try:
+            packet = Packet.from_bytes(data["raw"])
+        except ValueError:
+            self.invalid_count += 1
+            return False
+        return self.add(packet, data["lastSnr"], data["lastRssi"])
+
+    def add(self, packet: Packet, snr: float = None, rssi: int = None) -> bool:
+        now = asyncio.get_running_loop().time()
+        packet_hash = packet.get_packet_hash()
+        entry = self._seen.get(packet_hash)
+        if entry is not None:
+            self.duplicate_count += 1
+            entry.add(packet, snr, rssi, now)
+            return False
+
+        self.first_seen_count += 1
+        entry = PacketObservations(packet_hash, packet, now)
+        entry.add(packet, snr, rssi, now)
+        self._seen[packet_hash] = entry
+        self._timer_wheel.schedule(entry, self.window)
+        if len(self._seen) > self.capacity:
+            oldest = next(iter(self._seen.values()))
+            self._timer_wheel.cancel(oldest)
+            self._on_expired(oldest)
+
+        self.emit("packet", entry)
+        return True
+
+    def flush(self):
+        """Close every open window now, e.g. before shutting down."""
+        for entry in list(self._seen.values()):
+            self._timer_wheel.cancel(entry)
+            self._on_expired(entry)
+
+    def _on_expired(self, entry: PacketObservations):
+        if self._seen.pop(entry.packet_hash, None) is not None:
+            self.emit("observations", entry)
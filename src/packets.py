@@ -1,154 +1,287 @@
-from .buffer_reader import BufferReader
-from .advert import Advert
-
-class Packet:
-    # Packet::header values
-    PH_ROUTE_MASK = 0x03   # 2-bits
-    PH_TYPE_SHIFT = 2
-    PH_TYPE_MASK = 0x0F    # 4-bits
-    PH_VER_SHIFT = 6
-    PH_VER_MASK = 0x03     # 2-bits
-
-    ROUTE_TYPE_RESERVED1 = 0x00
-    ROUTE_TYPE_FLOOD = 0x01
-    ROUTE_TYPE_DIRECT = 0x02
-    ROUTE_TYPE_RESERVED2 = 0x03
-
-    PAYLOAD_TYPE_REQ = 0x00
-    PAYLOAD_TYPE_RESPONSE = 0x01
-    PAYLOAD_TYPE_TXT_MSG = 0x02
-    PAYLOAD_TYPE_ACK = 0x03
-    PAYLOAD_TYPE_ADVERT = 0x04
-    PAYLOAD_TYPE_GRP_TXT = 0x05
-    PAYLOAD_TYPE_GRP_DATA = 0x06
-    PAYLOAD_TYPE_ANON_REQ = 0x07
-    PAYLOAD_TYPE_PATH = 0x08
-    PAYLOAD_TYPE_TRACE = 0x09
-    PAYLOAD_TYPE_RAW_CUSTOM = 0x0F
-
-    def __init__(self, header: int, path: bytes, payload: bytes):
-        self.header = header
-        self.path = path
-        self.payload = payload
-
-        # parsed info
-        self.route_type = self.get_route_type()
-        self.route_type_string = self.get_route_type_string()
-        self.payload_type = self.get_payload_type()
-        self.payload_type_string = self.get_payload_type_string()
-        self.payload_version = self.get_payload_ver()
-        self.is_marked_do_not_retransmit = self.is_marked_do_not_retransmit()
-
-    @staticmethod
-    def from_bytes(data: bytes) -> "Packet":
-        buffer_reader = BufferReader(data)
-        header = buffer_reader.read_byte()
-        path_len = buffer_reader.read_int8()
-        path = buffer_reader.read_bytes(path_len)
-        payload = buffer_reader.read_remaining_bytes()
-        return Packet(header, path, payload)
-
-    def get_route_type(self) -> int:
-        return self.header & Packet.PH_ROUTE_MASK
-
-    def get_route_type_string(self) -> str | None:
-        rt = self.get_route_type()
-        if rt == Packet.ROUTE_TYPE_FLOOD:
-            return "FLOOD"
-        elif rt == Packet.ROUTE_TYPE_DIRECT:
-            return "DIRECT"
-        return None
-
-    def is_route_flood(self) -> bool:
-        return self.get_route_type() == Packet.ROUTE_TYPE_FLOOD
-
-    def is_route_direct(self) -> bool:
-        return self.get_route_type() == Packet.ROUTE_TYPE_DIRECT
-
-    def get_payload_type(self) -> int:
-        return (self.header >> Packet.PH_TYPE_SHIFT) & Packet.PH_TYPE_MASK
-
-    def get_payload_type_string(self) -> str | None:
-        pt = self.get_payload_type()
-        return {
-            Packet.PAYLOAD_TYPE_REQ: "REQ",
-            Packet.PAYLOAD_TYPE_RESPONSE: "RESPONSE",
-            Packet.PAYLOAD_TYPE_TXT_MSG: "TXT_MSG",
-            Packet.PAYLOAD_TYPE_ACK: "ACK",
-            Packet.PAYLOAD_TYPE_ADVERT: "ADVERT",
-            Packet.PAYLOAD_TYPE_GRP_TXT: "GRP_TXT",
-            Packet.PAYLOAD_TYPE_GRP_DATA: "GRP_DATA",
-            Packet.PAYLOAD_TYPE_ANON_REQ: "ANON_REQ",
-            Packet.PAYLOAD_TYPE_PATH: "PATH",
-            Packet.PAYLOAD_TYPE_TRACE: "TRACE",
-            Packet.PAYLOAD_TYPE_RAW_CUSTOM: "RAW_CUSTOM",
-        }.get(pt, None)
-
-    def get_payload_ver(self) -> int:
-        return (self.header >> Packet.PH_VER_SHIFT) & Packet.PH_VER_MASK
-
-    def mark_do_not_retransmit(self):
-        self.header = 0xFF
-
-    def is_marked_do_not_retransmit(self) -> bool:
-        return self.header == 0xFF
-
-    def parse_payload(self):
-        pt = self.get_payload_type()
-        if pt == Packet.PAYLOAD_TYPE_PATH:
-            return self.parse_payload_type_path()
-        elif pt == Packet.PAYLOAD_TYPE_REQ:
-            return self.parse_payload_type_req()
-        elif pt == Packet.PAYLOAD_TYPE_RESPONSE:
-            return self.parse_payload_type_response()
-        elif pt == Packet.PAYLOAD_TYPE_TXT_MSG:
-            return self.parse_payload_type_txt_msg()
-        elif pt == Packet.PAYLOAD_TYPE_ACK:
-            return self.parse_payload_type_ack()
-        elif pt == Packet.PAYLOAD_TYPE_ADVERT:
-            return self.parse_payload_type_advert()
-        elif pt == Packet.PAYLOAD_TYPE_ANON_REQ:
-            return self.parse_payload_type_anon_req()
-        return None
-
-    def parse_payload_type_path(self):
-        br = BufferReader(self.payload)
-        dest = br.read_byte()
-        src = br.read_byte()
-        return {"src": src, "dest": dest}
-
-    def parse_payload_type_req(self):
-        br = BufferReader(self.payload)
-        dest = br.read_byte()
-        src = br.read_byte()
-        encrypted = br.read_remaining_bytes()
-        return {"src": src, "dest": dest, "encrypted": encrypted}
-
-    def parse_payload_type_response(self):
-        br = BufferReader(self.payload)
-        dest = br.read_byte()
-        src = br.read_byte()
-        return {"src": src, "dest": dest}
-
-    def parse_payload_type_txt_msg(self):
-        br = BufferReader(self.payload)
-        dest = br.read_byte()
-        src = br.read_byte()
-        return {"src": src, "dest": dest}
-
-    def parse_payload_type_ack(self):
-        return {"ack_code": self.payload}
-
-    def parse_payload_type_advert(self):
-        advert = Advert.from_bytes(self.payload)
-        return {
-            "public_key": advert.public_key,
-            "timestamp": advert.timestamp,
-            "app_data": advert.parse_app_data(),
-        }
-
-    def parse_payload_type_anon_req(self):
-        br = BufferReader(self.payload)
-        dest = br.read_byte()
-        src_public_key = br.read_bytes(32)
-        return {"src": src_public_key, "dest": dest}
+import hashlib
+
+from .buffer_reader import BufferReader
+from .advert import Advert
+
+class Packet:
+    # Packet::header values
+    PH_ROUTE_MASK = 0x03   # 2-bits
+    PH_TYPE_SHIFT = 2
+    PH_TYPE_MASK = 0x0F    # 4-bits
+    PH_VER_SHIFT = 6
+    PH_VER_MASK = 0x03     # 2-bits
+
+    ROUTE_TYPE_RESERVED1 = 0x00
+    ROUTE_TYPE_FLOOD = 0x01
+    ROUTE_TYPE_DIRECT = 0x02
+    ROUTE_TYPE_RESERVED2 = 0x03
+
+    PAYLOAD_TYPE_REQ = 0x00
+    PAYLOAD_TYPE_RESPONSE = 0x01
+    PAYLOAD_TYPE_TXT_MSG = 0x02
+    PAYLOAD_TYPE_ACK = 0x03
+    PAYLOAD_TYPE_ADVERT = 0x04
+    PAYLOAD_TYPE_GRP_TXT = 0x05
+    PAYLOAD_TYPE_GRP_DATA = 0x06
+    PAYLOAD_TYPE_ANON_REQ = 0x07
+    PAYLOAD_TYPE_PATH = 0x08
+    PAYLOAD_TYPE_TRACE = 0x09
+    PAYLOAD_TYPE_RAW_CUSTOM = 0x0F
+
+    # bytes of the SHA-256 packet hash kept, as in the firmware
+    MAX_HASH_SIZE = 8
+
+    __slots__ = ("_header", "_raw", "_path", "_payload", "_parsed_payload")
+
+    def __init__(self, header: int, path: bytes, payload: bytes):
+        self._header = header
+        # raw packet bytes when parsed by from_bytes(), path and payload are sliced from it
+        self._raw = None
+        self._path = path
+        self._payload = payload
+        # parse_payload() result, computed on first use
+        self._parsed_payload = None
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "Packet":
+        """
+        Parse a raw packet. Only the raw bytes are kept, path and payload are sliced from
+        them on first access. data is copied once if it is mutable.
+        """
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        if len(data) < 2:
+            raise ValueError("Packet too short")
+        if 2 + data[1] > len(data):
+            raise ValueError("Packet path length exceeds packet size")
+        packet = Packet(data[0], None, None)
+        packet._raw = data
+        return packet
+
+    @staticmethod
+    def create(route_type: int, payload_type: int, payload: bytes, path: bytes = b"", payload_version: int = 0) -> "Packet":
+        """Build a packet, e.g. to send with send_raw_data() or replay a capture."""
+        header = (
+            (route_type & Packet.PH_ROUTE_MASK)
+            | ((payload_type & Packet.PH_TYPE_MASK) << Packet.PH_TYPE_SHIFT)
+            | ((payload_version & Packet.PH_VER_MASK) << Packet.PH_VER_SHIFT)
+        )
+        return Packet(header, path, payload)
+
+    def to_bytes(self) -> bytes:
+        """Serialize back to the raw packet format parsed by from_bytes()."""
+        if self._raw is not None:
+            return bytes((self._header,)) + self._raw[1:]
+        return bytes((self._header, len(self._path))) + bytes(self._path) + bytes(self._payload)
+
+    @property
+    def header(self) -> int:
+        return self._header
+
+    @header.setter
+    def header(self, header: int):
+        # the payload is parsed according to the payload type in the header
+        self._header = header
+        self._parsed_payload = None
+
+    @property
+    def path(self) -> bytes:
+        if self._path is None:
+            self._path = self._raw[2:2 + self._raw[1]]
+        return self._path
+
+    @path.setter
+    def path(self, path: bytes):
+        self._detach_raw()
+        self._path = path
+        self._parsed_payload = None
+
+    @property
+    def payload(self) -> bytes:
+        if self._payload is None:
+            self._payload = self._raw[2 + self._raw[1]:]
+        return self._payload
+
+    @payload.setter
+    def payload(self, payload: bytes):
+        self._detach_raw()
+        self._payload = payload
+        self._parsed_payload = None
+
+    @property
+    def path_view(self) -> memoryview:
+        """The path as a memoryview, without copying it out of a parsed packet."""
+        if self._raw is not None:
+            return memoryview(self._raw)[2:2 + self._raw[1]]
+        return memoryview(self._path)
+
+    @property
+    def payload_view(self) -> memoryview:
+        """The payload as a memoryview, without copying it out of a parsed packet."""
+        if self._raw is not None:
+            return memoryview(self._raw)[2 + self._raw[1]:]
+        return memoryview(self._payload)
+
+    def _detach_raw(self):
+        # path or payload replaced, the raw bytes no longer describe the packet
+        if self._raw is not None:
+            self._path = self.path
+            self._payload = self.payload
+            self._raw = None
+
+    # derived from header on access, header changes with mark_do_not_retransmit()
+    @property
+    def route_type(self) -> int:
+        return self.get_route_type()
+
+    @property
+    def route_type_string(self) -> str | None:
+        return self.get_route_type_string()
+
+    @property
+    def payload_type(self) -> int:
+        return self.get_payload_type()
+
+    @property
+    def payload_type_string(self) -> str | None:
+        return self.get_payload_type_string()
+
+    @property
+    def payload_version(self) -> int:
+        return self.get_payload_ver()
+
+    def get_route_type(self) -> int:
+        return self._header & Packet.PH_ROUTE_MASK
+
+    def get_route_type_string(self) -> str | None:
+        rt = self.get_route_type()
+        if rt == Packet.ROUTE_TYPE_FLOOD:
+            return "FLOOD"
+        elif rt == Packet.ROUTE_TYPE_DIRECT:
+            return "DIRECT"
+        return None
+
+    def is_route_flood(self) -> bool:
+        return self.get_route_type() == Packet.ROUTE_TYPE_FLOOD
+
+    def is_route_direct(self) -> bool:
+        return self.get_route_type() == Packet.ROUTE_TYPE_DIRECT
+
+    def get_payload_type(self) -> int:
+        return (self._header >> Packet.PH_TYPE_SHIFT) & Packet.PH_TYPE_MASK
+
+    def get_payload_type_string(self) -> str | None:
+        return _PAYLOAD_TYPE_STRINGS.get(self.get_payload_type())
+
+    def get_payload_ver(self) -> int:
+        return (self._header >> Packet.PH_VER_SHIFT) & Packet.PH_VER_MASK
+
+    def get_packet_hash(self) -> bytes:
+        """
+        Identity of the packet as the firmware computes it: SHA-256 over payload type and
+        payload (plus path length for TRACE), truncated to MAX_HASH_SIZE. It does not
+        depend on the path, so every flooded copy of a packet has the same hash.
+        """
+        payload_type = self.get_payload_type()
+        sha = hashlib.sha256(bytes((payload_type,)))
+        if payload_type == Packet.PAYLOAD_TYPE_TRACE:
+            sha.update(bytes((len(self.path_view),)))
+        sha.update(self.payload_view)
+        return sha.digest()[:Packet.MAX_HASH_SIZE]
+
+    def mark_do_not_retransmit(self):
+        self.header = 0xFF
+
+    def is_marked_do_not_retransmit(self) -> bool:
+        return self._header == 0xFF
+
+    def parse_payload(self):
+        """Decode the payload for its payload type, the result is cached."""
+        if self._parsed_payload is None:
+            self._parsed_payload = self._parse_payload()
+        return self._parsed_payload
+
+    def _parse_payload(self):
+        pt = self.get_payload_type()
+        if pt == Packet.PAYLOAD_TYPE_PATH:
+            return self.parse_payload_type_path()
+        elif pt == Packet.PAYLOAD_TYPE_REQ:
+            return self.parse_payload_type_req()
+        elif pt == Packet.PAYLOAD_TYPE_RESPONSE:
+            return self.parse_payload_type_response()
+        elif pt == Packet.PAYLOAD_TYPE_TXT_MSG:
+            return self.parse_payload_type_txt_msg()
+        elif pt == Packet.PAYLOAD_TYPE_ACK:
+            return self.parse_payload_type_ack()
+        elif pt == Packet.PAYLOAD_TYPE_ADVERT:
+            return self.parse_payload_type_advert()
+        elif pt == Packet.PAYLOAD_TYPE_ANON_REQ:
+            return self.parse_payload_type_anon_req()
+        elif pt == Packet.PAYLOAD_TYPE_GRP_TXT or pt == Packet.PAYLOAD_TYPE_GRP_DATA:
+            return self.parse_payload_type_grp()
+        return None
+
+    def parse_payload_type_path(self):
+        br = BufferReader(self.payload_view)
+        dest = br.read_byte()
+        src = br.read_byte()
+        return {"src": src, "dest": dest}
+
+    def parse_payload_type_req(self):
+        br = BufferReader(self.payload_view)
+        dest = br.read_byte()
+        src = br.read_byte()
+        encrypted = br.read_remaining_bytes()
+        return {"src": src, "dest": dest, "encrypted": encrypted}
+
+    def parse_payload_type_response(self):
+        br = BufferReader(self.payload_view)
+        dest = br.read_byte()
+        src = br.read_byte()
+        return {"src": src, "dest": dest}
+
+    def parse_payload_type_txt_msg(self):
+        br = BufferReader(self.payload_view)
+        dest = br.read_byte()
+        src = br.read_byte()
+        return {"src": src, "dest": dest}
+
+    def parse_payload_type_ack(self):
+        return {"ack_code": bytes(self.payload)}
+
+    def parse_payload_type_advert(self):
+        advert = Advert.from_bytes(self.payload_view)
+        return {
+            "public_key": advert.public_key,
+            "timestamp": advert.timestamp,
+            "app_data": advert.parsed,
+        }
+
+    def parse_payload_type_grp(self):
+        # decrypt with ChannelDecryptor, the channel hash selects the candidate channels
+        br = BufferReader(self.payload_view)
+        channel_hash = br.read_byte()
+        mac = br.read_bytes(2)
+        encrypted = br.read_remaining_bytes()
+        return {"channel_hash": channel_hash, "mac": mac, "encrypted": encrypted}
+
+    def parse_payload_type_anon_req(self):
+        br = BufferReader(self.payload_view)
+        dest = br.read_byte()
+        src_public_key = br.read_bytes(32)
+        return {"src": src_public_key, "dest": dest}
+
+
+_PAYLOAD_TYPE_STRINGS = {
+    Packet.PAYLOAD_TYPE_REQ: "REQ",
+    Packet.PAYLOAD_TYPE_RESPONSE: "RESPONSE",
+    Packet.PAYLOAD_TYPE_TXT_MSG: "TXT_MSG",
+    Packet.PAYLOAD_TYPE_ACK: "ACK",
+    Packet.PAYLOAD_TYPE_ADVERT: "ADVERT",
+    Packet.PAYLOAD_TYPE_GRP_TXT: "GRP_TXT",
+    Packet.PAYLOAD_TYPE_GRP_DATA: "GRP_DATA",
+    Packet.PAYLOAD_TYPE_ANON_REQ: "ANON_REQ",
+    Packet.PAYLOAD_TYPE_PATH: "PATH",
+    Packet.PAYLOAD_TYPE_TRACE: "TRACE",
+    Packet.PAYLOAD_TYPE_RAW_CUSTOM: "RAW_CUSTOM",
+}
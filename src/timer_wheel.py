@@ -0,0 +1,71 @@
+import asyncio
+import math
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel: items are placed in slots by expiry tick and a single
+    loop.call_later tick walks the slots, so any number of pending timeouts costs
+    one timer instead of one task or handle each.
+    """
+
+    def __init__(self, on_expired, tick: float = 0.1, slots: int = 512):
+        self.on_expired = on_expired
+        self.tick = tick
+        self._slots = [set() for _ in range(slots)]
+        # item -> expiry tick
+        self._expiries = {}
+        self._current_tick = 0
+        self._last_tick_time = None
+        self._timer = None
+
+    def __len__(self) -> int:
+        return len(self._expiries)
+
+    def schedule(self, item, delay: float):
+        loop = asyncio.get_running_loop()
+        if self._timer is None:
+            self._last_tick_time = loop.time()
+            self._timer = loop.call_later(self.tick, self._on_tick)
+
+        expiry = self._current_tick + max(1, math.ceil(delay / self.tick))
+        self._expiries[item] = expiry
+        self._slots[expiry % len(self._slots)].add(item)
+
+    def cancel(self, item):
+        expiry = self._expiries.pop(item, None)
+        if expiry is None:
+            return
+        self._slots[expiry % len(self._slots)].discard(item)
+        if not self._expiries and self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _on_tick(self):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        # catch up if the loop was busy for longer than one tick
+        elapsed_ticks = max(1, int((now - self._last_tick_time) / self.tick))
+        self._last_tick_time += elapsed_ticks * self.tick
+
+        target_tick = self._current_tick + elapsed_ticks
+        if elapsed_ticks >= len(self._slots):
+            expired = [item for item, expiry in self._expiries.items() if expiry <= target_tick]
+        else:
+            expired = []
+            for tick in range(self._current_tick + 1, target_tick + 1):
+                for item in self._slots[tick % len(self._slots)]:
+                    if self._expiries[item] <= target_tick:
+                        expired.append(item)
+        self._current_tick = target_tick
+
+        for item in expired:
+            self._slots[self._expiries.pop(item) % len(self._slots)].discard(item)
+
+        if self._expiries:
+            self._timer = loop.call_at(self._last_tick_time + self.tick, self._on_tick)
+        else:
+            self._timer = None
+
+        for item in expired:
+            self.on_expired(item)
@@ -0,0 +1,23 @@
+import asyncio
+
+from meshcore.connection.base_connection import Connection
+
+
+class FakeRadio(Connection):
+    """Records the commands written, replies are fed back with reply()."""
+
+    def __init__(self):
+        super().__init__()
+        self.written = []
+
+    async def send_to_radio_frame(self, data: bytes):
+        self.written.append(bytes(data))
+
+    def reply(self, frame: bytes):
+        self.on_frame_received(frame)
+
+
+async def settle():
+    """Let the tasks a test started run until they wait on the radio."""
+    for _ in range(5):
+        await asyncio.sleep(0)
@@ -0,0 +1,84 @@
+import asyncio
+import struct
+
+import pytest
+
+pytest.importorskip("nacl")
+
+from nacl.signing import SigningKey
+
+from fake_radio import settle
+from meshcore.advert_registry import AdvertRegistry
+from meshcore.advert_verifier import AdvertVerifier
+
+
+def advert_payload(signing_key: SigningKey, timestamp: int, name: bytes = b"node") -> bytes:
+    public_key = bytes(signing_key.verify_key)
+    app_data = bytes([0x81]) + name
+    signed = public_key + struct.pack("<I", timestamp) + app_data
+    return signed[:36] + signing_key.sign(signed).signature + app_data
+
+
+def flip_bit(payload: bytes, index: int) -> bytes:
+    corrupted = bytearray(payload)
+    corrupted[index] ^= 1
+    return bytes(corrupted)
+
+
+def test_newer_adverts_replace_older_ones():
+    async def main():
+        verifier = AdvertVerifier()
+        registry = AdvertRegistry(verifier)
+        signing_key = SigningKey.generate()
+        assert await registry.ingest(advert_payload(signing_key, 10))
+        assert await registry.ingest(advert_payload(signing_key, 10)) is None
+        assert await registry.ingest(advert_payload(signing_key, 9)) is None
+        advert = await registry.ingest(advert_payload(signing_key, 11, b"renamed"))
+        assert registry.get(bytes(signing_key.verify_key)) is advert
+        assert advert.parsed["name"] == "renamed"
+        assert (registry.accepted_count, registry.stale_count) == (2, 2)
+        verifier.close()
+
+    asyncio.run(main())
+
+
+def test_corrupted_copy_in_flight_does_not_shadow_the_genuine_one():
+    async def main():
+        verifier = AdvertVerifier()
+        registry = AdvertRegistry(verifier)
+        signing_key = SigningKey.generate()
+        payload = advert_payload(signing_key, 10)
+
+        corrupted = registry.ingest(flip_bit(payload, AdvertRegistry.SIGNATURE_OFFSET))
+        genuine = registry.ingest(payload)
+        copy = registry.ingest(payload)
+        results = await asyncio.gather(corrupted, genuine, copy)
+
+        assert results[0] is None and results[1] is not None and results[2] is None
+        assert registry.get(bytes(signing_key.verify_key)) is results[1]
+        assert (registry.invalid_count, registry.stale_count) == (1, 1)
+        verifier.close()
+
+    asyncio.run(main())
+
+
+def test_verifier_failure_in_ingest_nowait_is_reported():
+    class BrokenVerifier:
+        async def verify(self, advert):
+            raise RuntimeError("verifier closed")
+
+    async def main():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        registry = AdvertRegistry(BrokenVerifier())
+        payload = advert_payload(SigningKey.generate(), 10)
+        assert registry.ingest_nowait(payload)
+        await settle()
+
+        assert [e["message"] for e in errors] == ["Advert verification failed"]
+        assert isinstance(errors[0]["exception"], RuntimeError)
+        assert len(registry) == 0
+        # the payload is no longer marked as being verified
+        assert registry.ingest_nowait(payload)
+
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+import asyncio
+import struct
+
+import pytest
+
+pytest.importorskip("nacl")
+
+from nacl.signing import SigningKey
+
+from meshcore.advert import Advert
+from meshcore.advert_verifier import AdvertVerifier
+
+
+def signed_advert(timestamp: int = 1000, name: bytes = b"node") -> Advert:
+    signing_key = SigningKey.generate()
+    public_key = bytes(signing_key.verify_key)
+    app_data = bytes([0x81]) + name
+    signature = signing_key.sign(public_key + struct.pack("<I", timestamp) + app_data).signature
+    return Advert(public_key, timestamp, signature, app_data)
+
+
+def forged(advert: Advert) -> Advert:
+    return Advert(advert.public_key, advert.timestamp, advert.signature, advert.app_data + b"!")
+
+
+def test_verifies_signatures():
+    async def main():
+        verifier = AdvertVerifier()
+        advert = signed_advert()
+        assert await verifier.verify_many([advert, forged(advert)]) == [True, False]
+        assert await advert.is_verified(verifier)
+        assert verifier.cache_hits == 1
+        verifier.close()
+
+    asyncio.run(main())
+
+
+def test_cancelling_one_caller_leaves_the_others():
+    async def main():
+        verifier = AdvertVerifier()
+        advert = signed_advert()
+        first = verifier.verify(advert)
+        second = verifier.verify(advert)
+        first.cancel()
+        assert await asyncio.wait_for(second, 5)
+        verifier.close()
+
+    asyncio.run(main())
+
+
+def test_later_loop_is_not_blocked_by_a_closed_one():
+    verifier = AdvertVerifier()
+    advert = signed_advert()
+
+    async def abandon():
+        # the loop closes before the verification is handed back to it
+        verifier.verify(advert)
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(abandon())
+    loop.close()
+
+    async def main():
+        return await asyncio.wait_for(verifier.verify(advert), 5)
+
+    assert asyncio.run(main())
+    verifier.close()
+
+
+def test_default_verifier_per_loop():
+    async def default():
+        verifier = AdvertVerifier.default()
+        assert AdvertVerifier.default() is verifier
+        assert await signed_advert().is_verified()
+        return verifier
+
+    assert asyncio.run(default()) is not asyncio.run(default())
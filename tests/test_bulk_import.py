@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from fake_radio import FakeRadio
+from meshcore.constants import Constants
+
+
+class ImportingRadio(FakeRadio):
+    """Accepts every imported contact."""
+
+    async def send_to_radio_frame(self, data: bytes):
+        await super().send_to_radio_frame(data)
+        if data[0] == Constants.CommandCodes.ImportContact:
+            asyncio.get_running_loop().call_soon(self.reply, bytes([Constants.ResponseCodes.Ok]))
+
+    @property
+    def imported(self) -> list:
+        return [data[1:] for data in self.written if data[0] == Constants.CommandCodes.ImportContact]
+
+
+def blob(data: bytes) -> bytes:
+    return len(data).to_bytes(2, "little") + data
+
+
+def test_imports_every_blob(tmp_path):
+    path = tmp_path / "contacts.bin"
+    path.write_bytes(blob(b"advert one") + blob(b"advert two"))
+
+    async def main():
+        radio = ImportingRadio()
+        assert await radio.bulk_import(str(path)) == [True, True]
+        assert radio.imported == [b"advert one", b"advert two"]
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("tail", [blob(b"advert two")[:-1], b"\x05"])
+def test_truncated_file_imports_nothing(tmp_path, tail):
+    path = tmp_path / "contacts.bin"
+    path.write_bytes(blob(b"advert one") + tail)
+
+    async def main():
+        radio = ImportingRadio()
+        with pytest.raises(ValueError, match="Truncated"):
+            await radio.bulk_import(str(path))
+        assert radio.imported == []
+
+    asyncio.run(main())
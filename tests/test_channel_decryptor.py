@@ -0,0 +1,54 @@
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from meshcore.channel_decryptor import ChannelDecryptor
+from meshcore.crypto_utils import CryptoUtils
+from meshcore.packets import Packet
+
+SECRET = bytes(range(16))
+
+
+def grp_txt(secret: bytes, text: str, timestamp: int = 1000, attempt: int = 0) -> Packet:
+    plaintext = struct.pack("<IB", timestamp, attempt) + text.encode()
+    payload = bytes([CryptoUtils.channel_hash(secret)]) + CryptoUtils.encrypt_then_mac(secret, plaintext)
+    return Packet.create(Packet.ROUTE_TYPE_FLOOD, Packet.PAYLOAD_TYPE_GRP_TXT, payload)
+
+
+def test_encrypt_then_mac_round_trip():
+    data = CryptoUtils.encrypt_then_mac(SECRET, b"hello")
+    assert len(data) == CryptoUtils.CIPHER_MAC_SIZE + CryptoUtils.CIPHER_BLOCK_SIZE
+    assert CryptoUtils.mac_then_decrypt(SECRET, data) == b"hello".ljust(16, b"\x00")
+
+    tampered = bytearray(data)
+    tampered[-1] ^= 1
+    assert CryptoUtils.mac_then_decrypt(SECRET, tampered) is None
+    assert CryptoUtils.mac_then_decrypt(bytes(16), data) is None
+
+
+def test_decrypts_known_channels_only():
+    decryptor = ChannelDecryptor()
+    decryptor.add_channel_info({"secret": SECRET, "channelIdx": 2, "name": "test"})
+
+    result = decryptor.decrypt(grp_txt(SECRET, "alice: hi", attempt=1))
+    assert (result["channelIdx"], result["channelName"]) == (2, "test")
+    assert (result["timestamp"], result["attempt"], result["text"]) == (1000, 1, "alice: hi")
+
+    assert decryptor.decrypt(grp_txt(b"\xff" * 16, "other channel")) is None
+    assert (decryptor.decrypted_count, decryptor.unknown_count) == (1, 1)
+
+
+def test_batch_counts_are_summed_on_the_calling_thread():
+    decryptor = ChannelDecryptor()
+    decryptor.add_channel(SECRET, 0, "test")
+    packets = [grp_txt(SECRET, f"msg {i}").to_bytes() for i in range(50)]
+    packets += [grp_txt(b"\xff" * 16, "unknown").to_bytes(), b"\x00"]
+
+    with ThreadPoolExecutor(4) as pool:
+        results = decryptor.decrypt_batch(packets, executor=pool, chunk_size=7)
+    assert [r["text"] for r in results[:50]] == [f"msg {i}" for i in range(50)]
+    assert results[50:] == [None, None]
+    assert (decryptor.decrypted_count, decryptor.unknown_count) == (50, 1)
@@ -0,0 +1,85 @@
+import asyncio
+import struct
+
+from fake_radio import FakeRadio
+from meshcore.constants import Constants
+from meshcore.contact_cache import ContactCache
+from meshcore.contact_store import ContactRecord, ContactStore
+
+DEVICE = bytes(range(32))
+
+
+def record(index: int, name: str) -> ContactRecord:
+    return ContactRecord(bytes([index]) * 32, 1, 2, 3, bytes([index]) * 64, name, 1000 + index,
+                         -5 & 0xFFFFFFFF, 7, 100 + index)
+
+
+def test_round_trip(tmp_path):
+    cache = ContactCache(str(tmp_path))
+    records = [record(1, "alpha"), record(2, "ünïcode"), record(3, "x" * 40)]
+    cache.save(DEVICE, 102, records)
+
+    lastmod, loaded = cache.load(DEVICE)
+    assert lastmod == 102
+    assert [r.to_dict() for r in loaded[:2]] == [r.to_dict() for r in records[:2]]
+    # names are stored in the 32-byte field of the firmware, null terminated
+    assert loaded[2].adv_name == "x" * 31
+
+
+def test_unusable_files_are_ignored(tmp_path):
+    cache = ContactCache(str(tmp_path))
+    assert cache.load(DEVICE) is None
+
+    cache.save(DEVICE, 1, [record(1, "a")])
+    assert cache.load(bytes(32)) is None
+
+    path = cache.path_for(DEVICE)
+    with open(path, "ab") as f:
+        f.write(b"partial record")
+    assert cache.load(DEVICE) is None
+
+    cache.save(DEVICE, 1, [])
+    with open(path, "r+b") as f:
+        f.write(b"XXXX")
+    assert cache.load(DEVICE) is None
+
+
+class ListingRadio(FakeRadio):
+    """Lists the changed contacts whatever the since filter."""
+
+    def __init__(self, changed):
+        super().__init__()
+        self.changed = changed
+        self.since = []
+
+    async def send_to_radio_frame(self, data: bytes):
+        await super().send_to_radio_frame(data)
+        if data[0] != Constants.CommandCodes.GetContacts:
+            return
+        since = struct.unpack_from("<I", data, 1)[0] if len(data) > 1 else None
+        self.since.append(since)
+        asyncio.get_running_loop().call_soon(self.list_contacts)
+
+    def list_contacts(self):
+        for r in self.changed:
+            self.reply(bytes([Constants.ResponseCodes.Contact]) + ContactCache.RECORD.pack(
+                r.public_key, r.type, r.flags, r.out_path_len, r.out_path, r.adv_name.encode(),
+                r.last_advert, r.adv_lat, r.adv_lon, r.last_mod))
+        lastmod = max((r.last_mod for r in self.changed), default=0)
+        self.reply(bytes([Constants.ResponseCodes.EndOfContacts]) + struct.pack("<I", lastmod))
+
+
+def test_warm_start_only_fetches_changes(tmp_path):
+    async def main():
+        cache = ContactCache(str(tmp_path))
+        cache.save(DEVICE, 102, [record(1, "alpha"), record(2, "beta")])
+
+        radio = ListingRadio([record(2, "beta renamed")])
+        radio.changed[0].last_mod = 150
+        store = await radio.warm_start_contacts(cache, ContactStore(), DEVICE)
+
+        assert radio.since == [102]
+        assert sorted(r.adv_name for r in store) == ["alpha", "beta renamed"]
+        assert cache.load(DEVICE)[0] == 150
+
+    asyncio.run(main())
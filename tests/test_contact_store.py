@@ -0,0 +1,30 @@
+from meshcore.contact_store import ContactRecord, ContactStore
+
+
+def record(public_key, name: str = "node", last_mod: int = 0) -> ContactRecord:
+    return ContactRecord(public_key, 1, 0, -1, bytes(64), name, 0, 0, 0, last_mod)
+
+
+def test_lookups_by_key_prefix_and_hash():
+    store = ContactStore()
+    a = store.add(record(b"\x01" * 32, "a"))
+    b = store.add(record(b"\x01" * 6 + b"\x02" * 26, "b"))
+    assert store.get(b"\x01" * 32) is a
+    assert set(store.find_by_prefix(b"\x01" * 6)) == {a, b}
+    assert store.get_by_prefix(b"\x01" * 6) is None
+    assert store.get_by_prefix(b"\x01" * 7) is a
+    assert set(store.find_by_hash(0x01)) == {a, b}
+
+
+def test_non_bytes_keys_are_normalized():
+    store = ContactStore()
+    key = bytes(range(32))
+    stored = store.add(record(bytearray(key), "first"))
+    assert type(stored.public_key) is bytes
+    assert store.get(key) is stored and key in store
+
+    # an update through a memoryview key lands on the same record
+    assert store.add(record(memoryview(key), "second", last_mod=5)) is stored
+    assert len(store) == 1 and stored.adv_name == "second"
+    assert store.remove(bytearray(key)) is stored
+    assert len(store) == 0 and store.find_by_hash(key[0]) == ()
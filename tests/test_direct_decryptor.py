@@ -0,0 +1,61 @@
+import os
+import struct
+
+import pytest
+
+pytest.importorskip("cryptography")
+pytest.importorskip("nacl")
+
+from meshcore.crypto_utils import CryptoUtils
+from meshcore.direct_decryptor import DirectDecryptor
+from meshcore.packets import Packet
+
+
+def node() -> tuple:
+    private_key = os.urandom(64)
+    return private_key, CryptoUtils.public_key_from_private_key(private_key)
+
+
+def direct_packet(payload_type: int, sender: tuple, recipient_key: bytes, plaintext: bytes) -> Packet:
+    secret = CryptoUtils.shared_secret(sender[0], recipient_key)
+    payload = bytes([recipient_key[0], sender[1][0]]) + CryptoUtils.encrypt_then_mac(secret, plaintext)
+    return Packet.create(Packet.ROUTE_TYPE_DIRECT, payload_type, payload)
+
+
+def test_shared_secret_is_symmetric():
+    alice, bob = node(), node()
+    assert CryptoUtils.shared_secret(alice[0], bob[1]) == CryptoUtils.shared_secret(bob[0], alice[1])
+
+
+def test_decrypts_messages_in_both_directions():
+    own, peer = node(), node()
+    decryptor = DirectDecryptor(own[0])
+    decryptor.add_contacts([peer[1]])
+
+    incoming = direct_packet(Packet.PAYLOAD_TYPE_TXT_MSG, peer, own[1], struct.pack("<IB", 1234, 1) + b"hi there")
+    result = decryptor.decrypt(incoming)
+    assert result["contact"] == peer[1] and result["incoming"]
+    assert (result["timestamp"], result["attempt"], result["text"]) == (1234, 1, "hi there")
+
+    outgoing = direct_packet(Packet.PAYLOAD_TYPE_REQ, own, peer[1], struct.pack("<I", 99) + b"\x01")
+    result = decryptor.decrypt(outgoing)
+    assert result["contact"] == peer[1] and not result["incoming"]
+    assert result["timestamp"] == 99 and result["data"].rstrip(b"\x00") == b"\x01"
+    # one key agreement per contact
+    assert decryptor.key_agreements == 1
+
+
+def test_unknown_contact_and_tampered_payload_are_rejected():
+    own, peer, stranger = node(), node(), node()
+    decryptor = DirectDecryptor(own[0])
+    decryptor.add_contact(peer[1])
+
+    packet = direct_packet(Packet.PAYLOAD_TYPE_TXT_MSG, stranger, own[1], struct.pack("<IB", 1, 0) + b"x")
+    # even when its key hash collides with the contact's, the MAC check fails
+    assert decryptor.decrypt(packet) is None
+
+    packet = direct_packet(Packet.PAYLOAD_TYPE_TXT_MSG, peer, own[1], struct.pack("<IB", 1, 0) + b"x")
+    tampered = bytearray(packet.to_bytes())
+    tampered[-1] ^= 1
+    assert decryptor.decrypt(Packet.from_bytes(tampered)) is None
+    assert decryptor.decrypt(packet)["text"] == "x"
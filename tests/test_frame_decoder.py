@@ -0,0 +1,62 @@
+import struct
+
+from meshcore.constants import Constants
+from meshcore.frame_decoder import FrameDecoder
+
+
+def frame(payload: bytes, frame_type: int = Constants.SerialFrameTypes.Incoming) -> bytes:
+    return bytes([frame_type]) + struct.pack("<H", len(payload)) + payload
+
+
+def test_frames_in_one_chunk():
+    decoder = FrameDecoder()
+    data = frame(b"\x05abc") + frame(b"\x0c\x10\x27", Constants.SerialFrameTypes.Outgoing)
+    assert [bytes(f) for f in decoder.feed(data)] == [b"\x05abc", b"\x0c\x10\x27"]
+    assert decoder.buffered_bytes_count() == 0
+
+
+def test_frame_split_across_feeds():
+    decoder = FrameDecoder()
+    data = frame(b"hello") + frame(b"world")
+    frames = []
+    for i in range(len(data)):
+        frames.extend(bytes(f) for f in decoder.feed(data[i:i + 1]))
+    assert frames == [b"hello", b"world"]
+    assert decoder.skipped_bytes == 0
+
+
+def test_garbage_between_frames_is_skipped():
+    decoder = FrameDecoder()
+    data = b"\x00\x01garbage" + frame(b"one") + b"\xff\xfe" + frame(b"two")
+    assert [bytes(f) for f in decoder.feed(data)] == [b"one", b"two"]
+    assert decoder.skipped_bytes == len(b"\x00\x01garbage") + 2
+
+
+def test_implausible_length_resyncs_on_next_byte():
+    decoder = FrameDecoder(max_frame_length=16)
+    # a start byte followed by a length over the limit, then a real frame
+    data = bytes([Constants.SerialFrameTypes.Incoming]) + struct.pack("<H", 1000) + frame(b"ok")
+    assert [bytes(f) for f in decoder.feed(data)] == [b"ok"]
+    assert decoder.skipped_bytes == 3
+
+
+def test_zero_length_header_is_skipped():
+    decoder = FrameDecoder()
+    data = bytes([Constants.SerialFrameTypes.Incoming, 0, 0]) + frame(b"x")
+    assert [bytes(f) for f in decoder.feed(data)] == [b"x"]
+
+
+def test_yielded_views_survive_later_feeds():
+    decoder = FrameDecoder()
+    first = list(decoder.feed(frame(b"first") + frame(b"sec")[:2]))
+    later = list(decoder.feed(frame(b"sec")[2:] + frame(b"third") * 50))
+    assert bytes(first[0]) == b"first"
+    assert [bytes(f) for f in later] == [b"sec"] + [b"third"] * 50
+
+
+def test_reset_drops_partial_frame():
+    decoder = FrameDecoder()
+    assert list(decoder.feed(frame(b"partial")[:4])) == []
+    decoder.reset()
+    assert decoder.buffered_bytes_count() == 0
+    assert [bytes(f) for f in decoder.feed(frame(b"next"))] == [b"next"]
@@ -0,0 +1,90 @@
+import struct
+
+import pytest
+
+from meshcore.connection.base_connection import Connection
+from meshcore.constants import Constants
+
+
+def received(connection: Connection, event) -> list:
+    events = []
+    connection.on(event, events.append, inline=True)
+    return events
+
+
+def test_builtin_decoder():
+    connection = Connection()
+    events = received(connection, Constants.ResponseCodes.BatteryVoltage)
+    connection.on_frame_received(bytes([Constants.ResponseCodes.BatteryVoltage]) + struct.pack("<H", 4100))
+    assert events == [{"batteryMilliVolts": 4100}]
+
+
+def test_frame_view_decoder():
+    connection = Connection()
+    events = received(connection, Constants.ResponseCodes.Sent)
+    connection.on_frame_received(bytes([Constants.ResponseCodes.Sent]) + struct.pack("<bII", 1, 0xDEADBEEF, 5000))
+    assert dict(events[0]) == {"result": 1, "expectedAckCrc": 0xDEADBEEF, "estTimeout": 5000}
+
+
+def test_unknown_frame_is_counted_and_emitted():
+    connection = Connection()
+    events = received(connection, "unknown_frame")
+    connection.on_frame_received(b"\x7f\x01\x02")
+    assert events == [{"code": 0x7F, "data": b"\x01\x02"}]
+    assert connection.unknown_frame_counts[0x7F] == 1
+
+
+def test_unheard_frame_is_skipped():
+    connection = Connection()
+    connection.on_frame_received(bytes([Constants.ResponseCodes.BatteryVoltage]) + struct.pack("<H", 4100))
+    assert connection.skipped_frame_count == 1
+
+
+def test_overridden_decoder_runs_without_listeners():
+    class BatteryMonitor(Connection):
+        def __init__(self):
+            super().__init__()
+            self.voltages = []
+
+        def on_battery_voltage_response(self, reader):
+            self.voltages.append(reader.read_uint16_le())
+
+    connection = BatteryMonitor()
+    connection.on_frame_received(bytes([Constants.ResponseCodes.BatteryVoltage]) + struct.pack("<H", 4100))
+    assert connection.voltages == [4100]
+    assert connection.skipped_frame_count == 0
+    # built-in decoders of the subclass are still skipped
+    connection.on_frame_received(bytes([Constants.ResponseCodes.Ok]))
+    assert connection.skipped_frame_count == 1
+
+
+def test_register_frame_decoder_is_per_connection():
+    custom = Connection()
+    other = Connection()
+    calls = []
+    custom.register_frame_decoder(0x7F, lambda connection, reader: calls.append(reader.read_remaining_bytes()))
+    other_events = received(other, "unknown_frame")
+
+    custom.on_frame_received(b"\x7f\xaa")
+    other.on_frame_received(b"\x7f\xbb")
+    # custom decoders run even without listeners
+    assert calls == [b"\xaa"]
+    assert other_events == [{"code": 0x7F, "data": b"\xbb"}]
+
+
+def test_register_frame_decoder_none_restores_builtin():
+    connection = Connection()
+    code = Constants.ResponseCodes.BatteryVoltage
+    connection.register_frame_decoder(code, lambda connection, reader: None)
+    connection.register_frame_decoder(code, None)
+    events = received(connection, code)
+    connection.on_frame_received(bytes([code]) + struct.pack("<H", 3700))
+    assert events == [{"batteryMilliVolts": 3700}]
+
+
+def test_truncated_frame_fails_at_decode_time():
+    connection = Connection()
+    events = received(connection, Constants.ResponseCodes.Sent)
+    with pytest.raises(ValueError):
+        connection.on_frame_received(bytes([Constants.ResponseCodes.Sent, 1, 2]))
+    assert events == []
@@ -0,0 +1,59 @@
+import struct
+
+import pytest
+
+from meshcore.frame_views import ContactFrame, SentFrame, SelfInfoFrame
+
+
+def sent_frame() -> SentFrame:
+    return SentFrame(b"\x06" + struct.pack("<bII", 1, 0xCAFE, 3000), 1)
+
+
+def contact_frame(name: bytes = b"node") -> bytes:
+    return (
+        bytes(range(32)) + bytes([1, 0, 2]) + b"\xaa\xbb" + bytes(62)
+        + name.ljust(32, b"\x00") + struct.pack("<IIII", 100, 1, 2, 200)
+    )
+
+
+def test_fields_decode_like_the_eager_dicts():
+    data = sent_frame()
+    assert data == {"result": 1, "expectedAckCrc": 0xCAFE, "estTimeout": 3000}
+    assert list(data) == ["result", "expectedAckCrc", "estTimeout"]
+    assert data.get("missing", "default") == "default"
+
+
+def test_contact_frame():
+    data = ContactFrame(contact_frame())
+    assert data["publicKey"] == bytes(range(32))
+    assert data["outPathLen"] == 2
+    assert data["advName"] == "node"
+    assert (data["lastAdvert"], data["lastMod"]) == (100, 200)
+
+
+def test_variable_length_last_field():
+    frame = bytes(3) + bytes(32) + struct.pack("<ii", -1, 2) + bytes(4) + struct.pack("<IIBB", 869525, 250, 11, 5)
+    data = SelfInfoFrame(frame + "name é".encode())
+    assert data["advLat"] == -1
+    assert data["name"] == "name é"
+
+
+def test_assignment_and_copy_behave_like_a_dict():
+    data = sent_frame()
+    data["extra"] = "added"
+    data["result"] = 0
+    del data["estTimeout"]
+    assert dict(data) == {"result": 0, "expectedAckCrc": 0xCAFE, "extra": "added"}
+    assert "estTimeout" not in data and len(data) == 3
+
+    copied = sent_frame().copy()
+    assert type(copied) is dict
+    copied["result"] = 5
+    assert copied["expectedAckCrc"] == 0xCAFE
+
+
+def test_truncated_frame_fails_when_created():
+    with pytest.raises(ValueError, match="Truncated SentFrame"):
+        SentFrame(b"\x06\x01\x02", 1)
+    with pytest.raises(ValueError):
+        ContactFrame(contact_frame()[:-1])
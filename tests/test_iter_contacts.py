@@ -0,0 +1,73 @@
+import asyncio
+import struct
+
+import pytest
+
+from fake_radio import FakeRadio, settle
+from meshcore.constants import Constants
+
+
+def contact(index: int) -> bytes:
+    return (
+        bytes([Constants.ResponseCodes.Contact]) + bytes([index]) * 32 + bytes([1, 0, 0]) + bytes(64)
+        + f"node {index}".encode().ljust(32, b"\x00") + struct.pack("<IIII", 100, 0, 0, 200 + index)
+    )
+
+
+def end_of_contacts(lastmod: int) -> bytes:
+    return bytes([Constants.ResponseCodes.EndOfContacts]) + struct.pack("<I", lastmod)
+
+
+def test_sync_contacts():
+    async def main():
+        radio = FakeRadio()
+        sync = asyncio.ensure_future(radio.sync_contacts())
+        await settle()
+        for index in range(3):
+            radio.on_frame_received(contact(index))
+        radio.on_frame_received(end_of_contacts(202))
+        contacts = await sync
+        assert [c["advName"] for c in contacts] == ["node 0", "node 1", "node 2"]
+        assert radio.contacts_lastmod == 202
+
+    asyncio.run(main())
+
+
+def test_break_releases_listener_and_lock_without_aclose():
+    async def main():
+        radio = FakeRadio()
+        contacts = radio.iter_contacts()
+        await settle()
+
+        async def first():
+            async for c in contacts:
+                return c
+
+        task = asyncio.ensure_future(first())
+        await settle()
+        radio.on_frame_received(contact(0))
+        assert (await task)["advName"] == "node 0"
+
+        # the generator is still referenced and not closed, the radio finishes listing
+        radio.on_frame_received(contact(1))
+        radio.on_frame_received(end_of_contacts(201))
+        await settle()
+        assert not radio.has_listeners(Constants.ResponseCodes.Contact)
+        assert not radio._contacts_lock.locked()
+        await contacts.aclose()
+
+    asyncio.run(main())
+
+
+def test_silent_radio_times_out_and_releases_lock():
+    async def main():
+        radio = FakeRadio()
+        radio.CONTACTS_TIMEOUT = 0.01
+        with pytest.raises(asyncio.TimeoutError):
+            async for _ in radio.iter_contacts():
+                pass
+        await settle()
+        assert not radio._contacts_lock.locked()
+        assert not radio.has_listeners(Constants.ResponseCodes.Contact)
+
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+import asyncio
+import struct
+
+from fake_radio import FakeRadio, settle
+from meshcore.constants import Constants
+
+
+def contact_msg(text: str) -> bytes:
+    return (
+        bytes([Constants.ResponseCodes.ContactMsgRecv]) + bytes(6) + bytes([0, 0])
+        + struct.pack("<I", 100) + text.encode()
+    )
+
+
+NO_MORE_MESSAGES = bytes([Constants.ResponseCodes.NoMoreMessages])
+
+
+async def collect(drain) -> list:
+    return [message["contactMsg"]["text"] async for message in drain]
+
+
+def test_drains_until_no_more_messages():
+    async def main():
+        radio = FakeRadio()
+        drain = radio.enable_message_drain(window=2)
+        await settle()
+        assert len(radio.written) == 2
+        radio.on_frame_received(contact_msg("one"))
+        radio.on_frame_received(NO_MORE_MESSAGES)
+        await settle()
+        radio.on_frame_received(NO_MORE_MESSAGES)
+        await settle()
+        assert not drain.is_draining() and drain.drained_count == 1
+        assert drain.queue.get_nowait()["contactMsg"]["text"] == "one"
+        radio.disable_message_drain()
+
+    asyncio.run(main())
+
+
+def test_stop_keeps_replies_to_requests_already_written():
+    async def main():
+        radio = FakeRadio()
+        drain = radio.enable_message_drain(window=3)
+        await settle()
+        assert len(radio.written) == 3
+
+        radio.disable_message_drain()
+        # the radio dequeued these messages before the drain was stopped
+        for text in ("a", "b", "c"):
+            radio.on_frame_received(contact_msg(text))
+        assert await asyncio.wait_for(collect(drain), 1) == ["a", "b", "c"]
+        assert len(radio.written) == 3
+
+    asyncio.run(main())
+
+
+def test_iteration_ends_when_stopped_while_idle():
+    async def main():
+        radio = FakeRadio()
+        drain = radio.enable_message_drain(window=1)
+        await settle()
+        radio.on_frame_received(NO_MORE_MESSAGES)
+        await settle()
+
+        consumer = asyncio.ensure_future(collect(drain))
+        await settle()
+        assert not consumer.done()
+        radio.disable_message_drain()
+        assert await asyncio.wait_for(consumer, 1) == []
+
+    asyncio.run(main())
+
+
+def test_failed_request_is_reported_and_later_replies_are_kept():
+    async def main():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        radio = FakeRadio()
+        drain = radio.enable_message_drain(window=2)
+        await settle()
+        radio.on_frame_received(bytes([Constants.ResponseCodes.Err, 1]))
+        radio.on_frame_received(contact_msg("kept"))
+        await settle()
+
+        assert not drain.is_draining()
+        assert [e["message"] for e in errors] == ["Message drain failed"]
+        assert drain.queue.get_nowait()["contactMsg"]["text"] == "kept"
+        # no further requests after the failure, the next MsgWaiting retries
+        assert len(radio.written) == 2
+        radio.disable_message_drain()
+
+    asyncio.run(main())
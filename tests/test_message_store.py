@@ -0,0 +1,47 @@
+import pytest
+
+from meshcore.message_store import MessageStore
+
+
+def channel_message(channel_idx: int, text: str) -> dict:
+    return {"channelIdx": channel_idx, "pathLen": 0, "txtType": 0, "senderTimestamp": 100, "text": text}
+
+
+def test_query_by_time_and_sender(tmp_path):
+    store = MessageStore(str(tmp_path))
+    sender = b"\x01" * 6
+    for received_at, text in ((10, "a"), (20, "b"), (30, "c")):
+        store.add(MessageStore.KIND_CONTACT, sender, received_at, text, received_at=received_at)
+    store.add(MessageStore.KIND_CONTACT, b"\x02" * 6, 1, "other", received_at=30)
+
+    assert [m["text"] for m in store.query(since=20)] == ["b", "c", "other"]
+    assert [m["text"] for m in store.query(until=25, sender=sender)] == ["a", "b"]
+    # a retried send is only stored once
+    assert not store.add(MessageStore.KIND_CONTACT, sender, 10, "a", received_at=40)
+    store.close()
+
+    reopened = MessageStore(str(tmp_path))
+    assert [m["receivedAt"] for m in reopened.query(sender=sender)] == [10, 20, 30]
+    reopened.close()
+
+
+def test_backwards_received_at_is_rejected(tmp_path):
+    store = MessageStore(str(tmp_path))
+    store.add(MessageStore.KIND_CONTACT, b"\x01" * 6, 1, "a", received_at=50)
+    with pytest.raises(ValueError):
+        store.add(MessageStore.KIND_CONTACT, b"\x01" * 6, 2, "b", received_at=49)
+    # not remembered as seen either
+    assert store.add(MessageStore.KIND_CONTACT, b"\x01" * 6, 2, "b", received_at=50)
+    assert len(store) == 2
+    store.close()
+
+
+def test_channel_index_keeps_its_sign(tmp_path):
+    store = MessageStore(str(tmp_path))
+    store.add_channel_message(channel_message(-1, "negative"), received_at=1)
+    store.add_channel_message(channel_message(3, "positive"), received_at=1)
+
+    assert [m["channelIdx"] for m in store.query()] == [-1, 3]
+    assert [m["text"] for m in store.query(sender=-1)] == ["negative"]
+    assert [m["text"] for m in store.query(sender=255)] == ["negative"]
+    store.close()
@@ -0,0 +1,84 @@
+import asyncio
+
+from fake_radio import settle
+from meshcore.connection.outbound_scheduler import OutboundScheduler
+
+
+class FakeSent:
+    def __init__(self, delivery: asyncio.Future):
+        self._delivery = delivery
+
+    def delivered(self) -> asyncio.Future:
+        return self._delivery
+
+
+class FakeConnection:
+    """Direct messages are sent at once, the test settles their delivery futures."""
+
+    def __init__(self):
+        self.deliveries = []
+
+    def on(self, event, callback, inline=False):
+        return None
+
+    async def send_txt_msg(self, txt_type, attempt, sender_timestamp, pubkey_prefix, text):
+        delivery = asyncio.get_running_loop().create_future()
+        self.deliveries.append((attempt, delivery))
+        return FakeSent(delivery)
+
+
+def scheduler(connection) -> OutboundScheduler:
+    # no pacing between messages and no wait before a resend
+    return OutboundScheduler(connection, backoff=0, airtime_factor=-1)
+
+
+def test_unacknowledged_message_is_resent():
+    async def main():
+        connection = FakeConnection()
+        outbound = scheduler(connection)
+        outbound.start()
+        future = outbound.send_text(b"\x01" * 6, "hi")
+        await settle()
+        connection.deliveries[0][1].set_exception(TimeoutError())
+        await settle()
+        await asyncio.sleep(0.01)
+        assert [attempt for attempt, _ in connection.deliveries] == [0, 1]
+        connection.deliveries[1][1].set_result({"ackCode": 1})
+        assert await future == {"ackCode": 1}
+        outbound.stop()
+
+    asyncio.run(main())
+
+
+def test_timeout_after_stop_fails_instead_of_resending():
+    async def main():
+        connection = FakeConnection()
+        outbound = scheduler(connection)
+        outbound.start()
+        future = outbound.send_text(b"\x01" * 6, "hi")
+        await settle()
+        outbound.stop()
+
+        connection.deliveries[0][1].set_exception(TimeoutError())
+        await settle()
+        assert future.cancelled()
+        assert len(outbound) == 0 and len(connection.deliveries) == 1
+
+    asyncio.run(main())
+
+
+def test_stop_fails_pending_resends():
+    async def main():
+        connection = FakeConnection()
+        outbound = OutboundScheduler(connection, backoff=60, airtime_factor=-1)
+        outbound.start()
+        future = outbound.send_text(b"\x01" * 6, "hi")
+        await settle()
+        connection.deliveries[0][1].set_exception(TimeoutError())
+        await settle()
+        assert not future.done()
+
+        outbound.stop()
+        assert future.cancelled()
+
+    asyncio.run(main())
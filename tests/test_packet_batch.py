@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from meshcore.packet_batch import packet_path, packet_payload, parse_packets
+from meshcore.packets import Packet
+
+
+def raw_packet(path: bytes, payload: bytes, header: int = Packet.PAYLOAD_TYPE_TXT_MSG << Packet.PH_TYPE_SHIFT) -> bytes:
+    return bytes([header | Packet.ROUTE_TYPE_FLOOD, len(path)]) + path + payload
+
+
+def assert_matches_from_bytes(packets: list):
+    buffer, records = parse_packets(packets)
+    assert len(records) == len(packets)
+    for data, record in zip(packets, records):
+        try:
+            packet = Packet.from_bytes(data)
+        except ValueError:
+            assert not record["valid"]
+            assert record["path_len"] == 0 and record["payload_length"] == 0
+            assert packet_path(buffer, record) == b"" and packet_payload(buffer, record) == b""
+            continue
+        assert record["valid"]
+        assert record["header"] == packet.header
+        assert (record["route_type"], record["payload_type"]) == (packet.get_route_type(), packet.get_payload_type())
+        assert record["payload_version"] == packet.get_payload_ver()
+        assert record["do_not_retransmit"] == packet.is_marked_do_not_retransmit()
+        assert packet_path(buffer, record) == packet.path
+        assert packet_payload(buffer, record) == packet.payload
+
+
+def test_matches_single_packet_parsing():
+    assert_matches_from_bytes([
+        raw_packet(b"", b"payload"),
+        raw_packet(b"\xa1\xb2", b"x"),
+        raw_packet(b"\x01", b"", header=0xFC),
+        b"\xff\x00",
+    ])
+
+
+def test_empty_buffer():
+    buffer, records = parse_packets([])
+    assert buffer == b"" and len(records) == 0
+    assert_matches_from_bytes([b""])
+    assert_matches_from_bytes([b"", b"\x01"])
+
+
+def test_truncated_packets_are_invalid():
+    assert_matches_from_bytes([
+        b"\x01",
+        raw_packet(b"\xa1\xb2\xc3", b"")[:-1],
+        raw_packet(b"\xa1", b"ok"),
+        b"",
+        raw_packet(b"", b"last"),
+    ])
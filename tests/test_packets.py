@@ -0,0 +1,45 @@
+import pickle
+
+from meshcore.packets import Packet
+
+
+def raw_packet() -> bytes:
+    return bytes([Packet.ROUTE_TYPE_FLOOD | Packet.PAYLOAD_TYPE_TXT_MSG << Packet.PH_TYPE_SHIFT, 2, 0xA1, 0xB2]) + b"payload"
+
+
+def test_path_and_payload_are_bytes():
+    packet = Packet.from_bytes(bytearray(raw_packet()))
+    assert type(packet.path) is bytes and type(packet.payload) is bytes
+    assert packet.path == b"\xa1\xb2" and packet.payload == b"payload"
+    # usable as dict keys and picklable, like the parsed values always were
+    assert {packet.payload: 1}[b"payload"] == 1
+    assert pickle.loads(pickle.dumps(packet.path)) == b"\xa1\xb2"
+
+    assert isinstance(packet.payload_view, memoryview)
+    assert packet.payload_view == b"payload" and packet.path_view == b"\xa1\xb2"
+    assert packet.to_bytes() == raw_packet()
+
+
+def test_replacing_a_part_is_serialized():
+    packet = Packet.from_bytes(raw_packet())
+    packet.path = b"\x01"
+    assert packet.payload_view == b"payload"
+    assert packet.to_bytes() == raw_packet()[:1] + b"\x01\x01payload"
+    assert Packet.from_bytes(packet.to_bytes()).get_packet_hash() == Packet.from_bytes(raw_packet()).get_packet_hash()
+
+    created = Packet.create(Packet.ROUTE_TYPE_FLOOD, Packet.PAYLOAD_TYPE_TXT_MSG, b"payload", b"\xa1\xb2")
+    assert created.to_bytes() == raw_packet()
+
+
+def test_changing_the_packet_clears_the_parsed_payload():
+    packet = Packet.create(Packet.ROUTE_TYPE_DIRECT, Packet.PAYLOAD_TYPE_REQ, b"\x01\x02abc")
+    assert packet.parse_payload() == {"dest": 1, "src": 2, "encrypted": b"abc"}
+    packet.payload = b"\x09\x08xyz"
+    assert packet.parse_payload() == {"dest": 9, "src": 8, "encrypted": b"xyz"}
+
+    packet = Packet.from_bytes(raw_packet())
+    assert packet.parse_payload() == {"dest": ord("p"), "src": ord("a")}
+    packet.path = b""
+    packet.header = Packet.ROUTE_TYPE_FLOOD | Packet.PAYLOAD_TYPE_ACK << Packet.PH_TYPE_SHIFT
+    assert packet.parse_payload() == {"ack_code": b"payload"}
+    assert packet.to_bytes() == bytes([packet.header, 0]) + b"payload"
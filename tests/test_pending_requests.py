@@ -0,0 +1,150 @@
+import asyncio
+import threading
+
+import pytest
+
+from meshcore.connection.pending_requests import PendingRequests
+
+
+def resolve_data(code, data, name):
+    if code == "err":
+        raise Exception(f"{name} failed")
+    return data
+
+
+def test_responses_resolve_oldest_request_first():
+    async def main():
+        pending = PendingRequests()
+        first = pending.add(("ok",), resolve_data)
+        second = pending.add(("ok",), resolve_data)
+        assert pending.resolve("ok", 1)
+        assert pending.resolve("ok", 2)
+        assert not pending.resolve("ok", 3)
+        assert (first.result(), second.result()) == (1, 2)
+        assert len(pending) == 0
+
+    asyncio.run(main())
+
+
+def test_request_waiting_for_several_codes_is_resolved_once():
+    async def main():
+        pending = PendingRequests()
+        fut = pending.add(("info", "err"), resolve_data, "GetInfo")
+        assert pending.resolve("err", None)
+        with pytest.raises(Exception, match="GetInfo failed"):
+            fut.result()
+        # the request no longer waits for its other code
+        assert not pending.is_waiting_for("info")
+        assert len(pending) == 0
+
+    asyncio.run(main())
+
+
+def test_cancelled_request_consumes_its_response():
+    async def main():
+        pending = PendingRequests()
+        abandoned = pending.add(("ok",), resolve_data)
+        waiting = pending.add(("ok",), resolve_data)
+        abandoned.cancel()
+        assert pending.resolve("ok", "late reply")
+        assert not waiting.done()
+        assert pending.resolve("ok", "reply")
+        assert waiting.result() == "reply"
+
+    asyncio.run(main())
+
+
+def test_abandoned_request_is_dropped_once_a_later_request_is_answered():
+    async def main():
+        pending = PendingRequests()
+        # never answered, e.g. its response was lost
+        abandoned = pending.add(("ok", "err"), resolve_data)
+        other = pending.add(("info",), resolve_data)
+        abandoned.cancel()
+        assert pending.resolve("info", "info")
+        assert other.result() == "info"
+
+        waiting = pending.add(("ok",), resolve_data)
+        assert pending.resolve("ok", "reply")
+        assert waiting.result() == "reply"
+        assert len(pending) == 0
+
+    asyncio.run(main())
+
+
+def test_abandoned_request_expires():
+    async def main():
+        pending = PendingRequests(abandoned_lifetime=0)
+        abandoned = pending.add(("ok",), resolve_data)
+        abandoned.cancel()
+        await asyncio.sleep(0)
+        waiting = pending.add(("ok",), resolve_data)
+        assert pending.resolve("ok", "reply")
+        assert waiting.result() == "reply"
+        assert not pending.resolve("ok", "unexpected")
+
+    asyncio.run(main())
+
+
+def test_keyed_requests_resolve_by_key():
+    async def main():
+        pending = PendingRequests()
+        a = pending.add_keyed("status", b"aaaaaa")
+        b = pending.add_keyed("status", b"bbbbbb")
+        assert pending.resolve_keyed("status", b"bbbbbb", "b")
+        assert not a.done() and b.result() == "b"
+        assert not pending.resolve_keyed("status", b"cccccc", "c")
+
+        a.cancel()
+        assert pending.resolve_keyed("status", b"aaaaaa", "late")
+        assert not pending.is_waiting_for_keyed("status")
+
+    asyncio.run(main())
+
+
+def test_remove_keyed_drops_the_request():
+    async def main():
+        pending = PendingRequests()
+        fut = pending.add_keyed("binary", 7)
+        pending.remove_keyed("binary", 7, fut)
+        assert not pending.is_waiting_for_keyed("binary")
+        assert len(pending) == 0
+
+    asyncio.run(main())
+
+
+def test_resolve_from_reader_thread_runs_on_loop():
+    async def main():
+        pending = PendingRequests()
+        fut = pending.add(("ok",), resolve_data)
+        keyed = pending.add_keyed("status", b"key")
+        loop_thread = threading.get_ident()
+        resolved_on = []
+        fut.add_done_callback(lambda _: resolved_on.append(threading.get_ident()))
+
+        def reader():
+            pending.resolve("ok", "data")
+            pending.resolve_keyed("status", b"key", "pushed")
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        thread.join()
+        assert await asyncio.wait_for(fut, 1) == "data"
+        assert await asyncio.wait_for(keyed, 1) == "pushed"
+        assert resolved_on == [loop_thread]
+
+    asyncio.run(main())
+
+
+def test_fail_all():
+    async def main():
+        pending = PendingRequests()
+        fut = pending.add(("ok", "err"), resolve_data)
+        keyed = pending.add_keyed("status", b"key")
+        pending.fail_all(ConnectionError("Disconnected"))
+        for f in (fut, keyed):
+            with pytest.raises(ConnectionError):
+                f.result()
+        assert len(pending) == 0
+
+    asyncio.run(main())
@@ -0,0 +1,194 @@
+import asyncio
+import struct
+
+import pytest
+
+from fake_radio import FakeRadio, settle
+from meshcore.constants import Constants
+
+
+def battery_voltage(millivolts: int) -> bytes:
+    return bytes([Constants.ResponseCodes.BatteryVoltage]) + struct.pack("<H", millivolts)
+
+
+def test_pipelined_requests_resolve_in_order():
+    async def main():
+        radio = FakeRadio()
+        requests = asyncio.gather(radio.get_battery_voltage(), radio.get_battery_voltage())
+        await settle()
+        assert len(radio.written) == 2
+        radio.reply(battery_voltage(4100))
+        radio.reply(battery_voltage(3900))
+        first, second = await requests
+        assert (first["batteryMilliVolts"], second["batteryMilliVolts"]) == (4100, 3900)
+
+    asyncio.run(main())
+
+
+def test_err_fails_only_the_oldest_request():
+    async def main():
+        radio = FakeRadio()
+        first = asyncio.ensure_future(radio.get_battery_voltage())
+        second = asyncio.ensure_future(radio.get_battery_voltage())
+        await settle()
+        radio.reply(bytes([Constants.ResponseCodes.Err, 1]))
+        radio.reply(battery_voltage(4000))
+        with pytest.raises(Exception, match="GetBatteryVoltage failed"):
+            await first
+        assert (await second)["batteryMilliVolts"] == 4000
+
+    asyncio.run(main())
+
+
+def test_late_reply_to_timed_out_request_is_swallowed():
+    async def main():
+        radio = FakeRadio()
+        with pytest.raises(asyncio.TimeoutError):
+            await radio.get_battery_voltage(timeout=0.01)
+
+        request = asyncio.ensure_future(radio.get_battery_voltage())
+        await settle()
+        # the first command's reply arrives late, then the second one's
+        radio.reply(battery_voltage(1111))
+        await settle()
+        assert not request.done()
+        radio.reply(battery_voltage(2222))
+        assert (await request)["batteryMilliVolts"] == 2222
+
+    asyncio.run(main())
+
+
+def test_cancelled_request_reply_is_swallowed():
+    async def main():
+        radio = FakeRadio()
+        cancelled = asyncio.ensure_future(radio.get_battery_voltage())
+        await settle()
+        cancelled.cancel()
+        await settle()
+        request = asyncio.ensure_future(radio.get_battery_voltage())
+        await settle()
+        radio.reply(battery_voltage(1111))
+        radio.reply(battery_voltage(2222))
+        assert (await request)["batteryMilliVolts"] == 2222
+
+    asyncio.run(main())
+
+
+def test_unanswered_command_does_not_take_later_replies():
+    async def main():
+        radio = FakeRadio()
+        ok = bytes([Constants.ResponseCodes.Ok])
+        with pytest.raises(asyncio.TimeoutError):
+            await radio.set_advert_name("never answered", timeout=0.01)
+
+        # a reply to a later command shows the radio will not answer the first one
+        request = asyncio.ensure_future(radio.get_battery_voltage())
+        await settle()
+        radio.reply(battery_voltage(4000))
+        assert (await request)["batteryMilliVolts"] == 4000
+        request = asyncio.ensure_future(radio.set_tx_power(20))
+        await settle()
+        radio.reply(ok)
+        assert await asyncio.wait_for(request, 1) is True
+
+        # without one, the placeholder expires
+        radio._pending_requests.abandoned_lifetime = 0.01
+        with pytest.raises(asyncio.TimeoutError):
+            await radio.set_advert_name("never answered", timeout=0.01)
+        await asyncio.sleep(0.02)
+        request = asyncio.ensure_future(radio.set_tx_power(20))
+        await settle()
+        radio.reply(ok)
+        assert await asyncio.wait_for(request, 1) is True
+
+    asyncio.run(main())
+
+
+def test_reboot_does_not_wait_for_a_reply():
+    async def main():
+        radio = FakeRadio()
+        await asyncio.wait_for(radio.reboot(), 1)
+        assert radio.written[0][0] == Constants.CommandCodes.Reboot
+
+        request = asyncio.ensure_future(radio.set_tx_power(20))
+        await settle()
+        radio.reply(bytes([Constants.ResponseCodes.Ok]))
+        assert await asyncio.wait_for(request, 1) is True
+
+    asyncio.run(main())
+
+
+def test_max_in_flight_limits_written_commands():
+    async def main():
+        radio = FakeRadio()
+        radio.set_max_in_flight(2)
+        requests = [asyncio.ensure_future(radio.get_battery_voltage()) for _ in range(4)]
+        await settle()
+        assert len(radio.written) == 2
+        radio.reply(battery_voltage(1))
+        await settle()
+        assert len(radio.written) == 3
+        for millivolts in (2, 3, 4):
+            radio.reply(battery_voltage(millivolts))
+            await settle()
+        assert [(await r)["batteryMilliVolts"] for r in requests] == [1, 2, 3, 4]
+
+    asyncio.run(main())
+
+
+def test_lowering_max_in_flight_waits_for_running_requests():
+    async def main():
+        radio = FakeRadio()
+        radio.set_max_in_flight(3)
+        running = [asyncio.ensure_future(radio.get_battery_voltage()) for _ in range(3)]
+        await settle()
+        radio.set_max_in_flight(1)
+        queued = [asyncio.ensure_future(radio.get_battery_voltage()) for _ in range(2)]
+        await settle()
+        assert len(radio.written) == 3
+
+        # two of the three running requests done, still one in flight: nothing new yet
+        radio.reply(battery_voltage(1))
+        radio.reply(battery_voltage(2))
+        await settle()
+        assert len(radio.written) == 3
+        radio.reply(battery_voltage(3))
+        await settle()
+        assert len(radio.written) == 4
+
+        radio.set_max_in_flight(4)
+        await settle()
+        assert len(radio.written) == 5
+        radio.reply(battery_voltage(4))
+        radio.reply(battery_voltage(5))
+        results = [(await r)["batteryMilliVolts"] for r in running + queued]
+        assert results == [1, 2, 3, 4, 5]
+
+    asyncio.run(main())
+
+
+def test_binary_request_resolves_on_tagged_push():
+    async def main():
+        radio = FakeRadio()
+        request = asyncio.ensure_future(radio.send_binary_req(b"\x01" * 32, b"\x02"))
+        await settle()
+        radio.reply(bytes([Constants.ResponseCodes.Sent]) + struct.pack("<bII", 0, 0x1234, 5000))
+        radio.reply(bytes([Constants.PushCodes.BinaryResponse, 0]) + struct.pack("<I", 0x1234) + b"data")
+        assert (await request)["responseData"] == b"data"
+
+    asyncio.run(main())
+
+
+def test_binary_request_cancelled_after_sent_leaves_no_waiter():
+    async def main():
+        radio = FakeRadio()
+        request = asyncio.ensure_future(radio.send_binary_req(b"\x01" * 32, b"\x02"))
+        await settle()
+        radio.reply(bytes([Constants.ResponseCodes.Sent]) + struct.pack("<bII", 0, 0x1234, 5000))
+        # cancelled before the request resumes with the Sent result
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        assert not radio._pending_requests.is_waiting_for_keyed(Constants.PushCodes.BinaryResponse)
+
+    asyncio.run(main())
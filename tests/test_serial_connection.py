@@ -0,0 +1,68 @@
+import asyncio
+import os
+import pty
+import threading
+
+import pytest
+
+pytest.importorskip("serial")
+
+from meshcore.connection.nodejs_serial_connection import PySerialConnection
+
+
+class ThreadedSerial(PySerialConnection):
+    """Uses the reader thread fallback, as on platforms where the loop cannot watch the port."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.received = []
+        self.disconnects = 0
+
+    async def on_connected(self):
+        pass
+
+    def on_disconnected(self):
+        self.disconnects += 1
+        super().on_disconnected()
+
+    def feed_data(self, value: bytes):
+        self.received.append(bytes(value))
+
+
+def test_close_stops_the_reader_thread_quietly(monkeypatch, capsys):
+    thread_errors = []
+    monkeypatch.setattr(threading, "excepthook", thread_errors.append)
+    master, slave = pty.openpty()
+
+    async def main():
+        loop = asyncio.get_running_loop()
+
+        def no_reader(fd, callback):
+            raise NotImplementedError
+
+        loop.add_reader = no_reader
+        connection = ThreadedSerial(os.ttyname(slave))
+        await connection.connect()
+        assert connection._recv_thread is not None
+
+        os.write(master, b"data")
+        for _ in range(100):
+            if connection.received:
+                break
+            await asyncio.sleep(0.01)
+        assert b"".join(connection.received) == b"data"
+
+        # the reader thread is blocked in read() when the port is closed
+        await connection.close()
+        return connection
+
+    connection = asyncio.run(main())
+    # the loop is closed by now, the thread must not hand it anything
+    connection._recv_thread.join(1)
+    os.close(master)
+    os.close(slave)
+
+    assert not connection._recv_thread.is_alive()
+    assert connection.disconnects == 1
+    assert thread_errors == []
+    assert "Serial receive error" not in capsys.readouterr().out
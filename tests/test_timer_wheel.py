@@ -0,0 +1,22 @@
+import asyncio
+
+from meshcore.timer_wheel import TimerWheel
+
+
+def test_items_expire_once_unless_cancelled():
+    async def main():
+        expired = []
+        wheel = TimerWheel(expired.append, tick=0.01, slots=4)
+        wheel.schedule("soon", 0.01)
+        # longer than one turn of the wheel
+        wheel.schedule("later", 0.06)
+        wheel.schedule("cancelled", 0.01)
+        wheel.cancel("cancelled")
+
+        await asyncio.sleep(0.03)
+        assert expired == ["soon"]
+        await asyncio.sleep(0.06)
+        assert expired == ["soon", "later"]
+        assert len(wheel) == 0 and wheel._timer is None
+
+    asyncio.run(main())